@@ -0,0 +1,149 @@
+"""
+Сравнение PUT-запросов через модульные функции requests (новое соединение на каждый запрос)
+и через пул соединений сессии APIClient.
+
+Запросы отправляются в локальное Flask-приложение, запущенное в фоновом потоке, поэтому
+в замерах нет сетевых задержек и видна только стоимость установки соединений. Отладочный сервер
+Flask (werkzeug) закрывает соединение после каждого ответа, поэтому приложение обслуживается
+сервером wsgiref с поддержкой keep-alive, как за настоящим балансировщиком.
+
+Запуск из корня репозитория:
+    python -m benchmarks.api_client_bench --requests 2000 --threads 8
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, WSGIServer, make_server
+
+import requests
+from flask import Flask, jsonify, request
+
+from tools.api.client import APIClient
+
+PAYLOAD = {'name': 'Барсик', 'type': 'cat', 'age': 3}
+
+
+def create_app():
+    """
+    Создает Flask-приложение, которое возвращает тело PUT-запроса.
+
+    :rtype: Flask
+    """
+    app = Flask(__name__)
+
+    @app.route('/items/<int:item_id>', methods=['PUT'])
+    def put_item(item_id):
+        return jsonify({'id': item_id, **request.get_json()}), 200
+
+    return app
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """
+    Обработчик wsgiref, который обслуживает несколько запросов в одном соединении (HTTP/1.1 keep-alive).
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Заголовки и тело ответа пишутся отдельно: без TCP_NODELAY каждый ответ ждет delayed ACK клиента
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        # Цикл BaseHTTPRequestHandler: запросы читаются, пока клиент не закроет соединение
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            self.handle_one_request()
+
+    def handle_one_request(self):
+        self.raw_requestline = self.rfile.readline(65537)
+        if not self.raw_requestline or not self.parse_request():
+            self.close_connection = True
+            return
+        handler = ServerHandler(self.rfile, self.wfile, self.get_stderr(), self.get_environ(), multithread=True)
+        handler.http_version = '1.1'
+        handler.request_handler = self
+        handler.run(self.server.get_app())
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    """
+    Запускает приложение на свободном порту в фоновом потоке и считает принятые соединения.
+
+    :returns: Сервер и его базовый URL.
+    :rtype: tuple
+    """
+    server = make_server('127.0.0.1', 0, create_app(), server_class=ThreadingWSGIServer,
+                         handler_class=KeepAliveRequestHandler)
+    server.accepted = 0
+    get_request = server.get_request
+
+    def count_connections():
+        server.accepted += 1
+        return get_request()
+
+    server.get_request = count_connections
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def put_without_pool(base_url, index):
+    response = requests.put(f'{base_url}/items/{index}', json=PAYLOAD, headers={'Content-Type': 'application/json'})
+    response.raise_for_status()
+
+
+def put_with_pool(client, index):
+    response = client.put(f'/items/{index}', data=PAYLOAD)
+    assert response is not None, 'PUT-запрос через APIClient завершился ошибкой'
+
+
+def measure(func, count, threads):
+    """
+    Отправляет count запросов в threads потоков.
+
+    :returns: Количество запросов в секунду.
+    :rtype: float
+    """
+    started = time.perf_counter()
+    if threads == 1:
+        for index in range(count):
+            func(index)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(func, range(count)))
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000, help='Количество запросов в каждом замере')
+    parser.add_argument('--threads', type=int, default=8, help='Количество потоков в параллельном замере')
+    args = parser.parse_args()
+
+    server, base_url = start_server()
+    client = APIClient(api_url=base_url, api_key=None, pool_maxsize=args.threads, pool_block=True)
+    try:
+        for threads in (1, args.threads):
+            for name, func in (
+                ('requests.put', lambda index: put_without_pool(base_url, index)),
+                ('APIClient.put', lambda index: put_with_pool(client, index)),
+            ):
+                accepted = server.accepted
+                rps = measure(func, args.requests, threads)
+                print(f'{name:>14}, потоков {threads}: {rps:.0f} запр/с, '
+                      f'новых соединений {server.accepted - accepted}')
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
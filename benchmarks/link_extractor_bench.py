@@ -0,0 +1,87 @@
+"""
+Сравнение извлечения ссылок через BeautifulSoup и потоковым StreamingLinkExtractor.
+
+Запуск из корня репозитория:
+    python -m benchmarks.link_extractor_bench --anchors 50000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from tools.link_checker.link_extractor import StreamingLinkExtractor
+
+CHUNK_SIZE = 64 * 1024
+
+
+def build_fixture_page(path, anchors):
+    """
+    Создает большую HTML-страницу с заданным количеством ссылок и разметкой между ними.
+
+    :param path: Путь к создаваемому файлу.
+    :type path: str
+    :param anchors: Количество ссылок на странице.
+    :type anchors: int
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<!DOCTYPE html><html><head><title>Fixture</title></head><body>\n')
+        for i in range(anchors):
+            f.write(
+                f'<div class="item"><p>Описание элемента {i} &amp; немного текста для объема страницы.</p>'
+                f'<img src="/img/{i}.png" alt="картинка {i}"><a href="/page/{i}?ref=bench#top">Ссылка {i}</a></div>\n'
+            )
+        f.write('</body></html>\n')
+
+
+def read_chunks(path):
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+def extract_with_bs4(path):
+    with open(path, encoding='utf-8') as f:
+        html_content = f.read()
+    soup = BeautifulSoup(html_content, 'html.parser')
+    return [a.get('href') for a in soup.find_all('a', href=True)]
+
+
+def extract_streaming(path):
+    return list(StreamingLinkExtractor.iter_links(read_chunks(path)))
+
+
+def measure(func, path):
+    """
+    Замеряет время работы и пиковое потребление памяти функции извлечения ссылок.
+
+    :returns: Кортеж (количество ссылок, время в секундах, пик памяти в МБ).
+    :rtype: tuple
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    links = func(path)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(links), elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--anchors', type=int, default=50000, help='Количество ссылок на тестовой странице')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'fixture_page.html')
+        build_fixture_page(path, args.anchors)
+        print(f'Страница: {os.path.getsize(path) / 1024 / 1024:.1f} МБ, ссылок: {args.anchors}')
+        for name, func in (('bs4', extract_with_bs4), ('stream', extract_streaming)):
+            count, elapsed, peak = measure(func, path)
+            print(f'{name:>6}: ссылок {count}, время {elapsed:.2f} с, пик памяти {peak:.1f} МБ')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,10 @@
 import subprocess
 import time
 import pytest
+import pytest_asyncio
+
+from environments import env
+from tools.api.client import APIClientAsync
 
 @pytest.fixture(scope="session", autouse=True)
 def start_server():
@@ -22,3 +26,23 @@ def start_server():
     finally:
         server_process.terminate()
         server_process.wait()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def api_client_async():
+    """
+    Фикстура с общим асинхронным API-клиентом на всю сессию.
+
+    При запуске через pytest-xdist каждый воркер - отдельный процесс, поэтому клиент
+    и его пул соединений разделяются между всеми тестами одного воркера. Одинаковые одновременные
+    GET-запросы шагов, запущенных через asyncio.gather, выполняются один раз.
+
+    Клиент закрывается в event loop сессии, которому принадлежит его сессия aiohttp, поэтому тесты
+    с этой фикстурой запускаются в том же loop: @pytest.mark.asyncio(loop_scope="session").
+    Если тест все же запущен в своем loop, клиент закрывает прежнюю сессию в ее loop и открывает новую.
+    """
+    client = APIClientAsync(api_url=env.api_url, api_key=env.api_key, single_flight=True)
+    try:
+        yield client
+    finally:
+        await client.close()
@@ -0,0 +1,110 @@
+import asyncio
+import itertools
+import threading
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+
+
+def create_users_app(state):
+    """
+    Создает aiohttp-приложение с API пользователей в памяти.
+
+    Параметр запроса delay задерживает отправку ответа на указанное число секунд: ответ содержит данные
+    на момент получения запроса, как у медленного сервера, уже прочитавшего их из базы.
+
+    Маршрут /flaky/{key} принимает любой метод и отвечает кодом status (по умолчанию 503) на первые fail
+    запросов с этим методом и ключом, добавляя заголовок Retry-After из параметра retry_after, если он задан.
+
+    :param state: Общее состояние приложения и теста (пользователи, счетчики запросов).
+    :type state: SimpleNamespace
+    :rtype: web.Application
+    """
+    routes = web.RouteTableDef()
+
+    @web.middleware
+    async def count_requests(request, handler):
+        state.hits[f'{request.method} {request.path}'] += 1
+        state.active += 1
+        state.max_active = max(state.max_active, state.active)
+        try:
+            response = await handler(request)
+            await asyncio.sleep(float(request.query.get('delay', 0)))
+            return response
+        finally:
+            state.active -= 1
+
+    @routes.post('/users')
+    async def create_user(request):
+        user = {**await request.json(), 'id': str(next(state.ids))}
+        state.users[user['id']] = user
+        return web.json_response(user, status=201)
+
+    @routes.get('/users')
+    async def get_users(request):
+        return web.json_response(list(state.users.values()))
+
+    @routes.get('/users/{user_id}')
+    async def get_user(request):
+        user = state.users.get(request.match_info['user_id'])
+        if user is None:
+            return web.json_response({'error': 'Пользователь не найден'}, status=404)
+        return web.json_response(user)
+
+    @routes.put('/users/{user_id}')
+    async def update_user(request):
+        user_id = request.match_info['user_id']
+        if user_id not in state.users:
+            return web.json_response({'error': 'Пользователь не найден'}, status=404)
+        state.users[user_id] = {**await request.json(), 'id': user_id}
+        return web.json_response(state.users[user_id])
+
+    @routes.delete('/users/{user_id}')
+    async def delete_user(request):
+        if state.users.pop(request.match_info['user_id'], None) is None:
+            return web.json_response({'error': 'Пользователь не найден'}, status=404)
+        return web.Response(status=204)
+
+    @routes.route('*', '/flaky/{key}')
+    async def flaky(request):
+        if state.hits[f'{request.method} {request.path}'] > int(request.query.get('fail', 0)):
+            return web.json_response({'status': 'ok'})
+        retry_after = request.query.get('retry_after')
+        headers = {'Retry-After': retry_after} if retry_after is not None else None
+        return web.json_response({'error': 'Сервис недоступен'}, status=int(request.query.get('status', 503)),
+                                 headers=headers)
+
+    app = web.Application(middlewares=[count_requests])
+    app.add_routes(routes)
+    return app
+
+
+@pytest.fixture
+def users_api():
+    """
+    Фикстура с локальным API пользователей для проверки клиента без внешнего сервера.
+
+    Приложение работает в отдельном потоке со своим event loop, поэтому не зависит от event loop теста.
+
+    :returns: Состояние приложения: url, users, hits (количество запросов по 'МЕТОД путь') и max_active
+        (наибольшее количество одновременно обрабатываемых запросов).
+    :rtype: SimpleNamespace
+    """
+    state = SimpleNamespace(users={}, hits=Counter(), ids=itertools.count(1), active=0, max_active=0)
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(create_users_app(state))
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, '127.0.0.1', 0).start())
+    host, port = runner.addresses[0][:2]
+    state.url = f'http://{host}:{port}'
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        yield state
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.run_until_complete(runner.cleanup())
+        loop.close()
@@ -0,0 +1,61 @@
+import allure
+import pytest
+
+from tools.api.client import APIClientAsync
+from tools.api.services.user_steps import UserSteps
+
+
+@allure.epic('Пакетные запросы асинхронного клиента')
+@pytest.mark.asyncio
+async def test_gather_limits_concurrency_and_keeps_order(users_api):
+    """
+    Тест пакета запросов: одновременно выполняется не больше concurrency запросов, результаты возвращаются
+    в порядке запросов, а ошибки отдельного запроса и on_progress не прерывают пакет.
+    """
+    batch = [('POST', '/users?delay=0.02', {'name': f'user{i}'}) for i in range(20)]
+    batch[7] = ('POST', '/users', {'name': object()})
+    progress = []
+
+    def on_progress(done, total, result):
+        progress.append((done, total))
+        raise RuntimeError('Ошибка в обработчике прогресса')
+
+    async with APIClientAsync(api_url=users_api.url, api_key='test') as client:
+        results = await client.gather(batch, concurrency=5, on_progress=on_progress)
+
+    assert [result.index for result in results] == list(range(20))
+    assert isinstance(results[7].error, TypeError)
+    assert all(result.response.status == 201 for result in results if result.index != 7)
+    assert [result.data['name'] for result in results[:3]] == ['user0', 'user1', 'user2']
+    assert progress == [(done, 20) for done in range(1, 21)]
+    assert users_api.max_active <= 5
+
+
+@allure.epic('Пакетные запросы асинхронного клиента')
+@pytest.mark.asyncio
+async def test_map_cancels_pending_requests_when_stopped(users_api):
+    """
+    Тест остановки чтения результатов map: незавершенные запросы отменяются и не отправляются.
+    """
+    batch = ((method, '/users?delay=0.05') for method in ['GET'] * 100)
+    async with APIClientAsync(api_url=users_api.url, api_key='test') as client:
+        async for result in client.map(batch, concurrency=4):
+            assert result.error is None
+            break
+    assert users_api.hits['GET /users'] <= 5
+
+
+@allure.epic('Пакетные запросы асинхронного клиента')
+@pytest.mark.asyncio
+async def test_user_steps_create_and_delete_users(users_api):
+    """
+    Тест пакетных шагов с пользователями: создание, получение по ID и удаление.
+    """
+    async with APIClientAsync(api_url=users_api.url, api_key='test') as client:
+        steps = UserSteps(api_url=users_api.url, api_key='test', client=client)
+        users = await steps.create_users([{'name': f'user{i}'} for i in range(10)], concurrency=3)
+        assert [user['name'] for user in users] == [f'user{i}' for i in range(10)]
+        user_ids = [user['id'] for user in users]
+        assert await steps.get_users_by_ids(user_ids) == users
+        await steps.delete_users(user_ids)
+    assert users_api.users == {}
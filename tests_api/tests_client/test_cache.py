@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+import allure
+import pytest
+
+from tools.api.cache import ResponseCache
+from tools.api.client import APIClient, APIClientAsync
+from tools.api.response import response_body
+
+
+@allure.epic('Кэш ответов')
+def test_sync_cache_hit_returns_own_copy(users_api):
+    """
+    Тест кэша синхронного клиента: повторный GET берется из кэша, но разобранный JSON у каждого ответа свой.
+    """
+    users_api.users['1'] = {'id': '1', 'name': 'user1'}
+    client = APIClient(api_url=users_api.url, api_key='test', cache=ResponseCache())
+    try:
+        first = client.get('/users/1')
+        response_body(first).json()['name'] = 'changed'
+        second = client.get('/users/1')
+    finally:
+        client.close()
+
+    assert users_api.hits['GET /users/1'] == 1
+    assert second is not first
+    assert response_body(second).json() == {'id': '1', 'name': 'user1'}
+
+
+@allure.epic('Кэш ответов')
+def test_sync_cache_skips_response_of_changed_resource(users_api):
+    """
+    Тест кэша синхронного клиента: ответ GET, выполнявшегося во время изменения ресурса, не сохраняется.
+    """
+    users_api.users['1'] = {'id': '1', 'name': 'user1'}
+    client = APIClient(api_url=users_api.url, api_key='test', cache=ResponseCache())
+    try:
+        reader = threading.Thread(target=client.get, args=('/users/1?delay=0.3',))
+        reader.start()
+        while users_api.hits['GET /users/1'] == 0:
+            threading.Event().wait(0.01)
+        client.put('/users/1', {'name': 'renamed'})
+        reader.join()
+        response = client.get('/users/1?delay=0.3')
+    finally:
+        client.close()
+
+    assert users_api.hits['GET /users/1'] == 2
+    assert response.json()['name'] == 'renamed'
+
+
+@allure.epic('Кэш ответов')
+@pytest.mark.asyncio
+async def test_async_cache_skips_response_of_changed_resource(users_api):
+    """
+    Тест кэша асинхронного клиента: ответ GET, выполнявшегося во время удаления ресурса, не сохраняется,
+    и следующий GET получает актуальный ответ сервера.
+    """
+    users_api.users['1'] = {'id': '1', 'name': 'user1'}
+    async with APIClientAsync(api_url=users_api.url, api_key='test', cache=ResponseCache()) as client:
+        reader = asyncio.create_task(client.get('/users/1?delay=0.3'))
+        while users_api.hits['GET /users/1'] == 0:
+            await asyncio.sleep(0.01)
+        deleted, _ = await client.delete('/users/1')
+        stale, data = await reader
+        response, _ = await client.get('/users/1?delay=0.3')
+
+    assert deleted.status == 204
+    assert stale.status == 200 and data['name'] == 'user1'
+    assert response.status == 404
+    assert users_api.hits['GET /users/1'] == 2
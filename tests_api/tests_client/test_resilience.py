@@ -0,0 +1,168 @@
+import socket
+import time
+
+import allure
+import pytest
+import requests
+
+from tools.api.client import APIClient, APIClientAsync
+from tools.api.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def closed_port_url():
+    """
+    Возвращает URL локального порта, на котором никто не слушает: соединение с ним сразу отклоняется.
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f'http://127.0.0.1:{port}'
+
+
+@allure.epic('Повторы и circuit breaker')
+def test_retry_policy_delay_uses_retry_after():
+    """
+    Тест паузы перед повтором: для 429/503 берется Retry-After, пауза больше max_retry_after отменяет повтор,
+    для остальных кодов и без заголовка используется backoff.
+    """
+    policy = RetryPolicy(retries=3, backoff_factor=0.5, max_retry_after=10)
+
+    assert policy.delay(0, 503, {'Retry-After': '2'}) == 2
+    assert policy.delay(0, 429, {'Retry-After': '0'}) == 0
+    assert policy.delay(0, 503, {'Retry-After': '120'}) is None
+    assert 0 <= policy.delay(2, 500, {'Retry-After': '120'}) <= 2
+    assert 0 <= policy.delay(1, 503, {}) <= 1
+
+
+@allure.epic('Повторы и circuit breaker')
+def test_retry_policy_retries_only_idempotent_methods_within_deadline():
+    """
+    Тест условий повтора: неидемпотентные методы не повторяются, идемпотентные - пока не исчерпаны попытки
+    и пауза укладывается в deadline.
+    """
+    policy = RetryPolicy(retries=2, backoff_factor=1)
+
+    assert policy.should_retry('get', 0) and policy.should_retry('DELETE', 1)
+    assert not policy.should_retry('POST', 0) and not policy.should_retry('PATCH', 0)
+    assert not policy.should_retry('GET', 2)
+    assert not policy.should_retry('GET', 1, deadline=time.monotonic() + 1)
+    assert policy.should_retry('GET', 1, deadline=time.monotonic() + 1, delay=0.1)
+
+
+@allure.epic('Повторы и circuit breaker')
+def test_client_retries_get_after_retry_after(users_api):
+    """
+    Тест повтора GET-запроса после ответа 503 с Retry-After: запрос повторяется через указанную паузу,
+    а при паузе больше max_retry_after ответ возвращается без повтора.
+    """
+    client = APIClient(api_url=users_api.url, api_key='test', retries=2, backoff_factor=10)
+
+    started = time.monotonic()
+    response = client.get('/flaky/short?fail=1&retry_after=0.2')
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 0.2
+    assert users_api.hits['GET /flaky/short'] == 2
+
+    with pytest.raises(requests.exceptions.HTTPError) as error:
+        client.get('/flaky/long?fail=1&retry_after=120', raise_errors=True)
+    assert error.value.response.status_code == 503
+    assert users_api.hits['GET /flaky/long'] == 1
+
+
+@allure.epic('Повторы и circuit breaker')
+def test_client_does_not_retry_post(users_api):
+    """
+    Тест повторов неидемпотентных запросов: POST после ответа 503 не повторяется, а GET с той же ошибкой
+    повторяется с backoff.
+    """
+    client = APIClient(api_url=users_api.url, api_key='test', retries=2, backoff_factor=0.01)
+
+    assert client.post('/flaky/post?fail=1') is None
+    assert client.get('/flaky/get?fail=1').status_code == 200
+
+    assert users_api.hits['POST /flaky/post'] == 1
+    assert users_api.hits['GET /flaky/get'] == 2
+
+
+@allure.epic('Повторы и circuit breaker')
+def test_client_stops_retries_at_total_timeout(users_api):
+    """
+    Тест total_timeout: повторы прекращаются, когда следующая пауза не укладывается в общее время запроса.
+    """
+    client = APIClient(api_url=users_api.url, api_key='test', retries=10, backoff_factor=0.1, total_timeout=0.5)
+
+    started = time.monotonic()
+    assert client.get('/flaky/slow?fail=100') is None
+
+    # Без total_timeout было бы 11 запросов: паузы перед последними повторами составляют секунды
+    assert time.monotonic() - started < 0.5
+    assert users_api.hits['GET /flaky/slow'] < 11
+
+
+@allure.epic('Повторы и circuit breaker')
+@pytest.mark.asyncio
+async def test_async_client_retries_after_retry_after(users_api):
+    """
+    Тест повторов асинхронного клиента: GET после ответа 429 с Retry-After повторяется через указанную паузу,
+    POST не повторяется.
+    """
+    async with APIClientAsync(api_url=users_api.url, api_key='test', retries=2, backoff_factor=10) as client:
+        started = time.monotonic()
+        response, data = await client.get('/flaky/async?fail=1&status=429&retry_after=0.2')
+        elapsed = time.monotonic() - started
+        post_response, _ = await client.post('/flaky/async?fail=1&retry_after=0')
+
+    assert (response.status, data) == (200, {'status': 'ok'})
+    assert elapsed >= 0.2
+    assert post_response.status == 503
+    assert users_api.hits['GET /flaky/async'] == 2
+    assert users_api.hits['POST /flaky/async'] == 1
+
+
+@allure.epic('Повторы и circuit breaker')
+def test_circuit_breaker_opens_and_half_opens():
+    """
+    Тест состояний circuit breaker: после failure_threshold неудач хост блокируется, через reset_timeout
+    пропускается один пробный запрос; неудача пробы снова блокирует хост, успех снимает блокировку.
+    """
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    url = 'http://down.example/page'
+
+    breaker.record_failure(url)
+    breaker.before_request(url)
+    breaker.record_failure(url)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(url)
+    breaker.before_request('http://up.example/page')
+
+    time.sleep(0.1)
+    breaker.before_request(url)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(url)
+    breaker.record_failure(url)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(url)
+
+    time.sleep(0.1)
+    breaker.before_request(url)
+    breaker.record_success(url)
+    breaker.before_request(url)
+    breaker.before_request(url)
+
+
+@allure.epic('Повторы и circuit breaker')
+def test_client_circuit_breaker_skips_unreachable_host():
+    """
+    Тест circuit breaker в клиенте: после серии ошибок соединения запросы к хосту завершаются CircuitOpenError
+    без отправки, а без raise_errors возвращается None.
+    """
+    client = APIClient(api_url=closed_port_url(), api_key='test',
+                       circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.probe('/page', raise_errors=True)
+    with pytest.raises(CircuitOpenError):
+        client.get('/page', raise_errors=True)
+    assert client.get('/page') is None
+    assert client.probe('/page') is None
@@ -0,0 +1,78 @@
+import json
+
+import allure
+import pytest
+import requests
+
+from tools.api import response as response_module
+from tools.api.response import ResponseBody, is_json_content_type, response_body
+
+
+@pytest.fixture(params=['json', 'orjson'])
+def json_backend(request, monkeypatch):
+    """
+    Фикстура, переключающая разбор JSON между стандартным модулем json и orjson (если он установлен).
+    """
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(response_module, 'orjson', None)
+    return request.param
+
+
+@allure.epic('Ленивый разбор тела ответа')
+@pytest.mark.parametrize('content_type, expected', [
+    ('application/json', True),
+    ('application/problem+json; charset=utf-8', True),
+    ('Application/JSON', True),
+    ('text/html', False),
+    (None, False),
+])
+def test_is_json_content_type(content_type, expected):
+    """
+    Тест распознавания JSON по заголовку Content-Type.
+    """
+    assert is_json_content_type(content_type) is expected
+
+
+@allure.epic('Ленивый разбор тела ответа')
+def test_response_body_decodes_once(json_backend):
+    """
+    Тест однократного разбора JSON и независимости копий тела.
+    """
+    body = ResponseBody('{"name": "Барсик", "tags": []}'.encode(), 'application/json')
+    assert body.json() is body.json()
+    assert body.data == {'name': 'Барсик', 'tags': []}
+    copy = body.copy()
+    copy.data['tags'].append('кот')
+    assert body.data['tags'] == []
+
+
+@allure.epic('Ленивый разбор тела ответа')
+def test_response_body_content_type_rules(json_backend):
+    """
+    Тест правил разбора: тело без Content-Type разбирается как JSON, пустое тело - None,
+    тело с Content-Type не JSON не разбирается, а текст в другой кодировке декодируется по charset.
+    """
+    assert ResponseBody(b'[1, 2]').data == [1, 2]
+    assert ResponseBody(b'', 'application/json').data is None
+    html = ResponseBody(b'<html></html>', 'text/html')
+    assert html.data is None
+    with pytest.raises(json.JSONDecodeError):
+        html.json()
+    with pytest.raises(json.JSONDecodeError):
+        ResponseBody(b'{oops', 'application/json').json()
+    assert ResponseBody('{"name": "Мурка"}'.encode('cp1251'), 'application/json', 'cp1251').data == {'name': 'Мурка'}
+
+
+@allure.epic('Ленивый разбор тела ответа')
+def test_response_body_is_cached_on_requests_response(json_backend):
+    """
+    Тест того, что response_body создает тело один раз на ответ requests.
+    """
+    response = requests.Response()
+    response._content = b'{"id": 1}'
+    response.headers['Content-Type'] = 'application/json'
+    response.encoding = 'utf-8'
+    assert response_body(response) is response_body(response)
+    assert response_body(response).data == {'id': 1}
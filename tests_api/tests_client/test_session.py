@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+import allure
+import pytest
+
+from tools.api.client import APIClientAsync
+
+
+@allure.epic('Сессия асинхронного клиента')
+@pytest.mark.asyncio
+async def test_close_closes_session_on_running_loop_of_another_thread(users_api):
+    """
+    Тест закрытия клиента, сессия которого открыта в event loop другого потока: соединения закрываются
+    в этом loop.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    client = APIClientAsync(api_url=users_api.url, api_key='test')
+    try:
+        response, _ = await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.get('/users'), loop))
+        session = client._session
+        await client.close()
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    assert response.status == 200
+    assert session.closed and client._session is None
+
+
+@allure.epic('Сессия асинхронного клиента')
+@pytest.mark.asyncio
+async def test_new_loop_closes_session_of_stopped_loop(users_api):
+    """
+    Тест использования клиента в новом event loop: сессия остановленного loop закрывается в нем,
+    а клиент открывает новую сессию в текущем loop.
+    """
+    loop = asyncio.new_event_loop()
+    client = APIClientAsync(api_url=users_api.url, api_key='test')
+    try:
+        await asyncio.to_thread(loop.run_until_complete, client.get('/users'))
+        stale_session = client._session
+        response, _ = await client.get('/users')
+        assert stale_session.closed
+        assert client._session is not stale_session and client._session_loop is asyncio.get_running_loop()
+        await client.close()
+    finally:
+        loop.close()
+
+    assert response.status == 200
+    assert users_api.hits['GET /users'] == 2
@@ -0,0 +1,69 @@
+import asyncio
+
+import allure
+import pytest
+
+from tools.api.client import APIClientAsync
+
+
+@allure.epic('Single-flight асинхронного клиента')
+@pytest.mark.asyncio
+async def test_concurrent_gets_share_one_request(users_api):
+    """
+    Тест single-flight: одновременные одинаковые GET-запросы выполняются одним запросом к серверу,
+    а каждый вызывающий получает свою копию разобранного JSON.
+    """
+    users_api.users['1'] = {'id': '1', 'name': 'user1'}
+    async with APIClientAsync(api_url=users_api.url, api_key='test', single_flight=True) as client:
+        results = await asyncio.gather(*(client.get('/users/1?delay=0.1') for _ in range(5)))
+
+    assert users_api.hits['GET /users/1'] == 1
+    assert client.coalesced == 4
+    assert all(response.status == 200 and data == users_api.users['1'] for response, data in results)
+    assert len({id(data) for _, data in results}) == 5
+
+
+@allure.epic('Single-flight асинхронного клиента')
+@pytest.mark.asyncio
+async def test_request_is_cancelled_with_last_waiter(users_api):
+    """
+    Тест single-flight: отмена одного ожидающего не отменяет общий запрос, а отмена последнего отменяет.
+    """
+    async with APIClientAsync(api_url=users_api.url, api_key='test', single_flight=True) as client:
+        waiters = [asyncio.create_task(client.get('/users?delay=0.5')) for _ in range(3)]
+        while users_api.hits['GET /users'] == 0:
+            await asyncio.sleep(0.01)
+        [task] = client._in_flight.values()
+
+        waiters[0].cancel()
+        await asyncio.sleep(0.05)
+        assert not task.done()
+
+        for waiter in waiters[1:]:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
+        assert not client._in_flight and not client._waiters
+
+
+@allure.epic('Single-flight асинхронного клиента')
+@pytest.mark.asyncio
+async def test_get_after_mutation_does_not_join_earlier_get(users_api):
+    """
+    Тест single-flight: GET после изменяющего запроса не присоединяется к GET, начатому до изменения.
+    """
+    users_api.users['1'] = {'id': '1', 'name': 'user1'}
+    async with APIClientAsync(api_url=users_api.url, api_key='test', single_flight=True) as client:
+        earlier = asyncio.create_task(client.get('/users/1?delay=0.3'))
+        while users_api.hits['GET /users/1'] == 0:
+            await asyncio.sleep(0.01)
+        await client.delete('/users/1')
+        response, _ = await client.get('/users/1?delay=0.3')
+        stale, _ = await earlier
+
+    assert stale.status == 200
+    assert response.status == 404
+    assert users_api.hits['GET /users/1'] == 2
+    assert client.coalesced == 0
@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from tools.link_checker import link_processor
+from tools.link_checker.link_sink import LinkResultSink, broken_links_sink
+from tools.link_checker.metrics import LinkCheckMetrics, link_check_metrics
+
+
+def pytest_sessionfinish(session):
+    """
+    Сбрасывает буфер битых ссылок и записывает итоги прогона проверки ссылок в конце сессии.
+
+    Воркер pytest-xdist сбрасывает свой шард, а основной процесс после завершения всех воркеров
+    объединяет шарды в общий файл.
+    """
+    broken_links_sink.flush()
+    if link_check_metrics.checked:
+        link_check_metrics.write_summary()
+    if not hasattr(session.config, 'workerinput'):
+        broken_links_sink.merge_shards()
+
+
+class QuietRequestHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        with self.server.serving(self.headers.get('Host')):
+            self.delay()
+            super().do_GET()
+
+    def do_HEAD(self):
+        with self.server.serving(self.headers.get('Host')):
+            self.delay()
+            # Как часть реальных серверов, не поддерживает HEAD для путей /no-head/
+            if self.path.startswith('/no-head/'):
+                self.send_error(405)
+            else:
+                super().do_HEAD()
+
+    def delay(self):
+        # Параметр запроса delay задерживает ответ на указанное число секунд, как у медленного сервера
+        delay = parse_qs(urlsplit(self.path).query).get('delay')
+        if delay:
+            time.sleep(float(delay[0]))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.url = f'http://127.0.0.1:{self.server_port}'
+        # Количество одновременно обрабатываемых запросов и его максимум: всего (ключ '') и по заголовку Host
+        self.active = Counter()
+        self.max_active = Counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def serving(self, host):
+        with self._lock:
+            for key in ('', host):
+                self.active[key] += 1
+                self.max_active[key] = max(self.max_active[key], self.active[key])
+        try:
+            yield
+        finally:
+            with self._lock:
+                for key in ('', host):
+                    self.active[key] -= 1
+
+    def handle_error(self, request, client_address):
+        # Проверка ссылок закрывает соединение, не дочитав тело ответа, - для сервера это не ошибка
+        pass
+
+
+@pytest.fixture
+def results_sink(tmp_path, monkeypatch):
+    """
+    Фикстура с приемником битых ссылок во временном каталоге теста вместо общего broken_links.jsonl.
+
+    :returns: Приемник результатов, в который чекеры пишут битые ссылки во время теста.
+    :rtype: LinkResultSink
+    """
+    sink = LinkResultSink(str(tmp_path / 'broken_links.jsonl'))
+    monkeypatch.setattr(link_processor, 'broken_links_sink', sink)
+    yield sink
+    sink.flush()
+
+
+@pytest.fixture
+def link_metrics(tmp_path):
+    """
+    Фикстура с показателями прогона теста, которые не попадают в общий link_metrics.json.
+
+    :rtype: LinkCheckMetrics
+    """
+    return LinkCheckMetrics(progress_interval=None, summary_path=str(tmp_path / 'link_metrics.json'))
+
+
+@pytest.fixture
+def local_server(tmp_path, results_sink):
+    """
+    Фикстура с локальным HTTP-сервером, который раздает файлы из временного каталога теста.
+
+    Тест создает страницы, robots.txt и карты сайта в каталоге, а затем проверяет ссылки на них
+    без обращения к внешним сайтам. Битые ссылки пишутся в приемник results_sink, а не в общий файл.
+
+    :returns: Сервер: url, active и max_active (одновременные запросы всего и по хостам).
+    :rtype: QuietHTTPServer
+    """
+    server = QuietHTTPServer(('127.0.0.1', 0), partial(QuietRequestHandler, directory=str(tmp_path)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def local_site(local_server, tmp_path):
+    """
+    Фикстура с базовым URL локального сервера (см. local_server) и каталогом с его файлами.
+
+    :rtype: tuple
+    """
+    return local_server.url, tmp_path
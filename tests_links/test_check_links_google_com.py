@@ -2,6 +2,7 @@ import pytest
 import allure
 
 from tools.link_checker.cheker import LinkCheckerFactory
+from tools.link_checker.link_crawler import LinkCrawler
 
 link_checker = LinkCheckerFactory.create_checker('async')
 
@@ -32,3 +33,30 @@ async def test_check_all_links_with_bs4(page_url):
     """
     broken_links = await link_checker.check_links_on_page_with_bs4(page_url)
     link_checker.assert_no_broken_links(broken_links)
+
+
+@allure.epic('Обход сайта и проверка всех ссылок')
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed_url", [
+    "https://example.com"
+])
+async def test_crawl_site(seed_url):
+    """
+    Тест для обхода страниц сайта и проверки всех ссылок на них.
+    """
+    crawler = LinkCrawler(max_depth=1, max_pages=20)
+    broken_links = await crawler.crawl(seed_url)
+    link_checker.assert_no_broken_links(broken_links)
+
+
+@allure.epic('Проверка всех ресурсов на странице')
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_url", [
+    "https://example.com"
+])
+async def test_check_all_assets_on_page(page_url):
+    """
+    Тест для проверки всех ресурсов страницы: ссылок, изображений, скриптов, стилей, шрифтов и медиа.
+    """
+    broken_assets = await link_checker.check_assets_on_page(page_url)
+    link_checker.assert_no_broken_links(broken_assets)
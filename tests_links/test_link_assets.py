@@ -0,0 +1,45 @@
+import inspect
+
+import allure
+import pytest
+
+from tools.link_checker.cheker import LinkCheckerFactory
+
+PAGE = """<html><head>
+<link rel="stylesheet" href="/css/main.css">
+<script src="/js/missing.js"></script>
+</head><body><img src="/img/logo.png"><a href="/about.html">О нас</a></body></html>"""
+
+
+@allure.epic('Проверка ресурсов страницы')
+@pytest.mark.asyncio
+@pytest.mark.parametrize('checker_type', ['old', 'sync', 'async', 'sharded'])
+async def test_check_assets_on_page_follows_stylesheets(local_site, link_metrics, checker_type):
+    """
+    Тест проверки ресурсов страницы всеми типами чекеров: битые ресурсы находятся и на странице,
+    и в CSS-файлах, подключенных через @import.
+    """
+    base_url, root = local_site
+    for path, content in {
+        'index.html': PAGE,
+        'about.html': '<html></html>',
+        'img/logo.png': 'png',
+        'css/main.css': '@import "print.css"; body { background: url(/img/logo.png); }',
+        'css/print.css': '@font-face { src: url("../fonts/missing.woff2"); }',
+    }.items():
+        (root / path).parent.mkdir(exist_ok=True)
+        (root / path).write_text(content)
+
+    options = {'processes': 2} if checker_type == 'sharded' else {}
+    checker = LinkCheckerFactory.create_checker(checker_type, cache=None, metrics=link_metrics, **options)
+    try:
+        broken = checker.check_assets_on_page(f'{base_url}/index.html')
+        if inspect.isawaitable(broken):
+            broken = await broken
+    finally:
+        if checker_type == 'sharded':
+            checker.close()
+    assert sorted(broken) == [
+        (f'{base_url}/fonts/missing.woff2', 404, 'font'),
+        (f'{base_url}/js/missing.js', 404, 'script'),
+    ]
@@ -0,0 +1,31 @@
+import asyncio
+
+import allure
+import pytest
+
+from tools.link_checker.link_checker_async import LinkCheckerAsync
+
+
+@allure.epic('Асинхронная проверка ссылок')
+@pytest.mark.asyncio
+async def test_concurrent_pages_share_concurrency_limits(local_server, link_metrics):
+    """
+    Тест ограничений параллельности: при одновременной проверке нескольких страниц запросов к хосту
+    не больше max_per_host, а всего - не больше max_concurrency.
+    """
+    port = local_server.server_port
+    hosts = [f'127.0.0.1:{port}', f'localhost:{port}']
+    pages = [[f'http://{host}/page{page}/{i}.html?delay=0.05' for host in hosts for i in range(6)]
+             for page in range(5)]
+    checker = LinkCheckerAsync(max_concurrency=4, max_per_host=3, cache=None, metrics=link_metrics)
+    try:
+        results = await asyncio.gather(*(
+            checker.check_all_links(links, f'{local_server.url}/page{page}/') for page, links in enumerate(pages)
+        ))
+    finally:
+        await checker.client.close()
+
+    assert [len(broken_links) for broken_links in results] == [12] * 5
+    assert local_server.max_active[''] <= 4
+    assert all(local_server.max_active[host] <= 3 for host in hosts)
+    assert local_server.max_active[''] >= 2
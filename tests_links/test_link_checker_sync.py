@@ -0,0 +1,48 @@
+import allure
+import pytest
+
+from tools.api.resilience import CircuitBreaker, CircuitOpenError
+from tools.link_checker.link_checker_old import LinkCheckerOld
+from tools.link_checker.link_checker_sync import LinkCheckerSync
+
+
+@allure.epic('Синхронная проверка ссылок')
+@pytest.mark.parametrize('checker_class', [LinkCheckerOld, LinkCheckerSync])
+def test_check_all_links_in_threads_keeps_page_order(local_site, link_metrics, checker_class):
+    """
+    Тест проверки ссылок в пуле потоков: ссылки завершаются не по порядку, но битые ссылки возвращаются
+    в порядке страницы, а iter_check_links отдает результат по каждой уникальной ссылке.
+    """
+    base_url, root = local_site
+    (root / 'ok.html').write_text('<html></html>')
+    # Первые ссылки отвечают дольше последних, поэтому завершаются позже
+    links = [f'/{"ok" if i % 3 == 0 else "missing"}.html?delay={0.02 * (12 - i)}&i={i}' for i in range(12)]
+    links += links[:4] + ['#top', 'mailto:team@example.com']
+    urls = [LinkCheckerSync.normalize_url(link, base_url) for link in links[:12]]
+    checker = checker_class(cache=None, workers=4, metrics=link_metrics)
+
+    broken_links = checker.check_all_links(links, base_url)
+    results = list(checker.iter_check_links(links, base_url))
+
+    assert broken_links == [(url, 404) for url in urls if 'missing' in url]
+    assert sorted(results) == sorted((url, 404 if 'missing' in url else 200) for url in urls)
+    assert (link_metrics.checked, link_metrics.in_flight) == (24, 0)
+
+
+@allure.epic('Синхронная проверка ссылок')
+@pytest.mark.parametrize('extractor', ['bs4', 'stream'])
+def test_page_is_fetched_through_checker_client(local_site, link_metrics, extractor):
+    """
+    Тест загрузки страницы для BeautifulSoup-проверки: страница загружается клиентом чекера (в том числе
+    потоково), поэтому на нее действует circuit breaker клиента.
+    """
+    base_url, root = local_site
+    (root / 'page.html').write_text('<html><body><a href="/missing.html">x</a><a href="/page.html">y</a></body></html>')
+    checker = LinkCheckerSync(cache=None, extractor=extractor, metrics=link_metrics)
+
+    assert checker.check_links_on_page_with_bs4(f'{base_url}/page.html') == [(f'{base_url}/missing.html', 404)]
+
+    checker.client.circuit_breaker = CircuitBreaker(failure_threshold=1)
+    checker.client.circuit_breaker.record_failure(base_url)
+    with pytest.raises(CircuitOpenError):
+        checker.check_links_on_page_with_bs4(f'{base_url}/page.html')
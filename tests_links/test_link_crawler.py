@@ -0,0 +1,93 @@
+import asyncio
+
+import allure
+import pytest
+
+from tools.link_checker.link_checker_async import LinkCheckerAsync
+from tools.link_checker.link_crawler import LinkCrawler
+
+
+def create_site(root, pages=4):
+    """
+    Создает сайт из нескольких страниц, ссылающихся друг на друга и на несуществующие медленные страницы.
+    """
+    for page in range(pages):
+        links = [f'/page{other}.html' for other in range(pages)]
+        links += [f'/missing/{page}/{i}.html?delay=0.05' for i in range(3)]
+        anchors = ''.join(f'<a href="{link}">{link}</a>' for link in links)
+        (root / f'page{page}.html').write_text(f'<html><body>{anchors}</body></html>')
+
+
+def track_checks(monkeypatch, checker):
+    """
+    Подменяет check_all_links чекера оберткой, которая считает одновременные и отмененные проверки страниц.
+    """
+    state = {'active': 0, 'max_active': 0, 'cancelled': []}
+    check_all_links = checker.check_all_links
+
+    async def tracked(links, base_url):
+        state['active'] += 1
+        state['max_active'] = max(state['max_active'], state['active'])
+        try:
+            return await check_all_links(links, base_url)
+        except asyncio.CancelledError:
+            state['cancelled'].append(base_url)
+            raise
+        finally:
+            state['active'] -= 1
+
+    monkeypatch.setattr(checker, 'check_all_links', tracked)
+    return state
+
+
+@allure.epic('Обход сайта')
+@pytest.mark.asyncio
+async def test_crawl_bounds_concurrent_page_checks(local_site, link_metrics, monkeypatch):
+    """
+    Тест обхода сайта: ссылки проверяются не больше чем для check_concurrency страниц одновременно,
+    и битые ссылки всех страниц попадают в результат.
+    """
+    base_url, root = local_site
+    create_site(root)
+    checker = LinkCheckerAsync(cache=None, metrics=link_metrics)
+    state = track_checks(monkeypatch, checker)
+    crawler = LinkCrawler(checker, max_depth=1, page_concurrency=4, check_concurrency=2)
+    try:
+        broken_links = await crawler.crawl(f'{base_url}/page0.html')
+    finally:
+        await checker.client.close()
+
+    assert len(crawler.crawled_pages) == 4
+    assert sorted(url for url, _ in broken_links) == sorted(
+        f'{base_url}/missing/{page}/{i}.html?delay=0.05' for page in range(4) for i in range(3)
+    )
+    assert state['max_active'] <= 2
+
+
+@allure.epic('Обход сайта')
+@pytest.mark.asyncio
+async def test_crawl_cancels_page_checks_on_error(local_site, link_metrics, monkeypatch):
+    """
+    Тест ошибки при обходе сайта: начатые проверки ссылок отменяются и завершаются до выхода из crawl.
+    """
+    base_url, root = local_site
+    create_site(root)
+    checker = LinkCheckerAsync(cache=None, metrics=link_metrics)
+    state = track_checks(monkeypatch, checker)
+    crawler = LinkCrawler(checker, max_depth=1, page_concurrency=1)
+    fetch_links = crawler._fetch_links
+
+    async def fail_after_seed(page_url):
+        if crawler.crawled_pages:
+            raise RuntimeError('Ошибка загрузки страницы')
+        return await fetch_links(page_url)
+
+    monkeypatch.setattr(crawler, '_fetch_links', fail_after_seed)
+    try:
+        with pytest.raises(RuntimeError):
+            await crawler.crawl(f'{base_url}/page0.html')
+    finally:
+        await checker.client.close()
+
+    assert state['cancelled'] == [f'{base_url}/page0.html']
+    assert state['active'] == 0
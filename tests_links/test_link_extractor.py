@@ -0,0 +1,46 @@
+import allure
+import pytest
+
+from tools.link_checker.link_extractor import StreamingLinkExtractor
+from tools.link_checker.link_processor import LinkProcessor
+
+HTML_CONTENT = (
+    '<html><body><a href="/first?a=1&amp;b=2">Первая</a><a name="no-href">Без ссылки</a>'
+    '<p>Текст со ссылкой <A HREF="https://example.com/second">вторая</A></p><a href="/третья"/>'
+    '</body></html>'
+)
+
+
+@allure.epic('Потоковое извлечение ссылок')
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_streaming_extractor_matches_bs4(chunk_size):
+    """
+    Тест совпадения потокового извлечения ссылок с BeautifulSoup при любой нарезке HTML на куски.
+    """
+    data = HTML_CONTENT.encode('utf-8')
+    chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+    links = list(StreamingLinkExtractor.iter_links(chunks))
+
+    assert links == LinkProcessor.get_all_links_with_bs4(HTML_CONTENT)
+
+
+@allure.epic('Потоковое извлечение ссылок')
+def test_asset_extractor_collects_all_resource_types():
+    """
+    Тест извлечения ссылок на изображения, srcset, скрипты, стили, шрифты, медиа и url(...) в CSS.
+    """
+    html_content = (
+        '<html><head><link rel="stylesheet" href="/main.css"><link rel="icon" href="/favicon.ico">'
+        '<link rel="preload" as="font" href="/f.woff2"><script src="/app.js"></script>'
+        '<style>@import "/print.css"; body { background: url(\'/bg.png\'); }</style></head>'
+        '<body><a href="/page">Страница</a><img src="/a.png" srcset="/a-1x.png 1x, /a-2x.png 2x">'
+        '<picture><source srcset="/b.webp"></picture><video poster="/poster.jpg"><source src="/v.mp4"></video>'
+        '<div style="background-image: url(/div.jpg)"></div></body></html>'
+    )
+    assert LinkProcessor.get_all_assets(html_content) == [
+        ("/main.css", "stylesheet"), ("/favicon.ico", "image"), ("/f.woff2", "font"), ("/app.js", "script"),
+        ("/print.css", "stylesheet"), ("/bg.png", "image"), ("/page", "link"), ("/a.png", "image"),
+        ("/a-1x.png", "image"), ("/a-2x.png", "image"), ("/b.webp", "image"), ("/poster.jpg", "image"),
+        ("/v.mp4", "media"), ("/div.jpg", "image"),
+    ]
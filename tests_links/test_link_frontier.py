@@ -0,0 +1,39 @@
+import allure
+import pytest
+
+from tools.link_checker.frontier import MemoryFrontier, SqliteFrontier
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def frontier(request, tmp_path):
+    if request.param == "memory":
+        return MemoryFrontier(visibility_timeout=0, max_attempts=2)
+    return SqliteFrontier(tmp_path / "frontier.sqlite", visibility_timeout=0, max_attempts=2)
+
+
+@allure.epic('Общая очередь ссылок на проверку')
+def test_frontier_leases_each_url_once(frontier):
+    """
+    Тест выдачи ссылок в аренду без повторов и подтверждения результатов.
+    """
+    frontier.visibility_timeout = 60
+    assert frontier.put(["https://example.com/a", "https://example.com/b"], "https://example.com/") == 2
+    assert frontier.put(["https://example.com/a"]) == 0
+    first, second = frontier.lease(1), frontier.lease(5)
+    assert [item.url for item in first + second] == ["https://example.com/a", "https://example.com/b"]
+    assert frontier.lease(5) == []
+    frontier.ack([("https://example.com/a", 200), ("https://example.com/b", 404)])
+    assert frontier.remaining() == 0
+    assert frontier.broken_links() == [("https://example.com/b", 404)]
+
+
+@allure.epic('Общая очередь ссылок на проверку')
+def test_frontier_reissues_abandoned_leases(frontier):
+    """
+    Тест повторной выдачи ссылки после истечения аренды и отказа от нее после max_attempts попыток.
+    """
+    frontier.put(["https://example.com/a"])
+    assert frontier.lease(1)[0].attempts == 1
+    assert frontier.lease(1)[0].attempts == 2
+    assert frontier.lease(1) == []
+    assert frontier.results() == {"https://example.com/a": frontier.ABANDONED}
@@ -0,0 +1,80 @@
+import json
+
+import allure
+import pytest
+
+from tools.link_checker.link_checker_sync import LinkCheckerSync
+from tools.link_checker.metrics import LatencyHistogram, LinkCheckMetrics
+
+
+@allure.epic('Показатели прогона проверки ссылок')
+def test_latency_histogram_percentiles():
+    """
+    Тест оценки перцентилей времени ответа с точностью до шага корзины (около 9%).
+    """
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.add(ms / 1000)
+    for percent, expected in ((50, 500), (95, 950), (99, 990)):
+        assert expected <= histogram.percentile(percent) <= expected * 1.1
+    assert histogram.summary()['max'] == 1000
+
+
+@allure.epic('Показатели прогона проверки ссылок')
+def test_link_check_metrics_per_host():
+    """
+    Тест учета проверок, ошибок и объема данных в целом и по хостам.
+    """
+    metrics = LinkCheckMetrics(progress_interval=None)
+    metrics.started(3)
+    metrics.record({'url': 'https://a.example.com/1', 'status_code': 200, 'elapsed': 0.1, 'bytes': 100})
+    metrics.record({'url': 'https://a.example.com/2', 'status_code': 404, 'elapsed': 0.2, 'bytes': 0}, broken=True)
+    metrics.record({'url': 'https://b.example.com/', 'status_code': 'No Response', 'elapsed': 5, 'bytes': 0,
+                    'error': 'ConnectTimeout'}, broken=True)
+    summary = metrics.summary()
+    assert (summary['checked'], summary['broken'], summary['in_flight'], summary['bytes']) == (3, 2, 0, 100)
+    assert summary['errors'] == {'ConnectTimeout': 1}
+    assert list(summary['hosts']) == ['b.example.com', 'a.example.com']
+    assert summary['hosts']['a.example.com']['count'] == 2
+
+
+@allure.epic('Показатели прогона проверки ссылок')
+@pytest.mark.parametrize('probe', [True, False])
+def test_record_counts_only_downloaded_bytes(local_site, link_metrics, probe):
+    """
+    Тест учета объема данных: проверка HEAD-запросом и откат на GET, закрытый после заголовков,
+    не засчитывают тело по Content-Length, а полная загрузка засчитывает его целиком.
+    """
+    base_url, root = local_site
+    (root / 'no-head').mkdir()
+    for path in ('file.bin', 'no-head/file.bin'):
+        (root / path).write_bytes(b'0' * 1024 * 1024)
+    checker = LinkCheckerSync(probe=probe, cache=None, metrics=link_metrics)
+    for path in ('file.bin', 'no-head/file.bin'):
+        record = checker._check_link(f'{base_url}/{path}')
+        assert record['status_code'] == 200
+        if probe:
+            assert record['bytes'] < 64 * 1024
+        else:
+            assert record['bytes'] == 1024 * 1024
+
+
+@allure.epic('Показатели прогона проверки ссылок')
+@pytest.mark.parametrize('seen_set', ['set', 'fingerprint', 'bloom'])
+def test_summary_reports_seen_set_memory(local_site, link_metrics, seen_set):
+    """
+    Тест итогов прогона: память множества просмотренных URL самой большой проверки попадает в итоги
+    и в JSON-файл с ними.
+    """
+    base_url, root = local_site
+    (root / 'ok.html').write_text('<html></html>')
+    checker = LinkCheckerSync(cache=None, seen_set=seen_set, metrics=link_metrics)
+
+    list(checker.iter_check_links(['/ok.html', '/ok.html', '/missing.html'], base_url))
+    summary = link_metrics.summary()
+    assert summary['seen_urls'] == 2
+    assert summary['seen_set_memory_bytes'] > 0
+
+    list(checker.iter_check_links(['/ok.html'], base_url))
+    with open(link_metrics.write_summary(), encoding='utf-8') as f:
+        assert json.load(f)['seen_set_memory_bytes'] == summary['seen_set_memory_bytes']
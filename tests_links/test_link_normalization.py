@@ -0,0 +1,60 @@
+import allure
+import pytest
+
+from tools.link_checker.link_checker_sync import LinkCheckerSync
+from tools.link_checker.link_processor import LinkProcessor
+
+
+@allure.epic('Нормализация ссылок перед проверкой')
+@pytest.mark.parametrize("link, expected", [
+    ("HTTP://Example.COM:80/path?b=2&a=1#section", "http://example.com/path?a=1&b=2"),
+    ("https://example.com:443", "https://example.com/"),
+    ("https://example.com:8443/path", "https://example.com:8443/path"),
+    ("/docs/page#anchor", "https://example.com/docs/page"),
+    ("page?x=1&x=0", "https://example.com/dir/page?x=1&x=0"),
+])
+def test_normalize_url(link, expected):
+    """
+    Тест приведения ссылки к каноническому абсолютному виду.
+    """
+    assert LinkProcessor.normalize_url(link, "https://example.com/dir/index.html") == expected
+
+
+@allure.epic('Нормализация ссылок перед проверкой')
+@pytest.mark.parametrize("link", [
+    None, "", "#top", "mailto:user@example.com", "tel:+70000000000", "javascript:void(0)",
+    "http://[oops/x", "https://example.com:port/",
+])
+def test_normalize_url_skips_non_http_links(link):
+    """
+    Тест отбрасывания ссылок, которые не нужно или невозможно проверить по HTTP.
+    """
+    assert LinkProcessor.normalize_url(link, "https://example.com/") is None
+
+
+@allure.epic('Нормализация ссылок перед проверкой')
+def test_prepare_links_removes_duplicates():
+    """
+    Тест удаления дубликатов с сохранением порядка ссылок на странице.
+    """
+    links = ["/b", "/a#top", "/a", "mailto:user@example.com", "HTTPS://EXAMPLE.COM/b"]
+    assert LinkProcessor.prepare_links(links, "https://example.com/") == [
+        "https://example.com/b", "https://example.com/a"
+    ]
+
+
+@allure.epic('Нормализация ссылок перед проверкой')
+def test_check_all_links_reports_malformed_links(local_site, results_sink, link_metrics):
+    """
+    Тест проверки страницы с ссылками, которые невозможно разобрать как URL: проверка остальных ссылок
+    не прерывается, а такие ссылки возвращаются и логируются как битые.
+    """
+    base_url, root = local_site
+    (root / 'ok.html').write_text('<html></html>')
+    links = ['/ok.html', 'http://[oops/x', '/missing.html', ' http://[oops/x ']
+    checker = LinkCheckerSync(cache=None, metrics=link_metrics)
+    assert checker.check_all_links(links, base_url) == [
+        (f'{base_url}/missing.html', 404), ('http://[oops/x', LinkProcessor.MALFORMED_URL),
+    ]
+    results_sink.flush()
+    assert 'http://[oops/x' in (root / 'broken_links.jsonl').read_text()
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
+from urllib.parse import urlsplit
+
+import allure
+import requests
+
+from tools.link_checker.link_checker_sync import LinkCheckerSync
+from tools.link_checker.politeness import HostPoliteness
+
+
+@allure.epic('Вежливое обращение к хостам')
+def test_allowed_sync_applies_crawl_delay(local_site):
+    """
+    Тест синхронной проверки robots.txt с Crawl-delay из нескольких потоков: robots.txt загружается
+    и разбирается без взаимной блокировки, запрещенные пути отклоняются, частота запросов к хосту снижается.
+    """
+    base_url, root = local_site
+    (root / 'robots.txt').write_text('User-agent: *\nCrawl-delay: 2\nDisallow: /private/\n')
+    politeness = HostPoliteness(rate=10, burst=5)
+    urls = [f'{base_url}/page/{i}' for i in range(8)] + [f'{base_url}/private/{i}' for i in range(8)]
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(politeness.allowed_sync, session, url) for url in urls]
+        allowed = [future.result(timeout=10) for future in futures]
+    assert allowed == [True] * 8 + [False] * 8
+    bucket = politeness.bucket(base_url)
+    assert (bucket.rate, bucket.burst) == (0.5, 1)
+
+
+@allure.epic('Вежливое обращение к хостам')
+def test_interleave_by_host_round_robin():
+    """
+    Тест чередования ссылок по хостам: ссылки выдаются по кругу между хостами в порядке их появления.
+    """
+    urls = ['http://a/1', 'http://a/2', 'http://a/3', 'http://b/1', 'http://c/1', 'http://b/2']
+    assert list(HostPoliteness.interleave_by_host(urls)) == [
+        'http://a/1', 'http://b/1', 'http://c/1', 'http://a/2', 'http://b/2', 'http://a/3',
+    ]
+
+
+@allure.epic('Вежливое обращение к хостам')
+def test_interleave_by_host_reads_bounded_window():
+    """
+    Тест ленивого чередования: из бесконечного потока ссылок читается не больше window ссылок сверх выданных.
+    """
+    consumed = count()
+    urls = (f'http://host{next(consumed) % 3}/{i}' for i in count())
+    interleaved = HostPoliteness.interleave_by_host(urls, window=10)
+    assert [urlsplit(url).netloc for url in islice(interleaved, 6)] == ['host0', 'host1', 'host2'] * 2
+    assert next(consumed) <= 6 + 10
+
+
+@allure.epic('Вежливое обращение к хостам')
+def test_iter_check_links_with_politeness_is_lazy(local_site, link_metrics):
+    """
+    Тест проверки ссылок с politeness: ссылки из потока читаются по мере проверки, а не загружаются целиком.
+    """
+    base_url, root = local_site
+    (root / 'ok.html').write_text('<html></html>')
+    consumed = count()
+    links = (f'/ok.html?i={next(consumed)}' for _ in range(1000))
+    checker = LinkCheckerSync(cache=None, politeness=HostPoliteness(rate=1000, burst=1000), metrics=link_metrics)
+    results = list(islice(checker.iter_check_links(links, base_url), 3))
+    assert [status for _, status in results] == [200] * 3
+    assert next(consumed) <= 3 + 4
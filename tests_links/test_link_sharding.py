@@ -0,0 +1,31 @@
+import allure
+import pytest
+
+from tools.link_checker.link_checker_sharded import LinkCheckerSharded, host_hash
+
+
+@allure.epic('Распределение ссылок по процессам')
+@pytest.mark.asyncio
+async def test_sharded_checker_splits_hosts_and_merges_results(local_site, link_metrics):
+    """
+    Тест проверки ссылок двух хостов в пуле процессов: части shard/shards не пересекаются и вместе
+    покрывают все ссылки, а результаты процессов собираются в порядке ссылок страницы.
+    """
+    base_url, root = local_site
+    (root / 'ok.html').write_text('<html></html>')
+    port = base_url.rsplit(':', 1)[1]
+    hosts = [f'http://127.0.0.1:{port}', f'http://localhost:{port}']
+    links = [f'{host}/{page}' for page in ('ok.html', 'missing.html', 'gone.html') for host in hosts]
+    expected = [(url, 404) for url in links if 'ok.html' not in url]
+
+    checker = LinkCheckerSharded(processes=2, cache=None, metrics=link_metrics)
+    try:
+        assert await checker.check_all_links(links, base_url) == expected
+        executor = checker._executor
+        parts = [await checker.check_all_links(links, base_url, shard=shard, shards=2) for shard in range(2)]
+        assert checker._executor is executor
+    finally:
+        checker.close()
+    assert sorted(parts[0] + parts[1]) == sorted(expected)
+    for shard, part in enumerate(parts):
+        assert all(host_hash(url) % 2 == shard for url, _ in part)
@@ -0,0 +1,67 @@
+import csv
+import json
+
+import allure
+import pytest
+
+from tools.link_checker.link_sink import LinkResultSink
+
+
+def read_records(path, fmt):
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            return [LinkResultSink._decode_csv_row(row) for row in csv.DictReader(f)]
+        return [json.loads(line) for line in f]
+
+
+@allure.epic('Приемник результатов проверки ссылок')
+def test_sink_flushes_buffer_by_threshold(tmp_path):
+    """
+    Тест буферизации: записи попадают в файл пачкой после buffer_size записей, остаток - при flush.
+    """
+    path = tmp_path / 'broken_links.jsonl'
+    sink = LinkResultSink(str(path), buffer_size=3)
+    sink.write('https://example.com/1', 404)
+    sink.write('https://example.com/2', 500)
+    assert not path.exists()
+    sink.write('https://example.com/3', 'No Response', error='ConnectTimeout')
+    assert [record['url'] for record in read_records(path, 'jsonl')] == [f'https://example.com/{i}' for i in (1, 2, 3)]
+    sink.write('https://example.com/4', 404)
+    sink.flush()
+    assert len(read_records(path, 'jsonl')) == 4
+
+
+@allure.epic('Приемник результатов проверки ссылок')
+@pytest.mark.parametrize('fmt', LinkResultSink.FORMATS)
+def test_sink_merges_worker_shards(tmp_path, monkeypatch, fmt):
+    """
+    Тест записи шардов воркеров pytest-xdist и их объединения в основной файл: поля записей,
+    включая список редиректов, сохраняются в обоих форматах, шарды удаляются.
+    """
+    path = tmp_path / f'broken_links.{fmt}'
+    sink = LinkResultSink(str(path))
+    for worker in ('gw0', 'gw1'):
+        monkeypatch.setenv('PYTEST_XDIST_WORKER', worker)
+        sink.write(f'https://example.com/{worker}', 404, page_url='https://example.com/',
+                   redirects=[f'https://example.com/{worker}/old'], elapsed=0.5)
+        sink.flush()
+        assert (tmp_path / f'broken_links.{worker}.{fmt}').exists()
+
+    monkeypatch.delenv('PYTEST_XDIST_WORKER')
+    sink.merge_shards()
+
+    records = read_records(path, fmt)
+    assert [record['url'] for record in records] == ['https://example.com/gw0', 'https://example.com/gw1']
+    assert records[1]['redirects'] == ['https://example.com/gw1/old']
+    assert records[1]['page_url'] == 'https://example.com/'
+    assert str(records[1]['status_code']) == '404'
+    assert sorted(item.name for item in tmp_path.iterdir()) == [f'broken_links.{fmt}']
+
+
+@allure.epic('Приемник результатов проверки ссылок')
+def test_sink_rejects_unknown_format(tmp_path):
+    """
+    Тест проверки формата файла результатов по расширению.
+    """
+    with pytest.raises(ValueError):
+        LinkResultSink(str(tmp_path / 'broken_links.txt'))
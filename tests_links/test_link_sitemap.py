@@ -0,0 +1,68 @@
+import gzip
+import json
+
+import allure
+import pytest
+
+from tools.link_checker.link_checker_async import LinkCheckerAsync
+from tools.link_checker.sitemap import SitemapReader
+
+
+def urlset(*urls):
+    locs = ''.join(f'<url><loc>{url}</loc></url>' for url in urls)
+    return f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>'
+
+
+def sitemapindex(*urls):
+    locs = ''.join(f'<sitemap><loc>{url}</loc></sitemap>' for url in urls)
+    return f'<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</sitemapindex>'
+
+
+@allure.epic('Чтение sitemap')
+def test_sitemap_reader_reads_gzip_sitemap(local_site):
+    """
+    Тест чтения сжатого gzip sitemap по URL и из локального файла.
+    """
+    base_url, root = local_site
+    (root / 'sitemap.xml.gz').write_bytes(gzip.compress(urlset(f'{base_url}/a', f'{base_url}/b').encode()))
+    reader = SitemapReader()
+    assert list(reader.iter_urls(f'{base_url}/sitemap.xml.gz')) == [f'{base_url}/a', f'{base_url}/b']
+    assert list(reader.iter_urls(str(root / 'sitemap.xml.gz'))) == [f'{base_url}/a', f'{base_url}/b']
+
+
+@allure.epic('Чтение sitemap')
+def test_sitemap_reader_follows_nested_indexes_once(local_site):
+    """
+    Тест обхода вложенных индексов sitemap: каждый sitemap читается один раз, даже если индексы
+    ссылаются друг на друга по кругу, а индексы глубже max_depth пропускаются.
+    """
+    base_url, root = local_site
+    (root / 'index.xml').write_text(sitemapindex(f'{base_url}/nested.xml', f'{base_url}/pages.xml.gz'))
+    (root / 'nested.xml').write_text(sitemapindex(f'{base_url}/index.xml', f'{base_url}/deep.xml'))
+    (root / 'deep.xml').write_text(urlset(f'{base_url}/deep'))
+    (root / 'pages.xml.gz').write_bytes(gzip.compress(urlset(f'{base_url}/a', f'{base_url}/b').encode()))
+    index_url = f'{base_url}/index.xml'
+    assert list(SitemapReader().iter_urls(index_url)) == [f'{base_url}/deep', f'{base_url}/a', f'{base_url}/b']
+    assert list(SitemapReader(max_depth=1).iter_urls(index_url)) == [f'{base_url}/a', f'{base_url}/b']
+
+
+@allure.epic('Чтение sitemap')
+@pytest.mark.asyncio
+async def test_check_sitemap_reports_broken_pages(local_site, results_sink, link_metrics):
+    """
+    Тест проверки ссылок из sitemap пачками: битые страницы попадают в результат и в приемник битых ссылок.
+    """
+    base_url, root = local_site
+    (root / 'ok.html').write_text('<html></html>')
+    pages = [f'{base_url}/ok.html', f'{base_url}/ok.html?page=2', f'{base_url}/missing.html', f'{base_url}/']
+    (root / 'sitemap.xml').write_text(urlset(*pages))
+    checker = LinkCheckerAsync(cache=None, metrics=link_metrics)
+    try:
+        broken_links = await checker.check_sitemap(f'{base_url}/sitemap.xml', batch_size=2)
+    finally:
+        await checker.client.close()
+    assert broken_links == [(f'{base_url}/missing.html', 404)]
+    results_sink.flush()
+    record = json.loads((root / 'broken_links.jsonl').read_text())
+    assert (record['url'], record['status_code'], record['page_url']) == (
+        f'{base_url}/missing.html', 404, f'{base_url}/sitemap.xml')
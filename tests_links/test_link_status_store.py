@@ -0,0 +1,88 @@
+import allure
+import pytest
+
+from tools.link_checker.link_cache import LinkStatusStore
+from tools.link_checker.link_checker_async import LinkCheckerAsync
+from tools.link_checker.link_checker_old import LinkCheckerOld
+from tools.link_checker.link_checker_sync import LinkCheckerSync
+
+
+def track_records(monkeypatch, store):
+    """
+    Подменяет record хранилища оберткой, которая запоминает исходные коды ответов (до замены 304 на 200).
+    """
+    statuses = []
+    record = store.record
+
+    def tracked(url, status_code, headers=None):
+        statuses.append(status_code)
+        return record(url, status_code, headers)
+
+    monkeypatch.setattr(store, 'record', tracked)
+    return statuses
+
+
+async def check_link(checker, link, base_url):
+    """
+    Проверяет одну ссылку синхронным или асинхронным чекером и возвращает ее код ответа.
+    """
+    if isinstance(checker, LinkCheckerAsync):
+        results = [result async for result in checker.iter_check_links([link], base_url)]
+    else:
+        results = list(checker.iter_check_links([link], base_url))
+    return results[0][1]
+
+
+@allure.epic('Постоянный кэш результатов проверки ссылок')
+def test_store_skips_fresh_links_and_revalidates_stale(tmp_path):
+    """
+    Тест постоянного кэша: свежая рабочая ссылка не проверяется повторно, для устаревшей формируются
+    заголовки условного запроса, ответ 304 засчитывается как 200 и продлевает запись, битые ссылки
+    проверяются всегда.
+    """
+    store = LinkStatusStore(str(tmp_path / 'link_status.sqlite'), ttl=60)
+    url = 'https://example.com/page'
+    modified = 'Wed, 21 Oct 2026 07:28:00 GMT'
+    try:
+        assert store.lookup(url) == (None, None)
+        assert store.record(url, 200, {'ETag': '"v1"', 'Last-Modified': modified}) == 200
+        assert store.lookup(url) == (200, None)
+
+        store.ttl = 0
+        assert store.lookup(url) == (None, {'If-None-Match': '"v1"', 'If-Modified-Since': modified})
+        assert store.record(url, 304) == 200
+        store.ttl = 60
+        assert store.lookup(url) == (200, None)
+
+        store.record(url, 404)
+        assert store.lookup(url) == (None, None)
+    finally:
+        store.close()
+
+
+@allure.epic('Постоянный кэш результатов проверки ссылок')
+@pytest.mark.asyncio
+@pytest.mark.parametrize('probe', [True, False])
+@pytest.mark.parametrize('checker_class', [LinkCheckerOld, LinkCheckerSync, LinkCheckerAsync])
+async def test_checker_revalidates_stale_links(local_site, link_metrics, tmp_path, monkeypatch, checker_class, probe):
+    """
+    Тест условной проверки ссылок чекерами: устаревшая запись проверяется с If-Modified-Since
+    (HEAD-запросом или полным GET), сервер отвечает 304, и ссылка считается рабочей; свежая запись
+    не проверяется.
+    """
+    base_url, root = local_site
+    (root / 'ok.html').write_text('<html></html>')
+    store = LinkStatusStore(str(tmp_path / 'link_status.sqlite'), ttl=0)
+    statuses = track_records(monkeypatch, store)
+    checker = checker_class(probe=probe, cache=None, store=store, metrics=link_metrics)
+    try:
+        assert await check_link(checker, '/ok.html', base_url) == 200
+        assert await check_link(checker, '/ok.html', base_url) == 200
+        store.ttl = 60
+        assert await check_link(checker, '/ok.html', base_url) == 200
+    finally:
+        if isinstance(checker, LinkCheckerAsync):
+            await checker.client.close()
+        store.close()
+
+    assert statuses == [200, 304]
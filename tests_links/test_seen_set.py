@@ -0,0 +1,73 @@
+import allure
+import pytest
+
+from tools.link_checker.link_cache import LinkResultCache
+from tools.link_checker.link_checker_sync import LinkCheckerSync
+from tools.link_checker.seen_set import create_seen_set
+
+
+@allure.epic('Компактное множество просмотренных URL')
+@pytest.mark.parametrize("kind", ["set", "fingerprint", "bloom"])
+def test_seen_set_tracks_added_urls(kind):
+    """
+    Тест добавления URL и поиска уже просмотренных URL.
+    """
+    seen = create_seen_set(kind, capacity=10000)
+    urls = [f"https://example.com/page/{i}" for i in range(5000)]
+    assert all(seen.add(url) for url in urls[::2])
+    assert all(url in seen for url in urls[::2])
+    assert not seen.add(urls[0])
+    assert len(seen) == 2500
+    if kind != "bloom":
+        assert not any(url in seen for url in urls[1::2])
+
+
+@allure.epic('Компактное множество просмотренных URL')
+def test_fingerprint_set_is_smaller_than_plain_set():
+    """
+    Тест объема памяти множества отпечатков по сравнению с обычным множеством строк.
+    """
+    plain, compact = create_seen_set("set"), create_seen_set("fingerprint")
+    for i in range(10000):
+        url = f"https://example.com/catalog/item?id={i}"
+        plain.add(url)
+        compact.add(url)
+    assert compact.memory_bytes * 3 < plain.memory_bytes
+
+
+class SaturatedSeenSet(set):
+    """
+    Множество, которое, как переполненный фильтр Блума, считает просмотренным любой URL.
+    """
+
+    def __contains__(self, url):
+        return True
+
+
+@allure.epic('Компактное множество просмотренных URL')
+def test_check_all_links_survives_bloom_false_positives(local_site, link_metrics, monkeypatch):
+    """
+    Тест того, что ложные срабатывания множества просмотренных URL не теряют ссылки страницы,
+    из которых дубликаты уже удалены.
+    """
+    base_url, root = local_site
+    (root / 'ok.html').write_text('<html></html>')
+    checker = LinkCheckerSync(cache=None, seen_set='bloom', metrics=link_metrics)
+    monkeypatch.setattr(checker, 'new_seen_set', lambda capacity=None: SaturatedSeenSet())
+    broken_links = checker.check_all_links(['/ok.html', '/missing.html', '/ok.html'], base_url)
+    assert broken_links == [(f'{base_url}/missing.html', 404)]
+
+
+@allure.epic('Компактное множество просмотренных URL')
+def test_link_result_cache_evicts_least_recently_used():
+    """
+    Тест ограничения кэша результатов проверки: сверх max_entries вытесняются давно не использованные ссылки.
+    """
+    cache = LinkResultCache(max_entries=2)
+    cache.set('https://example.com/a', 200)
+    cache.set('https://example.com/b', 404)
+    assert cache.get('https://example.com/a') == 200
+    cache.set('https://example.com/c', 200)
+    assert len(cache) == 2
+    assert cache.get('https://example.com/b') is None
+    assert cache.get('https://example.com/a') == 200
@@ -3,8 +3,27 @@ import json.decoder
 
 from requests import Response
 
+from tools.api.response import response_body
+
 
 class Assertions:
+    @staticmethod
+    def _get_json(response: Response):
+        """
+        Получить JSON ответа. Тело разбирается один раз на ответ, последующие проверки берут его из кэша.
+
+        Аргументы:
+            response (Response): Объект ответа, содержащий JSON.
+
+        Исключения:
+            AssertionError: Если ответ не в формате JSON.
+        """
+        body = response_body(response)
+        try:
+            return body.json()
+        except json.JSONDecodeError:
+            assert False, f"Ответ не в формате JSON. Текст ответа: '{body.text}'"
+
     @staticmethod
     def assert_json_value_by_name(response: Response, name, expected_value, error_message):
         """
@@ -22,10 +41,7 @@ class Assertions:
             AssertionError: Если значение ключа JSON не соответствует ожидаемому значению.
         """
 
-        try:
-            response_as_dict = response.json()
-        except json.JSONDecodeError:
-            assert False, f"Ответ не в формате JSON. Текст ответа: '{response.text}'"
+        response_as_dict = Assertions._get_json(response)
 
         assert name in response_as_dict, f"JSON ответа не содержит ключа '{name}'"
         assert response_as_dict[name] == expected_value, error_message
@@ -44,10 +60,7 @@ class Assertions:
             AssertionError: Если JSON не содержит указанный ключ.
         """
 
-        try:
-            response_as_dict = response.json()
-        except json.JSONDecodeError:
-            assert False, f"Ответ не в формате JSON. Текст ответа: '{response.text}'"
+        response_as_dict = Assertions._get_json(response)
 
         assert name in response_as_dict, f"JSON ответа не содержит ключа '{name}'"
 
@@ -65,10 +78,7 @@ class Assertions:
             AssertionError: Если JSON не содержит хотя бы один из указанных ключей.
         """
 
-        try:
-            response_as_dict = response.json()
-        except json.JSONDecodeError:
-            assert False, f"Ответ не в формате JSON. Текст ответа: '{response.text}'"
+        response_as_dict = Assertions._get_json(response)
 
         for name in names:
             assert name in response_as_dict, f"JSON ответа не содержит ключа '{name}'"
@@ -87,10 +97,7 @@ class Assertions:
             AssertionError: Если JSON содержит указанный ключ.
         """
 
-        try:
-            response_as_dict = response.json()
-        except json.JSONDecodeError:
-            assert False, f"Ответ не в формате JSON. Текст ответа: '{response.text}'"
+        response_as_dict = Assertions._get_json(response)
 
         assert name not in response_as_dict, f"JSON ответа не должен содержать ключ '{name}'. Однако он присутствует"
 
@@ -0,0 +1,227 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+
+class ResponseCache:
+    """
+    Кэш ответов на GET-запросы с ограничением времени жизни и вытеснением давно не используемых записей (LRU).
+
+    Ключом служат метод, URL, параметры запроса и заголовки из VARY_HEADERS, поэтому ответы для разных
+    ключей API и токенов не смешиваются. Размер кэша ограничен количеством записей и суммарным объемом тел
+    ответов. После изменяющего запроса (POST, PUT, PATCH, DELETE) записи того же ресурса, вложенных в него
+    ресурсов и родительской коллекции сбрасываются через invalidate.
+
+    Чтобы ответ GET-запроса, выполнявшегося во время изменения ресурса, не попал в кэш устаревшим,
+    вызывающий код запоминает поколение ресурса (generation) до отправки запроса и передает его в set:
+    если с тех пор ресурс сбрасывался, ответ не сохраняется.
+    """
+
+    # Методы, которые не изменяют ресурс и не сбрасывают кэш
+    SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+    # Заголовки запроса, от которых зависит ответ и которые входят в ключ кэша
+    VARY_HEADERS = ('authorization', 'x-app-key', 'accept', 'accept-language')
+
+    def __init__(self, ttl=60, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        """
+        Args:
+            ttl (float): Время жизни записи в секундах.
+            max_entries (int): Максимальное количество записей.
+            max_bytes (int): Максимальный суммарный объем тел ответов в байтах.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        # Счетчики сбросов по ресурсам и по родительским коллекциям сброшенных ресурсов
+        self._resource_generations = {}
+        self._child_generations = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def make_key(cls, method, url, params=None, headers=None):
+        """
+        Формирует ключ кэша запроса.
+
+        Args:
+            method (str): Метод HTTP.
+            url (str): URL запроса.
+            params (dict): Параметры запроса.
+            headers (dict): Заголовки запроса.
+
+        Returns:
+            tuple: Ключ кэша.
+        """
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        return (
+            method.upper(),
+            url,
+            tuple(sorted((str(name), str(value)) for name, value in (params or {}).items())),
+            tuple(headers.get(name) for name in cls.VARY_HEADERS),
+        )
+
+    def get(self, key):
+        """
+        Возвращает сохраненный ответ, если запись есть и не устарела.
+
+        Args:
+            key (tuple): Ключ кэша (см. make_key).
+
+        Returns:
+            Any: Сохраненный ответ или None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, url):
+        """
+        Возвращает поколение ресурса: число, которое растет при каждом invalidate, затрагивающем записи этого URL.
+
+        Args:
+            url (str): URL запроса.
+
+        Returns:
+            int: Поколение ресурса.
+        """
+        with self._lock:
+            return self._generation(self._resource(url))
+
+    def set(self, key, value, size=0, ttl=None, generation=None):
+        """
+        Сохраняет ответ и вытесняет давно не используемые записи сверх ограничений.
+
+        Ответ больше max_bytes не сохраняется. Ответ также не сохраняется, если поколение ресурса изменилось
+        после generation: ресурс был изменен, пока выполнялся запрос.
+
+        Args:
+            key (tuple): Ключ кэша (см. make_key).
+            value (Any): Ответ.
+            size (int): Объем тела ответа в байтах.
+            ttl (float): Время жизни записи в секундах (по умолчанию ttl кэша).
+            generation (int): Поколение ресурса до отправки запроса (см. generation; None - без проверки).
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and self._generation(self._resource(key[1])) != generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    @classmethod
+    def affects(cls, url, key):
+        """
+        Проверяет, устаревает ли запись с ключом key после изменяющего запроса к url (по правилам invalidate).
+
+        Args:
+            url (str): URL изменяющего запроса.
+            key (tuple): Ключ записи (см. make_key).
+
+        Returns:
+            bool: True, если запись устаревает.
+        """
+        resource = cls._resource(url)
+        return cls._matches(key[1], resource, resource.rsplit('/', 1)[0])
+
+    def invalidate(self, url):
+        """
+        Сбрасывает записи ресурса после изменяющего запроса к нему.
+
+        Сбрасываются записи самого ресурса (с любыми параметрами), вложенных в него ресурсов и родительской
+        коллекции: после DELETE /users/5 устаревают и /users/5, и список /users.
+
+        Args:
+            url (str): URL изменяющего запроса.
+
+        Returns:
+            int: Количество сброшенных записей.
+        """
+        resource = self._resource(url)
+        parent = resource.rsplit('/', 1)[0]
+        with self._lock:
+            self._resource_generations[resource] = self._resource_generations.get(resource, 0) + 1
+            self._child_generations[parent] = self._child_generations.get(parent, 0) + 1
+            stale = [
+                key for key in self._entries
+                if self._matches(key[1], resource, parent)
+            ]
+            for key in stale:
+                self._remove(key)
+        return len(stale)
+
+    def clear(self):
+        """
+        Очищает кэш и счетчики.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Счетчики использования кэша.
+
+        Returns:
+            dict: Попадания, промахи, доля попаданий, вытеснения, количество записей и их объем в байтах.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _resource(url):
+        return urlsplit(url)._replace(query='', fragment='').geturl().rstrip('/')
+
+    @classmethod
+    def _matches(cls, url, resource, parent):
+        path = cls._resource(url)
+        return path == resource or path == parent or path.startswith(resource + '/')
+
+    def _generation(self, path):
+        # Запись пути сбрасывается при изменении самого ресурса, любого из его предков и любого прямого потомка
+        generation = self._child_generations.get(path, 0)
+        while True:
+            generation += self._resource_generations.get(path, 0)
+            ancestor = path.rsplit('/', 1)[0]
+            if ancestor == path or ancestor.endswith(':/') or not ancestor:
+                return generation
+            path = ancestor
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+
+api_response_cache = ResponseCache()
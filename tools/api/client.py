@@ -1,23 +1,57 @@
+import asyncio
 import json
 import logging
+import time
+from collections import namedtuple
+from functools import partial
 
 import aiohttp
 import allure
 import requests
+from requests.adapters import HTTPAdapter
 
 from environments import env
+from tools.api.cache import ResponseCache
+from tools.api.resilience import RetryPolicy
+from tools.api.response import ResponseBody, copy_response, response_body
 
+# Результат одного запроса пакета: номер в пакете, метод, эндпоинт, ответ, разобранный JSON и ошибка
+BatchResult = namedtuple('BatchResult', 'index method endpoint response data error')
 
-class APIClient:
 
-    def __init__(self, api_url=env.api_url, api_key=env.api_key, bearer=None):
+class APIClient:
+    # Коды ответа, при которых сервер не поддерживает HEAD и нужно повторить проверку через GET
+    HEAD_FALLBACK_STATUSES = (405, 501)
+    # Методы, которые можно отправить через _send
+    SEND_METHODS = ('GET', 'POST', 'PUT', 'PATCH')
+
+    def __init__(self, api_url=env.api_url, api_key=env.api_key, bearer=None,
+                 connect_timeout=5, read_timeout=30, total_timeout=None,
+                 retries=0, backoff_factor=0.5, circuit_breaker=None,
+                 pool_connections=10, pool_maxsize=10, max_retries=0, pool_block=False, cache=None):
         """
         Инициализация клиента API.
 
+        Все запросы отправляются через одну сессию requests, поэтому keep-alive соединения берутся
+        из пула адаптера, а не открываются заново на каждый запрос.
+
         Args:
             api_url (str): URL API.
             api_key (str): Ключ API.
             bearer (str): Токен для авторизации.
+            connect_timeout (float): Таймаут установки соединения в секундах.
+            read_timeout (float): Таймаут ожидания данных от сервера в секундах.
+            total_timeout (float): Общее время на запрос со всеми повторами в секундах (None - без ограничения).
+            retries (int): Количество повторов идемпотентных запросов после ошибок соединения и ответов 429/5xx
+                (0 - без повторов).
+            backoff_factor (float): Базовая задержка между повторами в секундах.
+            circuit_breaker (CircuitBreaker): Похостовый circuit breaker (None - без него).
+            pool_connections (int): Количество хостов, для которых в пуле хранятся соединения.
+            pool_maxsize (int): Максимальное количество соединений к одному хосту в пуле.
+            max_retries (int): Количество повторов адаптера urllib3 после ошибок установки соединения
+                (помимо повторов retries).
+            pool_block (bool): Ждать освобождения соединения, если пул хоста заполнен, вместо открытия лишнего.
+            cache (ResponseCache): Кэш ответов на GET-запросы, сбрасываемый изменяющими запросами (None - без кэша).
         """
         self.api_url = api_url
         self.api_key = api_key
@@ -29,9 +63,88 @@ class APIClient:
         if self.bearer is not None:
             self.headers['Authorization'] = f'Bearer {self.bearer}'
 
+        self.timeout = (connect_timeout, read_timeout)
+        self.total_timeout = total_timeout
+        self.retry_policy = RetryPolicy(retries=retries, backoff_factor=backoff_factor)
+        self.circuit_breaker = circuit_breaker
+        self.cache = cache
+
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              max_retries=max_retries, pool_block=pool_block)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def close(self):
+        """
+        Закрывает сессию клиента и освобождает соединения пула.
+        """
+        self.session.close()
+
+    def _merge_headers(self, headers=None):
+        """
+        Объединяет заголовки клиента (ключ API, токен) с заголовками запроса.
+
+        Args:
+            headers (dict): Заголовки запроса, дополняющие или переопределяющие заголовки клиента.
+
+        Returns:
+            dict: Заголовки для отправки.
+        """
+        return {**self.headers, **headers} if headers else self.headers
+
+    def _execute(self, method, url, **kwargs):
+        """
+        Отправляет запрос через сессию с таймаутами, повторами и circuit breaker.
+
+        Идемпотентные запросы повторяются с экспоненциальной задержкой после ошибок соединения,
+        таймаутов и ответов 429/5xx, пока не исчерпаны попытки или total_timeout. Ответ 429/503
+        с заголовком Retry-After повторяется через указанную сервером паузу.
+
+        Args:
+            method (str): Метод HTTP.
+            url (str): URL запроса.
+            **kwargs: Параметры requests.Session.request.
+
+        Returns:
+            requests.Response: Объект ответа от сервера.
 
-    def get(self, endpoint='', params=None, headers=None):
+        Raises:
+            requests.exceptions.RequestException: Если запрос не удался после всех попыток.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        deadline = time.monotonic() + self.total_timeout if self.total_timeout else None
+        attempt = 0
+        try:
+            while True:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.before_request(url)
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    if self.circuit_breaker is not None:
+                        self.circuit_breaker.record_failure(url)
+                    if not self.retry_policy.should_retry(method, attempt, deadline):
+                        raise
+                    delay = self.retry_policy.delay(attempt)
+                else:
+                    if self.circuit_breaker is not None:
+                        self.circuit_breaker.record_success(url)
+                    if response.status_code not in self.retry_policy.RETRY_STATUSES:
+                        return response
+                    delay = self.retry_policy.delay(attempt, response.status_code, response.headers)
+                    if delay is None or not self.retry_policy.should_retry(method, attempt, deadline, delay):
+                        return response
+                    response.close()
+                logging.warning(f"Повтор {method}-запроса к {url}, попытка {attempt + 2}")
+                time.sleep(delay)
+                attempt += 1
+        finally:
+            # Ресурс мог измениться, даже если ответ не получен, поэтому кэш сбрасывается в любом случае
+            if self.cache is not None and method.upper() not in self.cache.SAFE_METHODS:
+                self.cache.invalidate(url)
+
+    def get(self, endpoint='', params=None, headers=None, raise_errors=False):
         """
         Выполняет GET-запрос к API.
 
@@ -39,21 +152,84 @@ class APIClient:
             endpoint (str): Расширение URL для GET-запроса.
             params (dict): Параметры запроса.
             headers (dict): Заголовки запроса.
+            raise_errors (bool): Пробрасывать окончательную ошибку (после всех повторов) вместо возврата None.
+
+        Если у клиента есть кэш, успешный ответ сохраняется в нем, и повторные запросы возвращают копию
+        этого ответа со своим разобранным JSON. Ответ не сохраняется, если ресурс был изменен, пока выполнялся
+        запрос.
 
         Returns:
             requests.Response: Объект ответа от сервера или None в случае ошибки.
         """
         url = self.api_url + endpoint
-        headers = self.headers
+        headers = self._merge_headers(headers)
+        key = self.cache.make_key('GET', url, params, headers) if self.cache is not None else None
 
         with allure.step(f"Выполнение GET-запроса. URL: {url}"):
+            if key is not None and (response := self.cache.get(key)) is not None:
+                return copy_response(response)
+            generation = self.cache.generation(url) if key is not None else None
             try:
-                response = self.session.get(url, params=params, headers=headers)
+                response = self._execute('GET', url, params=params, headers=headers)
                 response.raise_for_status()  # Вызывает исключение для статусных кодов 4xx и 5xx
+                if key is not None:
+                    self.cache.set(key, copy_response(response), len(response.content), generation=generation)
                 return response
             except requests.exceptions.RequestException as e:
                 logging.error(f"Ошибка при выполнении GET-запроса: {e}")
                 allure.attach(str(e), name="Ошибка GET-запроса", attachment_type=allure.attachment_type.TEXT)
+                if raise_errors:
+                    raise
+                return None
+
+    def fetch_page(self, endpoint='', stream=False):
+        """
+        Загружает страницу с таймаутами, повторами и circuit breaker клиента, не проверяя код ответа.
+
+        Заголовки клиента (ключ API, токен) не отправляются, так как страница может быть сторонней.
+
+        Args:
+            endpoint (str): Расширение URL страницы.
+            stream (bool): Не загружать тело сразу, а читать его по частям (ответ нужно закрыть после чтения).
+
+        Returns:
+            requests.Response: Объект ответа от сервера.
+
+        Raises:
+            requests.exceptions.RequestException: Если запрос не удался после всех попыток.
+        """
+        return self._execute('GET', self.api_url + endpoint, stream=stream)
+
+    def probe(self, endpoint='', headers=None, raise_errors=False):
+        """
+        Проверяет доступность URL без скачивания тела ответа.
+
+        Сначала отправляется HEAD-запрос. Если сервер его не поддерживает (405/501), выполняется потоковый
+        GET-запрос, соединение которого закрывается сразу после получения заголовков.
+        Заголовки клиента (ключ API, токен) не отправляются, так как проверяемый URL может быть сторонним.
+
+        Args:
+            endpoint (str): Расширение URL для проверки.
+            headers (dict): Дополнительные заголовки запроса.
+            raise_errors (bool): Пробрасывать исключения requests вместо возврата None.
+
+        Returns:
+            requests.Response: Объект ответа без тела или None в случае ошибки соединения.
+        """
+        url = self.api_url + endpoint
+
+        with allure.step(f"Проверка доступности URL: {url}"):
+            try:
+                response = self._execute('HEAD', url, headers=headers, allow_redirects=True)
+                if response.status_code in self.HEAD_FALLBACK_STATUSES:
+                    response = self._execute('GET', url, headers=headers, allow_redirects=True, stream=True)
+                    response.close()
+                return response
+            except requests.exceptions.RequestException as e:
+                logging.error(f"Ошибка при проверке доступности URL: {e}")
+                allure.attach(str(e), name="Ошибка проверки URL", attachment_type=allure.attachment_type.TEXT)
+                if raise_errors:
+                    raise
                 return None
 
     def post(self, endpoint='', data=None):
@@ -72,7 +248,7 @@ class APIClient:
 
         with allure.step(f"Выполнение POST-запроса. URL: {url}"):
             try:
-                response = self.session.post(url, json=data, headers=headers)
+                response = self._execute('POST', url, json=data, headers=headers)
                 response.raise_for_status()  # Вызывает исключение для статусных кодов 4xx и 5xx
                 return response
             except requests.exceptions.RequestException as e:
@@ -92,14 +268,10 @@ class APIClient:
         Returns:
             requests.Response: Объект ответа от сервера.
         """
-        url = self.api_url + url
-        headers = self.headers
-
-        if url is None:
-            url = self.api_url
+        url = self.api_url + (url or '')
 
         with allure.step(f"Выполнение PUT-запроса. URL: {url}"):
-            response = self._send(url, data, headers, cookies, 'PUT')
+            response = self._send(url, data, None, cookies, 'PUT')
             return response
 
     def patch(self, endpoint='', data=None):
@@ -118,7 +290,7 @@ class APIClient:
 
         with allure.step(f"Выполнение PATCH-запроса. URL: {url}"):
             try:
-                response = self.session.patch(url, json=data, headers=headers)
+                response = self._execute('PATCH', url, json=data, headers=headers)
                 response.raise_for_status()  # Вызывает исключение для статусных кодов 4xx и 5xx
                 return response
             except requests.exceptions.RequestException as e:
@@ -140,7 +312,7 @@ class APIClient:
         url = self.api_url + endpoint
         with allure.step(f"Выполнение DELETE-запроса. URL: {url}"):
             try:
-                response = self.session.delete(url, json=data, headers=self.headers)
+                response = self._execute('DELETE', url, json=data, headers=self.headers)
                 response.raise_for_status()
                 return response
             except requests.exceptions.RequestException as e:
@@ -150,12 +322,12 @@ class APIClient:
 
     def _send(self, url, data, headers, cookies, method, params=None):
         """
-        Вспомогательный метод для отправки запроса к API.
+        Вспомогательный метод для отправки запроса к API через сессию клиента.
 
         Args:
             url (str): URL для запроса.
             data (dict): Данные запроса.
-            headers (dict): Заголовки запроса.
+            headers (dict): Дополнительные заголовки запроса (к заголовкам клиента).
             cookies (dict): Куки запроса.
             method (str): Метод HTTP.
             params (dict): Параметры запроса.
@@ -163,31 +335,13 @@ class APIClient:
         Returns:
             requests.Response: Объект ответа от сервера или None в случае ошибки.
         """
-        if not headers:
-            headers = {}
-
-        if self.api_key is not None:
-            self.headers['x-app-key'] = self.api_key
-            self.headers['Content-Type'] = 'application/json'
-        if self.bearer is not None:
-            self.headers['Authorization'] = f'Bearer {self.bearer}'
-            self.headers['Content-Type'] = 'application/json'
-
-        if not cookies:
-            cookies = {}
+        if method not in self.SEND_METHODS:
+            raise Exception(f'Недопустимый метод HTTP: "{method}"')
 
         with allure.step(f"Отправка {method}-запроса. URL: {url}"):
             try:
-                if method == 'GET':
-                    response = requests.get(url, params=params, headers=headers, cookies=cookies)
-                elif method == 'POST':
-                    response = requests.post(url, json=data, headers=headers, cookies=cookies)
-                elif method == 'PUT':
-                    response = requests.put(url, data=json.dumps(data), headers=headers, cookies=cookies)
-                elif method == 'PATCH':
-                    response = requests.patch(url, json=data, headers=headers, cookies=cookies)
-                else:
-                    raise Exception(f'Недопустимый метод HTTP: "{method}"')
+                response = self._execute(method, url, params=params, json=data,
+                                         headers=self._merge_headers(headers), cookies=cookies)
                 response.raise_for_status()
                 return response
             except requests.exceptions.RequestException as e:
@@ -247,7 +401,7 @@ class APIClient:
         """
         with allure.step(f"Получение значения из JSON-ответа по ключу: {key}"):
             try:
-                response_dict = response.json()
+                response_dict = response_body(response).json()
             except json.decoder.JSONDecodeError:
                 assert False, f"Ответ не в формате JSON. Текст ответа: '{response.text}'"
 
@@ -257,15 +411,36 @@ class APIClient:
 
 
 class APIClientAsync:
+    # Коды ответа, при которых сервер не поддерживает HEAD и нужно повторить проверку через GET
+    HEAD_FALLBACK_STATUSES = (405, 501)
 
-    def __init__(self, api_url=env.api_portal_url, api_key=env.api_key, bearer=None):
+    def __init__(self, api_url=env.api_portal_url, api_key=env.api_key, bearer=None,
+                 limit=100, limit_per_host=0, keepalive_timeout=15, ttl_dns_cache=10,
+                 connect_timeout=10, read_timeout=30, total_timeout=60,
+                 retries=0, backoff_factor=0.5, circuit_breaker=None, cache=None, single_flight=False):
         """
         Инициализация асинхронного клиента API.
 
+        Сессия aiohttp создается лениво при первом запросе и переиспользуется всеми последующими запросами,
+        поэтому TCP/TLS-соединения берутся из пула коннектора, а не открываются заново.
+
         Args:
             api_url (str): URL API.
             api_key (str): Ключ API.
             bearer (str): Токен для авторизации.
+            limit (int): Максимальное количество соединений в пуле (0 - без ограничений).
+            limit_per_host (int): Максимальное количество соединений к одному хосту (0 - без ограничений).
+            keepalive_timeout (float): Время жизни неиспользуемого keep-alive соединения в секундах.
+            ttl_dns_cache (int): Время кэширования DNS-записей в секундах.
+            connect_timeout (float): Таймаут установки соединения в секундах.
+            read_timeout (float): Таймаут ожидания данных от сервера в секундах.
+            total_timeout (float): Общее время на запрос со всеми повторами в секундах (None - без ограничения).
+            retries (int): Количество повторов идемпотентных запросов после ошибок соединения и ответов 429/5xx
+                (0 - без повторов).
+            backoff_factor (float): Базовая задержка между повторами в секундах.
+            circuit_breaker (CircuitBreaker): Похостовый circuit breaker (None - без него).
+            cache (ResponseCache): Кэш ответов на GET-запросы, сбрасываемый изменяющими запросами (None - без кэша).
+            single_flight (bool): Объединять одинаковые одновременные GET-запросы и проверки probe в один запрос.
         """
         self.api_url = api_url
         self.api_key = api_key
@@ -277,21 +452,370 @@ class APIClientAsync:
         if self.bearer is not None:
             self.headers['Authorization'] = f'Bearer {self.bearer}'
 
-    async def _request(self, method, endpoint, data=None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout, sock_read=read_timeout)
+        self.total_timeout = total_timeout
+        self.retry_policy = RetryPolicy(retries=retries, backoff_factor=backoff_factor)
+        self.circuit_breaker = circuit_breaker
+        self.cache = cache
+        self.single_flight = single_flight
+        # Количество запросов, которые дождались результата уже выполняющегося одинакового запроса
+        self.coalesced = 0
+
+        self._session = None
+        self._session_loop = None
+        self._in_flight = {}
+        # Количество вызывающих, ожидающих каждый общий запрос
+        self._waiters = {}
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _get_session(self):
+        """
+        Возвращает общую сессию клиента, создавая ее при первом обращении.
+
+        Сессия aiohttp привязана к event loop, в котором создана. Если клиент используется из другого
+        event loop (например, каждый asyncio.run в тестах создает новый loop), прежняя сессия закрывается
+        в своем loop и создается новая.
+
+        Returns:
+            aiohttp.ClientSession: Сессия клиента.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._session_loop is not loop:
+            await self.close()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.ttl_dns_cache,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._session_loop = loop
+        return self._session
+
+    async def close(self):
+        """
+        Закрывает сессию клиента и освобождает соединения пула.
+
+        Соединения сессии закрываются в event loop, которому она принадлежит: в текущем loop - напрямую,
+        в loop, работающем в другом потоке, - через run_coroutine_threadsafe, в остановленном loop - запуском
+        этого loop в отдельном потоке. У сессии уже закрытого loop закрыть соединения нельзя, поэтому close
+        нужно вызывать до завершения loop, в котором работал клиент.
+        """
+        session, self._session = self._session, None
+        loop, self._session_loop = self._session_loop, None
+        if session is None or session.closed:
+            return
+        if loop is asyncio.get_running_loop():
+            await session.close()
+        elif loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+        elif not loop.is_closed():
+            await asyncio.to_thread(loop.run_until_complete, session.close())
+        else:
+            session.detach()
+
+    async def _send(self, method, url, read=None, **kwargs):
+        """
+        Отправляет запрос через общую сессию с повторами и circuit breaker.
+
+        Идемпотентные запросы повторяются с экспоненциальной задержкой после ошибок соединения,
+        таймаутов и ответов 429/5xx, пока не исчерпаны попытки или total_timeout. Ответ 429/503
+        с заголовком Retry-After повторяется через указанную сервером паузу.
+
+        Args:
+            method (str): Метод HTTP.
+            url (str): URL запроса.
+            read (Callable): Корутина-функция, которая читает нужные данные из ответа, пока соединение открыто.
+            **kwargs: Параметры aiohttp.ClientSession.request.
+
+        Returns:
+            tuple: Объект ответа и результат read (или None).
+        """
+        session = await self._get_session()
+        deadline = time.monotonic() + self.total_timeout if self.total_timeout else None
+        attempt = 0
+        try:
+            while True:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.before_request(url)
+                try:
+                    async with session.request(method, url, **kwargs) as response:
+                        data = await read(response) if read is not None else None
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if self.circuit_breaker is not None:
+                        self.circuit_breaker.record_failure(url)
+                    if not self.retry_policy.should_retry(method, attempt, deadline):
+                        raise
+                    delay = self.retry_policy.delay(attempt)
+                else:
+                    if self.circuit_breaker is not None:
+                        self.circuit_breaker.record_success(url)
+                    if response.status not in self.retry_policy.RETRY_STATUSES:
+                        return response, data
+                    delay = self.retry_policy.delay(attempt, response.status, response.headers)
+                    if delay is None or not self.retry_policy.should_retry(method, attempt, deadline, delay):
+                        return response, data
+                logging.warning(f"Повтор {method}-запроса к {url}, попытка {attempt + 2}")
+                await asyncio.sleep(delay)
+                attempt += 1
+        finally:
+            # Ресурс мог измениться, даже если ответ не получен, поэтому кэш сбрасывается в любом случае
+            if method.upper() not in ResponseCache.SAFE_METHODS:
+                if self.cache is not None:
+                    self.cache.invalidate(url)
+                # Следующие запросы не должны присоединяться к начатым до изменения запросам этого ресурса
+                for key in [key for key in self._in_flight if ResponseCache.affects(url, key)]:
+                    del self._in_flight[key]
+
+    async def _request(self, method, endpoint, data=None, decode=True, headers=None):
+        """
+        Выполняет запрос к API и читает тело ответа.
+
+        Args:
+            method (str): Метод HTTP.
+            endpoint (str): Расширение URL.
+            data (dict): Данные запроса.
+            decode (bool): Разобрать JSON сразу. Если False, тело возвращается как ResponseBody
+                и разбирается только при обращении к нему.
+            headers (dict): Дополнительные заголовки запроса (дополняют заголовки клиента).
+
+        Если у клиента есть кэш, успешные ответы на GET-запросы берутся из него. С single_flight одинаковые
+        одновременные GET-запросы выполняются один раз.
+
+        Returns:
+            tuple: Объект ответа и разобранный JSON (None для пустого ответа или ответа не в JSON)
+                или ResponseBody при decode=False.
+        """
+        url = self.api_url + endpoint
+        headers = {**self.headers, **headers} if headers else self.headers
+        if method != 'GET' or (self.cache is None and not self.single_flight):
+            response, body = await self._send(method, url, read=self._read_body, json=data, headers=headers)
+            return response, body.data if decode else body
+
+        key = ResponseCache.make_key(method, url, headers=headers)
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            response, body = cached
+        else:
+            response, body = await self._coalesce(key, partial(self._get_and_cache, key, url, headers))
+        # Ответ из кэша или общего запроса: каждый вызывающий получает свою копию тела, чтобы разобранный
+        # JSON не был общим
+        body = body.copy()
+        return response, body.data if decode else body
+
+    async def _get_and_cache(self, key, url, headers):
+        # Поколение запоминается до запроса: если ресурс изменится, пока запрос выполняется, ответ не кэшируется
+        generation = self.cache.generation(url) if self.cache is not None else None
+        response, body = await self._send('GET', url, read=self._read_body, headers=headers)
+        if self.cache is not None and 200 <= response.status < 300:
+            self.cache.set(key, (response, body), len(body.content), generation=generation)
+        return response, body
+
+    async def _coalesce(self, key, send):
+        """
+        Выполняет запрос или, если одинаковый запрос уже выполняется, дожидается его результата (single-flight).
+
+        Запрос выполняется в отдельной задаче, поэтому отмена одного из ожидающих не отменяет запрос
+        для остальных. Когда отменены все ожидающие, запрос тоже отменяется, чтобы не занимать соединение
+        и место в ограничении параллельности. Ошибку запроса получают все ожидающие.
+
+        Args:
+            key (tuple): Ключ запроса.
+            send (Callable): Корутина-функция, выполняющая запрос.
+
+        Returns:
+            Any: Результат send.
+        """
+        if not self.single_flight:
+            return await send()
+        loop = asyncio.get_running_loop()
+        task = self._in_flight.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = self._in_flight[key] = loop.create_task(send())
+            task.add_done_callback(partial(self._forget_in_flight, key))
+        else:
+            self.coalesced += 1
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # Ожидающих не осталось: новые запросы не должны присоединяться к отменяемому
+                    if self._in_flight.get(key) is task:
+                        del self._in_flight[key]
+                    task.cancel()
+
+    def _forget_in_flight(self, key, task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Ошибка считается полученной, даже если все ожидающие были отменены
+        if not task.cancelled():
+            task.exception()
+
+    @staticmethod
+    async def _read_body(response):
+        return ResponseBody(await response.read(), response.headers.get('Content-Type'), response.charset)
+
+    async def probe(self, endpoint='', headers=None):
+        """
+        Проверяет доступность URL без скачивания и разбора тела ответа.
+
+        Сначала отправляется HEAD-запрос. Если сервер его не поддерживает (405/501), выполняется GET-запрос,
+        соединение которого закрывается сразу после получения заголовков.
+        Заголовки клиента (ключ API, токен) не отправляются, так как проверяемый URL может быть сторонним.
+        С single_flight одновременные проверки одного URL выполняются одним запросом.
+
+        Args:
+            endpoint (str): Расширение URL для проверки.
+            headers (dict): Дополнительные заголовки запроса.
+
+        Returns:
+            aiohttp.ClientResponse: Объект ответа без тела.
+        """
         url = self.api_url + endpoint
-        async with aiohttp.ClientSession() as session:
-            async with session.request(method, url, json=data, headers=self.headers) as response:
-                response_data = await response.json()
-                return response, response_data
+        # Условные заголовки (If-None-Match и др.) меняют ответ, поэтому в ключ входят все заголовки
+        key = ('HEAD', url, tuple(sorted((headers or {}).items())))
+        return await self._coalesce(key, partial(self._probe, url, headers))
 
-    async def get(self, endpoint=''):
-        return await self._request('GET', endpoint)
+    async def _probe(self, url, headers):
+        response, _ = await self._send('HEAD', url, headers=headers, allow_redirects=True)
+        if response.status not in self.HEAD_FALLBACK_STATUSES:
+            return response
 
-    async def post(self, endpoint='', data=None):
-        return await self._request('POST', endpoint, data)
+        async def close_connection(get_response):
+            get_response.close()
 
-    async def delete(self, endpoint=''):
-        return await self._request('DELETE', endpoint)
+        response, _ = await self._send('GET', url, read=close_connection, headers=headers, allow_redirects=True)
+        return response
+
+    async def fetch_page(self, endpoint='', read=None):
+        """
+        Загружает страницу и возвращает ее тело как текст без разбора JSON.
+
+        Заголовки клиента (ключ API, токен) не отправляются, так как страница может быть сторонней.
+
+        Args:
+            endpoint (str): Расширение URL страницы.
+            read (Callable): Корутина-функция, которая читает тело ответа вместо получения текста целиком
+                (например, потоково по кускам).
+
+        Returns:
+            tuple: Объект ответа и текст страницы (или результат read).
+        """
+        url = self.api_url + endpoint
+        return await self._send('GET', url, read=read or (lambda response: response.text(errors='replace')))
+
+    async def get(self, endpoint='', decode=True, headers=None):
+        return await self._request('GET', endpoint, decode=decode, headers=headers)
+
+    async def post(self, endpoint='', data=None, decode=True):
+        return await self._request('POST', endpoint, data, decode)
+
+    async def delete(self, endpoint='', decode=True):
+        return await self._request('DELETE', endpoint, decode=decode)
+
+    async def map(self, batch, concurrency=10, on_progress=None):
+        """
+        Конкурентно выполняет пакет запросов и отдает результат каждого сразу после его завершения.
+
+        Запросы читаются из batch лениво, а одновременно выполняется не больше concurrency запросов,
+        поэтому пакет из тысяч запросов не создает тысячи задач сразу. Ошибка одного запроса не прерывает
+        пакет, а сохраняется в поле error его результата; ошибка в on_progress только логируется.
+        Если вызывающий код прекращает чтение результатов, незавершенные запросы отменяются.
+        Результаты отдаются в порядке завершения.
+
+        Args:
+            batch (Iterable[tuple]): Запросы в виде кортежей (метод, эндпоинт) или (метод, эндпоинт, данные).
+            concurrency (int): Максимальное количество одновременных запросов.
+            on_progress (Callable): Функция on_progress(выполнено, всего, результат), вызываемая после каждого
+                запроса (всего - None, если batch не поддерживает len).
+
+        Returns:
+            AsyncIterator[BatchResult]: Асинхронный генератор результатов.
+        """
+        total = len(batch) if hasattr(batch, '__len__') else None
+        done_count = 0
+        pending = set()
+        try:
+            for index, (method, endpoint, *payload) in enumerate(batch):
+                pending.add(asyncio.ensure_future(
+                    self._batch_request(index, method.upper(), endpoint, payload[0] if payload else None)
+                ))
+                if len(pending) < concurrency:
+                    continue
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    done_count += 1
+                    self._report_progress(on_progress, done_count, total, task.result())
+                    yield task.result()
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    done_count += 1
+                    self._report_progress(on_progress, done_count, total, task.result())
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def gather(self, batch, concurrency=10, ordered=True, on_progress=None):
+        """
+        Конкурентно выполняет пакет запросов и возвращает результаты всех запросов.
+
+        Args:
+            batch (Iterable[tuple]): Запросы в виде кортежей (метод, эндпоинт) или (метод, эндпоинт, данные).
+            concurrency (int): Максимальное количество одновременных запросов.
+            ordered (bool): Возвращать результаты в порядке запросов (иначе - в порядке завершения).
+            on_progress (Callable): Функция on_progress(выполнено, всего, результат), вызываемая после каждого запроса.
+
+        Returns:
+            list of BatchResult: Результаты запросов.
+        """
+        results = [result async for result in self.map(batch, concurrency, on_progress)]
+        if ordered:
+            results.sort(key=lambda result: result.index)
+        return results
+
+    async def _batch_request(self, index, method, endpoint, data):
+        """
+        Выполняет один запрос пакета, сохраняя ошибку в результате вместо исключения.
+
+        Returns:
+            BatchResult: Результат запроса.
+        """
+        try:
+            response, response_data = await self._request(method, endpoint, data)
+        except Exception as e:
+            # Любая ошибка запроса (в том числе неверные данные) относится только к этому элементу пакета
+            logging.error(f"Ошибка при выполнении {method}-запроса к {endpoint} в пакете: {e!r}")
+            return BatchResult(index, method, endpoint, None, None, e)
+        return BatchResult(index, method, endpoint, response, response_data, None)
+
+    @staticmethod
+    def _report_progress(on_progress, done_count, total, result):
+        """
+        Вызывает on_progress пакета. Ошибка в on_progress логируется и не прерывает пакет.
+        """
+        if on_progress is None:
+            return
+        try:
+            on_progress(done_count, total, result)
+        except Exception as e:
+            logging.error(f"Ошибка в on_progress пакета запросов: {e!r}")
 
 """
 # Пример использования синхронного клиента:
@@ -325,18 +849,26 @@ async def main():
     api_url = 'https://api.example.com'
     api_key = 'your-api-key'
 
-    client = APIClientAsync(api_url=api_url, api_key=api_key)
-
     payload = {
         'name': 'John Doe',
         'email': 'johndoe@example.com',
         'message': 'Hello, world!'
     }
 
-    response, response_data = await client.post(endpoint='/messages', data=payload)
+    # Сессия с пулом соединений живет до выхода из контекстного менеджера
+    async with APIClientAsync(api_url=api_url, api_key=api_key, limit_per_host=10) as client:
+        response, response_data = await client.post(endpoint='/messages', data=payload)
 
     if response.status == 201:
         print('Сообщение успешно отправлено!')
     else:
         print(f'Ошибка при отправке сообщения. Код статуса: {response.status}')
+
+    # Пакет запросов: не больше 20 одновременно, ошибки сохраняются в результатах
+    async with APIClientAsync(api_url=api_url, api_key=api_key) as client:
+        results = await client.gather([('POST', '/messages', payload)] * 500, concurrency=20,
+                                      on_progress=lambda done, total, result: print(f'{done}/{total}'))
+
+    failed = [result for result in results if result.error is not None or result.response.status != 201]
+    print(f'Отправлено сообщений: {len(results) - len(failed)}, ошибок: {len(failed)}')
 """
@@ -0,0 +1,188 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+
+
+class CircuitOpenError(requests.exceptions.RequestException, aiohttp.ClientError):
+    """
+    Запрос не отправлен, так как для хоста разомкнут circuit breaker.
+
+    Наследуется от исключений requests и aiohttp, чтобы обрабатываться там же, где и ошибки соединения.
+    """
+
+
+def parse_retry_after(value):
+    """
+    Разбирает заголовок Retry-After (число секунд или HTTP-дата).
+
+    Args:
+        value (str): Значение заголовка.
+
+    Returns:
+        float: Пауза в секундах или None, если заголовок отсутствует или некорректен.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Политика повторов запросов с экспоненциальной задержкой и случайным разбросом (full jitter).
+
+    Повторяются только идемпотентные методы и только после ошибок соединения, таймаутов
+    и ответов с кодами из RETRY_STATUSES. Ответ 429/503 с заголовком Retry-After повторяется через
+    указанную сервером паузу, а не через случайную задержку; если пауза больше max_retry_after,
+    ответ возвращается без повтора.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    # Коды ответа, для которых учитывается заголовок Retry-After
+    RETRY_AFTER_STATUSES = frozenset({429, 503})
+
+    def __init__(self, retries=2, backoff_factor=0.5, max_backoff=10, max_retry_after=60):
+        """
+        Args:
+            retries (int): Максимальное количество повторов после первой попытки.
+            backoff_factor (float): Базовая задержка в секундах, удваивается с каждой попыткой.
+            max_backoff (float): Максимальная задержка между попытками в секундах.
+            max_retry_after (float): Максимальная пауза по Retry-After в секундах, при которой запрос повторяется.
+        """
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+
+    def should_retry(self, method, attempt, deadline=None, delay=None):
+        """
+        Определяет, можно ли повторить запрос.
+
+        Args:
+            method (str): Метод HTTP.
+            attempt (int): Номер уже выполненной попытки, начиная с 0.
+            deadline (float): Момент по time.monotonic(), после которого повторы не выполняются.
+            delay (float): Пауза перед повтором (None - максимальная задержка backoff).
+
+        Returns:
+            bool: True, если запрос можно повторить.
+        """
+        if method.upper() not in self.IDEMPOTENT_METHODS or attempt >= self.retries:
+            return False
+        if delay is None:
+            delay = self.backoff(attempt, jitter=False)
+        return deadline is None or time.monotonic() + delay < deadline
+
+    def delay(self, attempt, status=None, headers=None):
+        """
+        Возвращает паузу перед повтором: по Retry-After ответа 429/503, если он задан, иначе backoff.
+
+        Args:
+            attempt (int): Номер уже выполненной попытки, начиная с 0.
+            status (int): Код ответа (None - ответ не получен).
+            headers (Mapping): Заголовки ответа.
+
+        Returns:
+            float: Пауза в секундах или None, если сервер просит подождать дольше max_retry_after.
+        """
+        if status in self.RETRY_AFTER_STATUSES and headers is not None:
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(attempt)
+
+    def backoff(self, attempt, jitter=True):
+        """
+        Возвращает задержку перед следующей попыткой.
+
+        Args:
+            attempt (int): Номер уже выполненной попытки, начиная с 0.
+            jitter (bool): Выбирать задержку случайно от 0 до верхней границы.
+
+        Returns:
+            float: Задержка в секундах.
+        """
+        limit = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        return random.uniform(0, limit) if jitter else limit
+
+
+class CircuitBreaker:
+    """
+    Похостовый circuit breaker.
+
+    Неудачным считается запрос, не получивший ответа (ошибка соединения или таймаут): любой HTTP-ответ,
+    даже 5xx, означает, что хост жив. После failure_threshold подряд неудачных запросов к хосту запросы
+    к нему сразу завершаются CircuitOpenError. Через reset_timeout секунд пропускается пробный запрос:
+    при успехе счетчик сбрасывается, при неудаче хост снова блокируется.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        """
+        Args:
+            failure_threshold (int): Количество неудачных запросов подряд, после которого хост блокируется.
+            reset_timeout (float): Время блокировки хоста в секундах.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = {}
+        self._opened_at = {}
+        self._lock = threading.Lock()
+
+    def before_request(self, url):
+        """
+        Проверяет, можно ли отправить запрос к хосту.
+
+        Args:
+            url (str): URL запроса.
+
+        Raises:
+            CircuitOpenError: Если хост заблокирован.
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            if time.monotonic() - opened_at < self.reset_timeout:
+                raise CircuitOpenError(f'Хост {host} временно заблокирован после серии неудачных запросов')
+            # Пропускаем один пробный запрос, остальные ждут его результата до следующего окна
+            self._opened_at[host] = time.monotonic()
+
+    def record_success(self, url):
+        """
+        Сбрасывает счетчик неудач хоста после успешного запроса.
+
+        Args:
+            url (str): URL запроса.
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, url):
+        """
+        Учитывает неудачный запрос к хосту и блокирует хост при достижении порога.
+
+        Args:
+            url (str): URL запроса.
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self.failure_threshold:
+                self._opened_at[host] = time.monotonic()
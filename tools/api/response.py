@@ -0,0 +1,160 @@
+import copy
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Значение, означающее, что тело ответа еще не разбиралось
+_NOT_DECODED = object()
+
+
+def loads(data):
+    """
+    Разбирает JSON через orjson, если он установлен, иначе через стандартный модуль json.
+
+    Args:
+        data (bytes | str): JSON-документ.
+
+    Returns:
+        Any: Разобранное значение.
+
+    Raises:
+        json.JSONDecodeError: Если документ не является корректным JSON (orjson.JSONDecodeError - его подкласс).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def is_json_content_type(content_type):
+    """
+    Проверяет, что Content-Type обозначает JSON (application/json или тип с суффиксом +json).
+
+    Args:
+        content_type (str): Значение заголовка Content-Type (может содержать параметры, например charset).
+
+    Returns:
+        bool: True, если тело ответа - JSON.
+    """
+    if not content_type:
+        return False
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return media_type == 'application/json' or media_type.endswith('+json')
+
+
+class ResponseBody:
+    """
+    Тело ответа с ленивым разбором.
+
+    Текст и JSON получаются из байтов тела только при первом обращении и затем берутся из кэша,
+    поэтому несколько проверок одного ответа разбирают его один раз, а проверки только кода статуса
+    не разбирают вовсе.
+    """
+
+    def __init__(self, content, content_type=None, encoding=None):
+        """
+        Args:
+            content (bytes): Байты тела ответа.
+            content_type (str): Значение заголовка Content-Type.
+            encoding (str): Кодировка текста ответа (None - UTF-8).
+        """
+        self.content = content
+        self.content_type = content_type
+        self.encoding = encoding
+        self._text = None
+        self._json = _NOT_DECODED
+
+    def copy(self):
+        """
+        Создает копию тела с теми же байтами, но без разобранного JSON, чтобы изменение результата
+        одним вызывающим кодом не затрагивало другой.
+
+        Returns:
+            ResponseBody: Копия тела ответа.
+        """
+        return ResponseBody(self.content, self.content_type, self.encoding)
+
+    @property
+    def is_json(self):
+        """
+        bool: True, если Content-Type ответа обозначает JSON.
+        """
+        return is_json_content_type(self.content_type)
+
+    @property
+    def text(self):
+        """
+        str: Тело ответа как текст (некорректные байты заменяются).
+        """
+        if self._text is None:
+            self._text = self.content.decode(self.encoding or 'utf-8', errors='replace')
+        return self._text
+
+    def json(self):
+        """
+        Разбирает тело ответа как JSON при первом вызове и возвращает закэшированный результат при следующих.
+
+        Тело без Content-Type разбирается как JSON; тело с другим Content-Type не разбирается.
+
+        Returns:
+            Any: Разобранное значение или None для пустого тела.
+
+        Raises:
+            json.JSONDecodeError: Если Content-Type ответа не JSON или тело не является корректным JSON.
+        """
+        if self._json is _NOT_DECODED:
+            if not self.content.strip():
+                self._json = None
+            elif self.content_type and not self.is_json:
+                raise json.JSONDecodeError(f'Content-Type ответа не JSON: {self.content_type}', self.text, 0)
+            elif self.encoding is None or self.encoding.lower().replace('-', '') == 'utf8':
+                self._json = loads(self.content)
+            else:
+                self._json = loads(self.text)
+        return self._json
+
+    @property
+    def data(self):
+        """
+        Any: Разобранный JSON по тем же правилам, что и json(), но None для ответов с Content-Type не JSON.
+        """
+        if self.content_type and not self.is_json:
+            return None
+        return self.json()
+
+
+def response_body(response):
+    """
+    Возвращает ленивое тело ответа requests, создавая его один раз на объект ответа.
+
+    Args:
+        response (requests.Response): Объект ответа от сервера.
+
+    Returns:
+        ResponseBody: Тело ответа.
+    """
+    body = getattr(response, '_lazy_body', None)
+    if body is None:
+        body = ResponseBody(response.content, response.headers.get('Content-Type'), response.encoding)
+        response._lazy_body = body
+    return body
+
+
+def copy_response(response):
+    """
+    Создает поверхностную копию ответа requests со своим ленивым телом, чтобы разобранный JSON одного
+    вызывающего кода не был общим с другим (например, для ответов из кэша).
+
+    Args:
+        response (requests.Response): Объект ответа от сервера.
+
+    Returns:
+        requests.Response: Копия ответа.
+    """
+    response_copy = copy.copy(response)
+    body = getattr(response, '_lazy_body', None)
+    if body is not None:
+        response_copy._lazy_body = body.copy()
+    return response_copy
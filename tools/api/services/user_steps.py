@@ -5,7 +5,7 @@ from tools.api.client import APIClientAsync
 
 class UserSteps:
 
-    def __init__(self, api_url, api_key, bearer=None):
+    def __init__(self, api_url, api_key, bearer=None, client=None):
         """
         Инициализация API-шагов.
 
@@ -13,8 +13,9 @@ class UserSteps:
             api_url (str): URL API.
             api_key (str): Ключ API.
             bearer (str): Токен для авторизации.
+            client (APIClientAsync): Готовый клиент с общим пулом соединений (например, из фикстуры api_client_async).
         """
-        self.client = APIClientAsync(api_url=api_url, api_key=api_key, bearer=bearer)
+        self.client = client or APIClientAsync(api_url=api_url, api_key=api_key, bearer=bearer)
 
     @allure.step("Создание нового пользователя с данными: {user_data}")
     async def create_user(self, user_data):
@@ -69,9 +70,73 @@ class UserSteps:
         Returns:
             None
         """
-        response, _ = await self.client.delete(endpoint=f'/users/{user_id}')
+        response, _ = await self.client.delete(endpoint=f'/users/{user_id}', decode=False)
         assert response.status == HTTPStatus.NO_CONTENT, f'Не удалось удалить пользователя. Код статуса: {response.status}'
 
+    @allure.step("Создание списка пользователей (до {concurrency} запросов одновременно)")
+    async def create_users(self, users_data, concurrency=10):
+        """
+        Шаг для конкурентного создания списка пользователей.
+
+        Args:
+            users_data (list of dict): Данные пользователей.
+            concurrency (int): Максимальное количество одновременных запросов.
+
+        Returns:
+            list of dict: Данные созданных пользователей в порядке users_data.
+        """
+        results = await self.client.gather([('POST', '/users', user_data) for user_data in users_data], concurrency)
+        self._assert_batch_status(results, HTTPStatus.CREATED, 'Не удалось создать пользователей')
+        return [result.data for result in results]
+
+    @allure.step("Получение пользователей по ID: {user_ids}")
+    async def get_users_by_ids(self, user_ids, concurrency=10):
+        """
+        Шаг для конкурентного получения пользователей по списку ID.
+
+        Args:
+            user_ids (list of str): ID пользователей.
+            concurrency (int): Максимальное количество одновременных запросов.
+
+        Returns:
+            list of dict: Данные пользователей в порядке user_ids.
+        """
+        results = await self.client.gather([('GET', f'/users/{user_id}') for user_id in user_ids], concurrency)
+        self._assert_batch_status(results, HTTPStatus.OK, 'Не удалось получить пользователей')
+        return [result.data for result in results]
+
+    @allure.step("Удаление пользователей с ID: {user_ids}")
+    async def delete_users(self, user_ids, concurrency=10):
+        """
+        Шаг для конкурентного удаления пользователей по списку ID.
+
+        Args:
+            user_ids (list of str): ID пользователей.
+            concurrency (int): Максимальное количество одновременных запросов.
+
+        Returns:
+            None
+        """
+        results = await self.client.gather([('DELETE', f'/users/{user_id}') for user_id in user_ids], concurrency)
+        self._assert_batch_status(results, HTTPStatus.NO_CONTENT, 'Не удалось удалить пользователей')
+
+    @staticmethod
+    def _assert_batch_status(results, expected_status, message):
+        """
+        Проверяет, что все запросы пакета выполнены с ожидаемым кодом статуса.
+
+        Args:
+            results (list of BatchResult): Результаты пакета запросов.
+            expected_status (HTTPStatus): Ожидаемый код статуса.
+            message (str): Текст ошибки.
+        """
+        failed = [
+            (result.endpoint, repr(result.error) if result.error is not None else result.response.status)
+            for result in results
+            if result.error is not None or result.response.status != expected_status
+        ]
+        assert not failed, f'{message} ({len(failed)} из {len(results)}): {failed}'
+
     @allure.step("Попытка создания пользователя с данными: {user_data} и ожидание ошибки")
     async def create_user_expect_failure(self, user_data, expected_status):
         """
@@ -84,7 +149,7 @@ class UserSteps:
         Returns:
             requests.Response: Ответ сервера на запрос создания пользователя.
         """
-        response, _ = await self.client.post(endpoint='/users', data=user_data)
+        response, _ = await self.client.post(endpoint='/users', data=user_data, decode=False)
         assert response.status == expected_status, f'Ожидался статус {expected_status}, но получен {response.status}'
         return response
 
@@ -96,7 +161,7 @@ class UserSteps:
         Returns:
             requests.Response: Ответ сервера на запрос списка пользователей.
         """
-        response, _ = await self.client.get(endpoint='/users')
+        response, _ = await self.client.get(endpoint='/users', decode=False)
         assert response.status == HTTPStatus.FORBIDDEN, f'Ожидался статус {HTTPStatus.FORBIDDEN}, но получен {response.status}'
         return response
 
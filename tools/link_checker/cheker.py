@@ -1,5 +1,7 @@
+from tools.link_checker.link_cache import LinkStatusStore
 from tools.link_checker.link_checker_async import LinkCheckerAsync
 from tools.link_checker.link_checker_old import LinkCheckerOld
+from tools.link_checker.link_checker_sharded import LinkCheckerSharded
 from tools.link_checker.link_checker_sync import LinkCheckerSync
 
 
@@ -9,21 +11,30 @@ class LinkCheckerFactory:
     """
 
     @staticmethod
-    def create_checker(checker_type):
+    def create_checker(checker_type, cache_path=None, cache_ttl=24 * 60 * 60, **options):
         """
         Создает экземпляр LinkChecker в зависимости от переданного флага.
 
-        :param checker_type: Тип чекера ('old', 'sync' или 'async').
+        :param checker_type: Тип чекера ('old', 'sync', 'async' или 'sharded').
         :type checker_type: str
+        :param cache_path: Путь к файлу SQLite для постоянного кэша результатов (None - без постоянного кэша).
+        :type cache_path: str
+        :param cache_ttl: Время в секундах, в течение которого рабочая ссылка не проверяется повторно.
+        :type cache_ttl: int
+        :param options: Дополнительные параметры конструктора чекера (например, workers=8 для 'sync' и 'old').
         :returns: Экземпляр LinkChecker.
-        :rtype: LinkCheckerOld or LinkCheckerSync or LinkCheckerAsync
+        :rtype: LinkCheckerOld or LinkCheckerSync or LinkCheckerAsync or LinkCheckerSharded
         """
+        if checker_type == 'sharded':
+            # Каждый процесс открывает файл кэша сам, поэтому передается путь, а не соединение
+            return LinkCheckerSharded(cache_path=cache_path, cache_ttl=cache_ttl, **options)
+        store = LinkStatusStore(cache_path, ttl=cache_ttl) if cache_path else None
         if checker_type == 'old':
-            return LinkCheckerOld()
+            return LinkCheckerOld(store=store, **options)
         elif checker_type == 'sync':
-            return LinkCheckerSync()
+            return LinkCheckerSync(store=store, **options)
         elif checker_type == 'async':
-            return LinkCheckerAsync()
+            return LinkCheckerAsync(store=store, **options)
         else:
             raise ValueError(f'Неизвестный тип чекера: {checker_type}')
 
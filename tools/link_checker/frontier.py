@@ -0,0 +1,299 @@
+import sqlite3
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+from tools.link_checker.link_processor import LinkProcessor
+
+# Элемент очереди: URL, страница, на которой он найден, глубина обхода и номер попытки
+FrontierItem = namedtuple('FrontierItem', 'url base_url depth attempts')
+
+
+class MemoryFrontier:
+    """
+    Очередь URL на проверку в памяти одного процесса.
+
+    URL выдаются в аренду (lease) на visibility_timeout секунд. Если аренда не подтверждена через ack
+    за это время, URL снова выдается другому обработчику. После max_attempts неудачных аренд URL
+    получает статус ABANDONED и считается битым.
+    """
+
+    # Статус URL, который не удалось обработать за max_attempts аренд
+    ABANDONED = 'Abandoned'
+
+    def __init__(self, visibility_timeout=300, max_attempts=3):
+        """
+        :param visibility_timeout: Время аренды URL в секундах.
+        :type visibility_timeout: float
+        :param max_attempts: Максимальное количество аренд одного URL.
+        :type max_attempts: int
+        """
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._items = {}
+        self._pending = deque()
+        self._leases = {}
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def put(self, urls, base_url='', depth=0):
+        """
+        Добавляет URL в очередь. Уже добавленные ранее URL пропускаются.
+
+        :param urls: Итерируемый набор нормализованных URL.
+        :type urls: Iterable[str]
+        :param base_url: URL страницы или sitemap, на которой найдены ссылки.
+        :type base_url: str
+        :param depth: Глубина обхода.
+        :type depth: int
+        :returns: Количество добавленных URL.
+        :rtype: int
+        """
+        added = 0
+        with self._lock:
+            for url in urls:
+                if url not in self._items:
+                    self._items[url] = FrontierItem(url, base_url, depth, 0)
+                    self._pending.append(url)
+                    added += 1
+        return added
+
+    def lease(self, limit=1):
+        """
+        Выдает в аренду до limit URL, включая URL с истекшей арендой.
+
+        :param limit: Максимальное количество URL.
+        :type limit: int
+        :returns: Список арендованных элементов.
+        :rtype: list of FrontierItem
+        """
+        now = time.time()
+        leased = []
+        with self._lock:
+            for url, lease_until in list(self._leases.items()):
+                if lease_until <= now:
+                    del self._leases[url]
+                    self._release(url)
+            while self._pending and len(leased) < limit:
+                url = self._pending.popleft()
+                item = self._items[url]._replace(attempts=self._items[url].attempts + 1)
+                self._items[url] = item
+                self._leases[url] = now + self.visibility_timeout
+                leased.append(item)
+        return leased
+
+    def ack(self, results):
+        """
+        Подтверждает обработку URL и сохраняет результаты проверки.
+
+        :param results: Итерируемый набор кортежей (URL, код ответа).
+        :type results: Iterable[tuple]
+        """
+        with self._lock:
+            for url, status in results:
+                if self._leases.pop(url, None) is not None:
+                    self._results[url] = status
+
+    def nack(self, urls):
+        """
+        Возвращает арендованные URL в очередь для повторной обработки.
+
+        :param urls: Итерируемый набор URL.
+        :type urls: Iterable[str]
+        """
+        with self._lock:
+            for url in urls:
+                if self._leases.pop(url, None) is not None:
+                    self._release(url)
+
+    def remaining(self):
+        """
+        Количество URL, которые еще ожидают обработки или находятся в аренде.
+
+        :rtype: int
+        """
+        with self._lock:
+            return len(self._pending) + len(self._leases)
+
+    def results(self):
+        """
+        Результаты проверки всех обработанных URL.
+
+        :returns: Словарь {URL: код ответа}.
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(self._results)
+
+    def broken_links(self):
+        """
+        Битые ссылки по результатам всех обработчиков очереди.
+
+        :returns: Список битых ссылок с кодами ответа.
+        :rtype: list of tuples
+        """
+        return [(url, status) for url, status in self.results().items() if LinkProcessor.is_broken(status)]
+
+    def _release(self, url):
+        if self._items[url].attempts >= self.max_attempts:
+            self._results[url] = self.ABANDONED
+        else:
+            self._pending.append(url)
+
+
+class SqliteFrontier:
+    """
+    Очередь URL на проверку в файле SQLite, общая для нескольких процессов.
+
+    Несколько процессов (или CI-агентов с общим каталогом) открывают один файл и арендуют из него URL
+    порциями. Выдача аренды выполняется в транзакции BEGIN IMMEDIATE, поэтому один URL не выдается двум
+    обработчикам одновременно. Правила аренды те же, что у MemoryFrontier.
+    """
+
+    ABANDONED = MemoryFrontier.ABANDONED
+
+    def __init__(self, path='link_frontier.sqlite', visibility_timeout=300, max_attempts=3):
+        """
+        :param path: Путь к файлу SQLite.
+        :type path: str
+        :param visibility_timeout: Время аренды URL в секундах.
+        :type visibility_timeout: float
+        :param max_attempts: Максимальное количество аренд одного URL.
+        :type max_attempts: int
+        """
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # Транзакции открываются явно, чтобы выдача аренды была атомарной между процессами
+        self._connection = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS frontier ('
+                'url TEXT PRIMARY KEY, base_url TEXT, depth INTEGER, state TEXT, attempts INTEGER, '
+                'lease_until REAL, status TEXT)'
+            )
+            self._connection.execute('CREATE INDEX IF NOT EXISTS frontier_state ON frontier (state, lease_until)')
+
+    def put(self, urls, base_url='', depth=0):
+        """
+        Добавляет URL в очередь. Уже добавленные ранее (в том числе другими процессами) URL пропускаются.
+
+        :param urls: Итерируемый набор нормализованных URL.
+        :type urls: Iterable[str]
+        :param base_url: URL страницы или sitemap, на которой найдены ссылки.
+        :type base_url: str
+        :param depth: Глубина обхода.
+        :type depth: int
+        :returns: Количество добавленных URL.
+        :rtype: int
+        """
+        with self._lock, self._transaction():
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO frontier (url, base_url, depth, state, attempts) VALUES (?, ?, ?, 'pending', 0)",
+                ((url, base_url, depth) for url in urls)
+            )
+            return self._connection.total_changes - before
+
+    def lease(self, limit=1):
+        """
+        Выдает в аренду до limit URL, включая URL с истекшей арендой.
+
+        :param limit: Максимальное количество URL.
+        :type limit: int
+        :returns: Список арендованных элементов.
+        :rtype: list of FrontierItem
+        """
+        now = time.time()
+        with self._lock, self._transaction():
+            self._connection.execute(
+                "UPDATE frontier SET state = 'done', status = ? "
+                "WHERE state = 'leased' AND lease_until <= ? AND attempts >= ?",
+                (self.ABANDONED, now, self.max_attempts)
+            )
+            rows = self._connection.execute(
+                "SELECT url, base_url, depth, attempts FROM frontier "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_until <= ?) ORDER BY rowid LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            self._connection.executemany(
+                "UPDATE frontier SET state = 'leased', attempts = attempts + 1, lease_until = ? WHERE url = ?",
+                ((now + self.visibility_timeout, url) for url, *_ in rows)
+            )
+        return [FrontierItem(url, base_url, depth, attempts + 1) for url, base_url, depth, attempts in rows]
+
+    def ack(self, results):
+        """
+        Подтверждает обработку URL и сохраняет результаты проверки.
+
+        :param results: Итерируемый набор кортежей (URL, код ответа).
+        :type results: Iterable[tuple]
+        """
+        with self._lock, self._transaction():
+            self._connection.executemany(
+                "UPDATE frontier SET state = 'done', status = ? WHERE url = ? AND state = 'leased'",
+                ((str(status), url) for url, status in results)
+            )
+
+    def nack(self, urls):
+        """
+        Возвращает арендованные URL в очередь для повторной обработки.
+
+        :param urls: Итерируемый набор URL.
+        :type urls: Iterable[str]
+        """
+        with self._lock, self._transaction():
+            self._connection.executemany(
+                "UPDATE frontier SET state = CASE WHEN attempts >= ? THEN 'done' ELSE 'pending' END, "
+                "status = CASE WHEN attempts >= ? THEN ? END WHERE url = ? AND state = 'leased'",
+                ((self.max_attempts, self.max_attempts, self.ABANDONED, url) for url in urls)
+            )
+
+    def remaining(self):
+        """
+        Количество URL, которые еще ожидают обработки или находятся в аренде у любого процесса.
+
+        :rtype: int
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM frontier WHERE state != 'done'").fetchone()[0]
+
+    def results(self):
+        """
+        Результаты проверки всех обработанных URL всеми процессами.
+
+        :returns: Словарь {URL: код ответа}.
+        :rtype: dict
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT url, status FROM frontier WHERE state = 'done'").fetchall()
+        return {url: int(status) if status.isdigit() else status for url, status in rows}
+
+    def broken_links(self):
+        """
+        Битые ссылки по результатам всех обработчиков очереди.
+
+        :returns: Список битых ссылок с кодами ответа.
+        :rtype: list of tuples
+        """
+        return [(url, status) for url, status in self.results().items() if LinkProcessor.is_broken(status)]
+
+    def close(self):
+        """
+        Закрывает соединение с файлом очереди.
+        """
+        with self._lock:
+            self._connection.close()
+
+    @contextmanager
+    def _transaction(self):
+        # Блокировка на запись берется сразу, а не при первом изменении, чтобы исключить взаимоблокировки
+        self._connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._connection.execute('ROLLBACK')
+            raise
+        self._connection.execute('COMMIT')
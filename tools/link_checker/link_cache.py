@@ -0,0 +1,164 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class LinkResultCache:
+    """
+    Кэш результатов проверки ссылок на время тестовой сессии.
+
+    Ключом служит нормализованный URL (см. LinkProcessor.normalize_url), поэтому одна и та же ссылка
+    проверяется один раз за прогон, а результат переиспользуется на других страницах и в других тестах.
+    При запуске через pytest-xdist у каждого воркера свой кэш. Количество результатов ограничено
+    max_entries: при превышении вытесняются давно не использованные, и такие ссылки при следующей
+    встрече проверяются заново.
+    """
+
+    def __init__(self, max_entries=100_000):
+        """
+        :param max_entries: Максимальное количество хранимых результатов (None - без ограничения).
+        :type max_entries: int
+        """
+        self.max_entries = max_entries
+        self._results = OrderedDict()
+
+    def get(self, url):
+        """
+        Возвращает сохраненный результат проверки ссылки.
+
+        :param url: Нормализованный URL.
+        :type url: str
+        :returns: Код ответа, 'No Response' или None, если ссылка еще не проверялась.
+        :rtype: int or str or None
+        """
+        status_code = self._results.get(url)
+        if status_code is not None:
+            self._results.move_to_end(url)
+        return status_code
+
+    def set(self, url, status_code):
+        """
+        Сохраняет результат проверки ссылки и вытесняет давно не использованные результаты сверх max_entries.
+
+        :param url: Нормализованный URL.
+        :type url: str
+        :param status_code: Код ответа HTTP или 'No Response'.
+        :type status_code: int or str
+        """
+        self._results[url] = status_code
+        self._results.move_to_end(url)
+        if self.max_entries is not None:
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        """
+        Очищает кэш.
+        """
+        self._results.clear()
+
+    def __contains__(self, url):
+        return url in self._results
+
+    def __len__(self):
+        return len(self._results)
+
+
+class LinkStatusStore:
+    """
+    Постоянный кэш результатов проверки ссылок в файле SQLite.
+
+    Для каждого URL хранятся код ответа, ETag, Last-Modified и время проверки. Рабочие ссылки, проверенные
+    не раньше чем ttl секунд назад, повторно не проверяются. Для устаревших записей формируются заголовки
+    If-None-Match/If-Modified-Since, и ответ 304 засчитывается как рабочая ссылка без передачи тела.
+    """
+
+    NOT_MODIFIED = 304
+
+    def __init__(self, path='link_status.sqlite', ttl=24 * 60 * 60):
+        """
+        :param path: Путь к файлу SQLite (по умолчанию рядом с broken_links.txt).
+        :type path: str
+        :param ttl: Время в секундах, в течение которого рабочая ссылка не проверяется повторно.
+        :type ttl: int
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS link_status ('
+                'url TEXT PRIMARY KEY, status TEXT, etag TEXT, last_modified TEXT, checked_at REAL)'
+            )
+
+    def lookup(self, url):
+        """
+        Ищет сохраненный результат проверки ссылки.
+
+        :param url: Нормализованный URL.
+        :type url: str
+        :returns: Кортеж (код ответа, если запись свежая и ссылка рабочая, иначе None;
+            заголовки для условного запроса или None).
+        :rtype: tuple
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT status, etag, last_modified, checked_at FROM link_status WHERE url = ?', (url,)
+            ).fetchone()
+        if row is None:
+            return None, None
+
+        status, etag, last_modified, checked_at = row
+        if status != '200':
+            return None, None
+        if time.time() - checked_at < self.ttl:
+            return 200, None
+
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return None, headers or None
+
+    def record(self, url, status_code, headers=None):
+        """
+        Сохраняет результат проверки ссылки.
+
+        Ответ 304 на условный запрос означает, что ресурс не изменился: запись продлевается и ссылка
+        считается рабочей.
+
+        :param url: Нормализованный URL.
+        :type url: str
+        :param status_code: Код ответа HTTP или 'No Response'.
+        :type status_code: int or str
+        :param headers: Заголовки ответа.
+        :type headers: Mapping
+        :returns: Итоговый код ответа с учетом 304.
+        :rtype: int or str
+        """
+        headers = headers or {}
+        with self._lock, self._connection:
+            if status_code == self.NOT_MODIFIED:
+                self._connection.execute(
+                    'UPDATE link_status SET checked_at = ? WHERE url = ?', (time.time(), url)
+                )
+                return 200
+            self._connection.execute(
+                'INSERT OR REPLACE INTO link_status (url, status, etag, last_modified, checked_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (url, str(status_code), headers.get('ETag'), headers.get('Last-Modified'), time.time())
+            )
+        return status_code
+
+    def close(self):
+        """
+        Закрывает соединение с файлом кэша.
+        """
+        with self._lock:
+            self._connection.close()
+
+
+link_result_cache = LinkResultCache()
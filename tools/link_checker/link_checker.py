@@ -225,7 +225,7 @@ class LinkCheckerAsync(LinkProcessor):
         for link in links:
             if link:
                 full_url = urljoin(base_url, link)
-                response, _ = await self.client.get(full_url)
+                response, _ = await self.client.get(full_url, decode=False)
                 if response.status != 200:
                     broken_links.append((full_url, response.status))
                     self.log_broken_link(full_url, response.status)
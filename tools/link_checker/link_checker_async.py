@@ -1,11 +1,19 @@
-from urllib.parse import urljoin
+import asyncio
+import time
+from collections import defaultdict
+from itertools import islice
+from urllib.parse import urlsplit
 
-import requests
+import aiohttp
 from allure import step
 from selene.api import browser
 
 from tools.api.client import APIClientAsync
+from tools.api.resilience import CircuitBreaker
+from tools.link_checker.link_cache import link_result_cache
+from tools.link_checker.link_extractor import StreamingLinkExtractor
 from tools.link_checker.link_processor import LinkProcessor
+from tools.link_checker.metrics import link_check_metrics
 
 
 class LinkCheckerAsync(LinkProcessor):
@@ -13,13 +21,54 @@ class LinkCheckerAsync(LinkProcessor):
     Класс для проверки всех ссылок на странице и логирования битых ссылок с использованием асинхронного API клиента.
     """
 
-    def __init__(self):
-        self.client = APIClientAsync()
+    def __init__(self, max_concurrency=20, max_per_host=5, probe=True, cache=link_result_cache, store=None,
+                 extractor='bs4', politeness=None, seen_set='set',
+                 metrics=link_check_metrics):
+        """
+        :param max_concurrency: Максимальное количество одновременно проверяемых ссылок во всех проверках чекера.
+        :type max_concurrency: int
+        :param max_per_host: Максимальное количество одновременных запросов к одному хосту во всех проверках чекера.
+        :type max_per_host: int
+        :param probe: Проверять ссылки HEAD-запросом (с откатом на GET) без скачивания и разбора тела.
+        :type probe: bool
+        :param cache: Кэш результатов проверки на время сессии (None - без кэша).
+        :type cache: LinkResultCache
+        :param store: Постоянный кэш результатов между прогонами (None - без него).
+        :type store: LinkStatusStore
+        :param extractor: Способ извлечения ссылок из HTML: 'bs4' или 'stream' (потоковый, без DOM-дерева).
+        :type extractor: str
+        :param politeness: Ограничения частоты запросов к хостам и учет robots.txt (None - без ограничений).
+        :type politeness: HostPoliteness
+        :param seen_set: Множество просмотренных URL: 'set', 'fingerprint' (компактные 64-битные отпечатки)
+            или 'bloom' (фильтр Блума, часть ссылок может быть пропущена).
+        :type seen_set: str
+        :param metrics: Показатели прогона (скорость, время ответа, ошибки), общие для всех чекеров сессии.
+        :type metrics: LinkCheckMetrics
+        """
+        self.client = APIClientAsync(api_url='', circuit_breaker=CircuitBreaker(), single_flight=True)
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self.probe = probe
+        self.cache = cache
+        self.store = store
+        self.extractor = extractor
+        self.politeness = politeness
+        self.seen_set = seen_set
+        self.metrics = metrics
+        # Ограничения параллельности общие для всех одновременных проверок и создаются в event loop,
+        # в котором выполняются: (event loop, глобальный семафор, семафоры по хостам)
+        self._limits = None
 
     @step('Проверка всех ссылок на странице')
     async def check_all_links(self, links, base_url):
         """
-        Проверяет все ссылки на текущей веб-странице и логирует битые ссылки.
+        Конкурентно проверяет все ссылки на текущей веб-странице и логирует битые ссылки.
+
+        Количество одновременных запросов ограничено глобально (max_concurrency) и для каждого хоста (max_per_host),
+        в том числе когда несколько страниц проверяются одновременно.
+        Ссылки нормализуются и проверяются один раз за сессию, уже проверенные берутся из кэша.
+        Порядок битых ссылок в результате совпадает с порядком ссылок на странице. Ссылки, которые невозможно
+        разобрать как URL, добавляются в конец результата со статусом MALFORMED_URL.
 
         :param links: Список ссылок для проверки.
         :type links: list
@@ -28,15 +77,117 @@ class LinkCheckerAsync(LinkProcessor):
         :returns: Список битых ссылок с кодами ответа.
         :rtype: list of tuples
         """
-        broken_links = []
-        for link in links:
-            if link:
-                full_url = urljoin(base_url, link)
-                response, _ = await self.client.get(full_url)
-                if response.status != 200:
-                    broken_links.append((full_url, response.status))
-                    self.log_broken_link(full_url, response.status)
-        return broken_links
+        full_urls = self.prepare_links(links, base_url)
+        statuses = {url: status async for url, status in self.iter_check_links(full_urls, base_url, unique=True)}
+        broken_links = [(url, statuses[url]) for url in full_urls if self.is_broken(statuses[url])]
+        return broken_links + self.report_malformed_links(links, base_url)
+
+    async def iter_check_links(self, links, base_url, unique=False):
+        """
+        Конкурентно проверяет ссылки и отдает результат каждой сразу после ее проверки.
+
+        Ссылки читаются из links лениво, а одновременно создается не больше 2 * max_concurrency задач,
+        поэтому память не растет с количеством ссылок. Вызывающий код может остановить проверку в любой
+        момент: незавершенные проверки будут отменены. Результаты отдаются в порядке завершения.
+
+        :param links: Итерируемый набор ссылок для проверки.
+        :type links: Iterable[str]
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :param unique: Ссылки уже нормализованы и не повторяются (например, получены из prepare_links):
+            повторное удаление дубликатов не выполняется, поэтому ложные срабатывания фильтра Блума
+            не теряют ссылки.
+        :type unique: bool
+        :returns: Асинхронный генератор кортежей (URL, код ответа) по всем проверенным ссылкам.
+        :rtype: AsyncIterator[tuple]
+        """
+        urls = iter(links) if unique else self.iter_new_links(links, base_url)
+        if self.politeness is not None:
+            # Хосты чередуются в окне из нескольких пачек задач, чтобы не загружать все ссылки в память
+            urls = self.politeness.interleave_by_host(urls, window=self.max_concurrency * 4)
+
+        pending = set()
+        try:
+            for url in urls:
+                status = self.get_cached_status(url)
+                if status is not None:
+                    yield url, status
+                    continue
+                self.metrics.started()
+                pending.add(asyncio.ensure_future(self._check_link(url)))
+                if len(pending) >= self.max_concurrency * 2:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield self.store_result(task.result(), base_url)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield self.store_result(task.result(), base_url)
+        finally:
+            self.metrics.cancelled(len(pending))
+            for task in pending:
+                task.cancel()
+
+    def _get_limits(self):
+        """
+        Возвращает ограничения параллельности чекера для текущего event loop, создавая их при первом обращении.
+
+        :returns: Глобальный семафор и семафоры по хостам.
+        :rtype: tuple
+        """
+        loop = asyncio.get_running_loop()
+        if self._limits is None or self._limits[0] is not loop:
+            host_limits = defaultdict(lambda: asyncio.Semaphore(self.max_per_host))
+            self._limits = (loop, asyncio.Semaphore(self.max_concurrency), host_limits)
+        return self._limits[1:]
+
+    async def _check_link(self, full_url):
+        """
+        Проверяет одну ссылку с учетом глобального и похостового ограничений.
+
+        Сначала занимается слот хоста и выдерживается пауза политики вежливости, и только потом глобальный слот,
+        чтобы ожидающие ссылки одного хоста не занимали глобальные слоты остальных хостов.
+        Ответ 429/503 с допустимым Retry-After повторяется один раз после паузы для всего хоста.
+
+        :param full_url: Полный URL для проверки.
+        :type full_url: str
+        :returns: Запись о проверке (см. LinkProcessor.make_record).
+        :rtype: dict
+        """
+        started = time.perf_counter()
+        headers = None
+        if self.store is not None:
+            status, headers = self.store.lookup(full_url)
+            if status is not None:
+                return self.make_record(full_url, status, started)
+
+        global_limit, host_limits = self._get_limits()
+        async with host_limits[urlsplit(full_url).netloc]:
+            if self.politeness is not None and not await self.politeness.allowed(self.client, full_url):
+                return self.make_record(full_url, self.ROBOTS_DISALLOWED, started)
+
+            for attempt in range(2):
+                if self.politeness is not None:
+                    await self.politeness.wait(full_url)
+                async with global_limit:
+                    try:
+                        if self.probe:
+                            response = await self.client.probe(full_url, headers=headers)
+                        else:
+                            response, _ = await self.client.get(full_url, decode=False, headers=headers)
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        return self.make_record(full_url, 'No Response', started, error=type(e).__name__)
+                if self.politeness is None or attempt:
+                    break
+                delay = self.politeness.retry_delay(response.status, response.headers)
+                if delay is None:
+                    break
+                self.politeness.defer(full_url, delay)
+
+        status = response.status
+        if self.store is not None:
+            status = self.store.record(full_url, status, response.headers)
+        return self.make_record(full_url, status, started, response)
 
     async def check_links_on_page_with_selene(self, page_url):
         """
@@ -62,12 +213,180 @@ class LinkCheckerAsync(LinkProcessor):
         :rtype: list of tuples
         """
         with step(f'Открытие страницы {page_url} для проверки ссылок с использованием BeautifulSoup'):
-            response = requests.get(page_url)
-        assert response.status_code == 200, f'Не удалось открыть страницу: {page_url}'
-        html_content = response.text
-        links = self.get_all_links_with_bs4(html_content)
+            response, links = await self.client.fetch_page(page_url, read=self.read_links)
+        assert response.status == 200, f'Не удалось открыть страницу: {page_url}'
         return await self.check_all_links(links, page_url)
 
+    async def read_links(self, response):
+        """
+        Читает HTML-страницу из ответа и извлекает ссылки выбранным способом (см. extractor), не блокируя event loop.
+
+        Разбор выполняется в рабочем потоке: для 'bs4' - после получения страницы целиком,
+        для 'stream' - по мере получения кусков страницы.
+
+        :param response: Ответ с HTML-страницей, тело которого еще не прочитано.
+        :type response: aiohttp.ClientResponse
+        :returns: Список всех найденных ссылок в HTML (пустой для неуспешного ответа или не-HTML).
+        :rtype: list
+        """
+        if response.status != 200 or 'html' not in response.content_type:
+            return []
+        if self.extractor == 'stream':
+            with step('Потоковое получение всех ссылок на странице'):
+                parser = StreamingLinkExtractor(response.charset or 'utf-8')
+                links = []
+                async for chunk in response.content.iter_chunked(self.STREAM_CHUNK_SIZE):
+                    links.extend(await asyncio.to_thread(parser.feed_chunk, chunk))
+                return links + parser.finish()
+        html_content = await response.text(errors='replace')
+        with step('Получение всех ссылок на странице с использованием BeautifulSoup'):
+            return await asyncio.to_thread(self.parse_links_with_bs4, html_content)
+
+    @step('Проверка всех ресурсов на странице')
+    async def check_all_assets(self, assets, base_url):
+        """
+        Конкурентно проверяет все ресурсы страницы (ссылки, изображения, скрипты, стили, шрифты, медиа)
+        и логирует битые.
+
+        Ресурсы проверяются тем же конвейером, что и ссылки (HEAD с откатом на GET, кэш, ограничения по хостам).
+        Рабочие CSS-файлы загружаются параллельно, и найденные в них url(...) и @import проверяются следующим кругом.
+
+        :param assets: Список кортежей (ссылка, тип ресурса), см. get_all_assets.
+        :type assets: list
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :returns: Список битых ресурсов: кортежи (URL, код ответа, тип ресурса).
+        :rtype: list of tuples
+        """
+        steps = self.asset_check_steps(assets, base_url)
+        result = None
+        while True:
+            try:
+                kind, payload = steps.send(result)
+            except StopIteration as stop:
+                return stop.value
+            if kind == self.FETCH_STEP:
+                texts = await asyncio.gather(*(self._fetch_stylesheet(url) for url in payload))
+                result = dict(zip(payload, texts))
+            else:
+                result = await self._check_asset_urls(payload)
+
+    async def _check_asset_urls(self, groups):
+        """
+        Проверяет ресурсы, сгруппированные по странице или CSS-файлу, в котором они найдены.
+
+        :param groups: Словарь {базовый URL: список нормализованных URL}.
+        :type groups: dict
+        :returns: Словарь {URL: код ответа}.
+        :rtype: dict
+        """
+        statuses = {}
+        for base_url, urls in groups.items():
+            statuses.update({url: status async for url, status in self.iter_check_links(urls, base_url, unique=True)})
+        return statuses
+
+    async def check_assets_on_page(self, page_url):
+        """
+        Проверяет все ресурсы на указанной странице и логирует битые.
+
+        :param page_url: URL страницы для проверки.
+        :type page_url: str
+        :returns: Список битых ресурсов: кортежи (URL, код ответа, тип ресурса).
+        :rtype: list of tuples
+        """
+        with step(f'Открытие страницы {page_url} для проверки ресурсов'):
+            status, html_content = await self._fetch_page(page_url)
+        assert status == 200, f'Не удалось открыть страницу: {page_url}'
+        with step('Получение всех ресурсов на странице'):
+            # Разбор HTML выполняется в рабочем потоке, чтобы не останавливать event loop
+            assets = await asyncio.to_thread(self.get_all_assets, html_content)
+        return await self.check_all_assets(assets, page_url)
+
+    async def _fetch_page(self, url):
+        """
+        Загружает страницу или CSS-файл через клиент чекера с учетом robots.txt и ограничений частоты
+        запросов к хосту.
+
+        :param url: URL страницы.
+        :type url: str
+        :returns: Код ответа (или ROBOTS_DISALLOWED) и текст ответа.
+        :rtype: tuple
+        """
+        if self.politeness is not None:
+            if not await self.politeness.allowed(self.client, url):
+                return self.ROBOTS_DISALLOWED, ''
+            await self.politeness.wait(url)
+        response, text = await self.client.fetch_page(url)
+        return response.status, text
+
+    async def _fetch_stylesheet(self, url):
+        try:
+            status, css_text = await self._fetch_page(url)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return ''
+        return css_text if status == 200 else ''
+
+    @step('Проверка всех ссылок из sitemap')
+    async def check_sitemap(self, sitemap, batch_size=1000):
+        """
+        Проверяет все страницы из sitemap (включая вложенные индексы и сжатые sitemap) и логирует битые ссылки.
+
+        Sitemap читается потоково в рабочем потоке пачками по batch_size URL, чтобы не блокировать event loop,
+        пока предыдущие ссылки проверяются. В памяти хранятся только текущая пачка и битые ссылки.
+
+        :param sitemap: URL или путь к файлу sitemap.
+        :type sitemap: str
+        :param batch_size: Количество URL, читаемых из sitemap за один раз.
+        :type batch_size: int
+        :returns: Список битых ссылок с кодами ответа.
+        :rtype: list of tuples
+        """
+        links = self.get_links_from_sitemap(sitemap)
+        broken_links = []
+        next_batch = asyncio.create_task(asyncio.to_thread(list, islice(links, batch_size)))
+        try:
+            while batch := await next_batch:
+                next_batch = asyncio.create_task(asyncio.to_thread(list, islice(links, batch_size)))
+                async for url, status in self.iter_check_links(batch, sitemap):
+                    if self.is_broken(status):
+                        broken_links.append((url, status))
+        finally:
+            # Если проверка пачки завершилась ошибкой, следующая пачка уже не нужна
+            next_batch.cancel()
+        return broken_links
+
+    @step('Проверка ссылок из общей очереди')
+    async def check_frontier(self, frontier, batch_size=100, poll_interval=1.0):
+        """
+        Арендует ссылки из общей очереди порциями, проверяет их и подтверждает результаты.
+
+        Несколько процессов или CI-агентов могут одновременно обрабатывать одну очередь SqliteFrontier:
+        каждый получает свою порцию ссылок, а ссылки упавшего обработчика после истечения аренды
+        достаются остальным. Обращения к очереди выполняются в рабочем потоке, чтобы ожидание блокировки
+        файла не останавливало event loop. Метод завершается, когда в очереди не остается необработанных ссылок.
+
+        :param frontier: Очередь ссылок (MemoryFrontier или SqliteFrontier) с нормализованными URL.
+        :type frontier: MemoryFrontier or SqliteFrontier
+        :param batch_size: Количество ссылок, арендуемых за один раз.
+        :type batch_size: int
+        :param poll_interval: Пауза в секундах, если все оставшиеся ссылки арендованы другими обработчиками.
+        :type poll_interval: float
+        :returns: Список битых ссылок, проверенных этим обработчиком (все битые ссылки - frontier.broken_links()).
+        :rtype: list of tuples
+        """
+        broken_links = []
+        while True:
+            items = await asyncio.to_thread(frontier.lease, batch_size)
+            if not items:
+                if not await asyncio.to_thread(frontier.remaining):
+                    return broken_links
+                await asyncio.sleep(poll_interval)
+                continue
+            for base_url, urls in self.group_by_base_url(items).items():
+                results = [result async for result in self.iter_check_links(urls, base_url)]
+                await asyncio.to_thread(frontier.ack, results)
+                broken_links.extend((url, status) for url, status in results if self.is_broken(status))
+
     @step('Проверка отсутствия битых ссылок')
     def assert_no_broken_links(self, broken_links):
         """
@@ -76,4 +395,5 @@ class LinkCheckerAsync(LinkProcessor):
         :param broken_links: Список битых ссылок с кодами ответа.
         :type broken_links: list of tuples
         """
+        self.metrics.attach()
         assert not broken_links, f'Найдены битые ссылки: {broken_links}'
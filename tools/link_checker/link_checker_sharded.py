@@ -0,0 +1,257 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from hashlib import blake2b
+from itertools import islice
+from urllib.parse import urlsplit
+
+from allure import step
+
+from tools.api.client import APIClientAsync
+from tools.api.resilience import CircuitBreaker
+from tools.link_checker.link_cache import LinkStatusStore, link_result_cache
+from tools.link_checker.link_checker_async import LinkCheckerAsync
+from tools.link_checker.link_processor import LinkProcessor
+from tools.link_checker.metrics import LinkCheckMetrics, link_check_metrics
+
+
+def host_hash(url):
+    """
+    Вычисляет стабильный хеш хоста ссылки (одинаковый во всех процессах, в отличие от hash()).
+
+    :param url: Нормализованный URL.
+    :type url: str
+    :rtype: int
+    """
+    return int.from_bytes(blake2b(urlsplit(url).netloc.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def default_process_count():
+    """
+    Определяет количество процессов для проверки ссылок.
+
+    Ядра CPU делятся поровну между воркерами pytest-xdist, чтобы воркеры с собственными пулами процессов
+    не конкурировали за одни и те же ядра.
+
+    :rtype: int
+    """
+    workers = int(os.environ.get('PYTEST_XDIST_WORKER_COUNT', 1))
+    return max(1, (os.cpu_count() or 1) // max(workers, 1))
+
+
+class _ShardChecker(LinkCheckerAsync):
+    """
+    Асинхронный чекер, работающий в дочернем процессе.
+
+    Битые ссылки не логируются и не кэшируются на месте: записи о проверке возвращаются в основной
+    процесс, который один пишет в кэш сессии и в файл битых ссылок.
+    """
+
+    def store_result(self, record, page_url):
+        return record
+
+    async def collect(self, urls, base_url):
+        async with self.client:
+            return [record async for record in self.iter_check_links(urls, base_url, unique=True)]
+
+
+def _check_shard(urls, base_url, cache_path, cache_ttl, options):
+    """
+    Проверяет ссылки одного шарда в собственном event loop дочернего процесса.
+
+    :returns: Список записей о проверке (см. LinkProcessor.make_record).
+    :rtype: list of dict
+    """
+    store = LinkStatusStore(cache_path, ttl=cache_ttl) if cache_path else None
+    try:
+        checker = _ShardChecker(cache=None, store=store, metrics=LinkCheckMetrics(progress_interval=None), **options)
+        return asyncio.run(checker.collect(urls, base_url))
+    finally:
+        if store is not None:
+            store.close()
+
+
+class LinkCheckerSharded(LinkProcessor):
+    """
+    Класс для проверки ссылок в нескольких процессах, каждый со своим event loop.
+
+    Ссылки распределяются по процессам по хешу хоста, поэтому все запросы к одному хосту выполняются
+    в одном процессе и ограничения max_per_host и politeness продолжают действовать для хоста целиком.
+    Результаты возвращаются в основной процесс и складываются в те же структуры, что и у LinkCheckerAsync.
+    Пул процессов создается при первой проверке и переиспользуется всеми следующими (в том числе пачками
+    sitemap); close завершает его процессы.
+    """
+
+    def __init__(self, processes=None, cache=link_result_cache, cache_path=None, cache_ttl=24 * 60 * 60,
+                 metrics=link_check_metrics, **options):
+        """
+        :param processes: Количество процессов (по умолчанию ядра CPU, поделенные между воркерами pytest-xdist).
+        :type processes: int
+        :param cache: Кэш результатов проверки на время сессии в основном процессе (None - без кэша).
+        :type cache: LinkResultCache
+        :param cache_path: Путь к файлу SQLite для постоянного кэша, общего для всех процессов и воркеров
+            pytest-xdist (None - без постоянного кэша).
+        :type cache_path: str
+        :param cache_ttl: Время в секундах, в течение которого рабочая ссылка не проверяется повторно.
+        :type cache_ttl: int
+        :param metrics: Показатели прогона, собираемые в основном процессе по результатам дочерних.
+        :type metrics: LinkCheckMetrics
+        :param options: Параметры LinkCheckerAsync для дочерних процессов (max_concurrency, max_per_host,
+            probe, politeness, seen_set).
+        """
+        self.processes = processes or default_process_count()
+        self.cache = cache
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        self.options = options
+        self.metrics = metrics
+        self.seen_set = options.get('seen_set', self.seen_set)
+        self.politeness = options.get('politeness')
+        # Страницы и CSS-файлы для проверки ресурсов загружаются в основном процессе
+        self.client = APIClientAsync(api_url='', circuit_breaker=CircuitBreaker(), single_flight=True)
+        self._executor = None
+
+    def close(self):
+        """
+        Завершает процессы пула. Следующая проверка создаст новый пул.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    def _get_executor(self):
+        if self._executor is None:
+            # spawn: дочерний процесс не наследует запущенный event loop и потоки основного процесса
+            context = multiprocessing.get_context('spawn')
+            self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=context)
+        return self._executor
+
+    @step('Проверка всех ссылок в нескольких процессах')
+    async def check_all_links(self, links, base_url, shard=None, shards=1):
+        """
+        Проверяет ссылки в пуле процессов и логирует битые ссылки.
+
+        Параметры shard и shards позволяют разделить один набор ссылок между тестами, которые pytest-xdist
+        запускает в разных воркерах: тест с номером shard проверяет только свою часть хостов, и ни одна
+        ссылка не проверяется дважды. Порядок битых ссылок в результате совпадает с порядком ссылок. Ссылки,
+        которые невозможно разобрать как URL, добавляются в конец результата со статусом MALFORMED_URL.
+
+        :param links: Итерируемый набор ссылок для проверки.
+        :type links: Iterable[str]
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :param shard: Номер части ссылок, которую нужно проверить (None - все ссылки).
+        :type shard: int
+        :param shards: Количество частей, на которые делятся ссылки.
+        :type shards: int
+        :returns: Список битых ссылок с кодами ответа.
+        :rtype: list of tuples
+        """
+        links = list(links)
+        full_urls = self.prepare_links(links, base_url)
+        if shard is not None:
+            full_urls = [url for url in full_urls if host_hash(url) % shards == shard]
+        statuses = await self._check_in_processes(full_urls, base_url, shards)
+        broken_links = [(url, statuses[url]) for url in full_urls if self.is_broken(statuses[url])]
+        # Ссылки без хоста, которые невозможно разобрать как URL, относятся к первой части
+        if not shard:
+            broken_links += self.report_malformed_links(links, base_url)
+        return broken_links
+
+    @step('Проверка всех ссылок из sitemap в нескольких процессах')
+    async def check_sitemap(self, sitemap, batch_size=10000, shard=None, shards=1):
+        """
+        Проверяет все страницы из sitemap в пуле процессов и логирует битые ссылки.
+
+        Sitemap читается потоково в рабочем потоке пачками по batch_size URL, каждая пачка делится
+        между процессами по хешу хоста.
+
+        :param sitemap: URL или путь к файлу sitemap.
+        :type sitemap: str
+        :param batch_size: Количество URL, читаемых из sitemap за один раз.
+        :type batch_size: int
+        :param shard: Номер части ссылок, которую нужно проверить (None - все ссылки).
+        :type shard: int
+        :param shards: Количество частей, на которые делятся ссылки.
+        :type shards: int
+        :returns: Список битых ссылок с кодами ответа.
+        :rtype: list of tuples
+        """
+        links = self.get_links_from_sitemap(sitemap)
+        broken_links = []
+        while batch := await asyncio.to_thread(list, islice(links, batch_size)):
+            broken_links.extend(await self.check_all_links(batch, sitemap, shard, shards))
+        return broken_links
+
+    # Ресурсы страницы проверяются по тому же порядку, что и у LinkCheckerAsync, а сами ссылки - в пуле процессов
+    check_all_assets = LinkCheckerAsync.check_all_assets
+    check_assets_on_page = LinkCheckerAsync.check_assets_on_page
+    _fetch_page = LinkCheckerAsync._fetch_page
+    _fetch_stylesheet = LinkCheckerAsync._fetch_stylesheet
+
+    async def _check_asset_urls(self, groups):
+        """
+        Проверяет ресурсы, сгруппированные по странице или CSS-файлу, в пуле процессов.
+
+        :param groups: Словарь {базовый URL: список нормализованных URL}.
+        :type groups: dict
+        :returns: Словарь {URL: код ответа}.
+        :rtype: dict
+        """
+        statuses = {}
+        for base_url, urls in groups.items():
+            statuses.update(await self._check_in_processes(urls, base_url, 1))
+        return statuses
+
+    async def _check_in_processes(self, full_urls, base_url, shards):
+        """
+        Раскладывает непроверенные ссылки по процессам и собирает результаты.
+
+        :returns: Словарь {URL: код ответа} по всем ссылкам.
+        :rtype: dict
+        """
+        statuses = {}
+        buckets = [[] for _ in range(self.processes)]
+        for url in full_urls:
+            status = self.get_cached_status(url)
+            if status is not None:
+                statuses[url] = status
+            else:
+                # Делим на shards, чтобы разбиение по процессам не совпадало с разбиением по воркерам
+                buckets[host_hash(url) // shards % self.processes].append(url)
+        buckets = [bucket for bucket in buckets if bucket]
+        if not buckets:
+            return statuses
+
+        self.metrics.started(sum(len(bucket) for bucket in buckets))
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(
+                    executor, _check_shard, bucket, base_url, self.cache_path, self.cache_ttl, self.options
+                )
+                for bucket in buckets
+            ))
+        except BrokenProcessPool:
+            # Пул с упавшим процессом непригоден, следующая проверка создаст новый
+            self.close()
+            raise
+        for records in results:
+            for record in records:
+                url, status = self.store_result(record, base_url)
+                statuses[url] = status
+        return statuses
+
+    @step('Проверка отсутствия битых ссылок')
+    def assert_no_broken_links(self, broken_links):
+        """
+        Проверяет отсутствие битых ссылок.
+
+        :param broken_links: Список битых ссылок с кодами ответа.
+        :type broken_links: list of tuples
+        """
+        self.metrics.attach()
+        assert not broken_links, f'Найдены битые ссылки: {broken_links}'
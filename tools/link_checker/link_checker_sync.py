@@ -1,11 +1,16 @@
-from urllib.parse import urljoin
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 
 import requests
 from allure import step
+from requests.adapters import HTTPAdapter
 from selene.api import browser
 
 from tools.api.client import APIClient
+from tools.api.resilience import CircuitBreaker
+from tools.link_checker.link_cache import link_result_cache
 from tools.link_checker.link_processor import LinkProcessor
+from tools.link_checker.metrics import link_check_metrics
 
 
 class LinkCheckerSync(LinkProcessor):
@@ -13,14 +18,53 @@ class LinkCheckerSync(LinkProcessor):
     Класс для проверки всех ссылок на странице и логирования битых ссылок с использованием нового синхронного API клиента.
     """
 
-    def __init__(self):
-        self.client = APIClient()
+    def __init__(self, probe=True, cache=link_result_cache, store=None, extractor='bs4', workers=1,
+                 politeness=None, seen_set='set',
+                 metrics=link_check_metrics):
+        """
+        :param probe: Проверять ссылки HEAD-запросом (с откатом на потоковый GET) без скачивания тела.
+        :type probe: bool
+        :param cache: Кэш результатов проверки на время сессии (None - без кэша).
+        :type cache: LinkResultCache
+        :param store: Постоянный кэш результатов между прогонами (None - без него).
+        :type store: LinkStatusStore
+        :param extractor: Способ извлечения ссылок из HTML: 'bs4' или 'stream' (потоковый, без DOM-дерева).
+        :type extractor: str
+        :param politeness: Ограничения частоты запросов к хостам и учет robots.txt (None - без ограничений).
+        :type politeness: HostPoliteness
+        :param seen_set: Множество просмотренных URL: 'set', 'fingerprint' (компактные 64-битные отпечатки)
+            или 'bloom' (фильтр Блума, часть ссылок может быть пропущена).
+        :type seen_set: str
+        :param metrics: Показатели прогона (скорость, время ответа, ошибки), общие для всех чекеров сессии.
+        :type metrics: LinkCheckMetrics
+        :param workers: Количество потоков для параллельной проверки ссылок (1 - последовательная проверка).
+        :type workers: int
+        """
+        self.client = APIClient(api_url='', circuit_breaker=CircuitBreaker())
+        self.probe = probe
+        self.cache = cache
+        self.store = store
+        self.extractor = extractor
+        self.politeness = politeness
+        self.seen_set = seen_set
+        self.metrics = metrics
+        self.workers = workers
+
+        if workers > 1:
+            # Пул соединений должен вмещать все потоки, иначе лишние соединения будут открываться и закрываться
+            adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            self.client.session.mount('http://', adapter)
+            self.client.session.mount('https://', adapter)
 
     @step('Проверка всех ссылок на странице')
     def check_all_links(self, links, base_url):
         """
         Проверяет все ссылки на текущей веб-странице и логирует битые ссылки.
 
+        При workers > 1 ссылки проверяются параллельно в пуле потоков с общей сессией requests.
+        Порядок битых ссылок в результате совпадает с порядком ссылок на странице. Ссылки, которые невозможно
+        разобрать как URL, добавляются в конец результата со статусом MALFORMED_URL.
+
         :param links: Список ссылок для проверки.
         :type links: list
         :param base_url: Базовый URL для построения полных ссылок.
@@ -28,16 +72,124 @@ class LinkCheckerSync(LinkProcessor):
         :returns: Список битых ссылок с кодами ответа.
         :rtype: list of tuples
         """
-        broken_links = []
-        for link in links:
-            if link:
-                full_url = urljoin(base_url, link)
-                response = self.client.get(full_url)
-                if response is None or response.status_code != 200:
-                    status_code = response.status_code if response else 'No Response'
-                    broken_links.append((full_url, status_code))
-                    self.log_broken_link(full_url, status_code)
-        return broken_links
+        full_urls = self.prepare_links(links, base_url)
+        statuses = dict(self.iter_check_links(full_urls, base_url, unique=True))
+        broken_links = [(url, statuses[url]) for url in full_urls if self.is_broken(statuses[url])]
+        return broken_links + self.report_malformed_links(links, base_url)
+
+    def iter_check_links(self, links, base_url, unique=False):
+        """
+        Проверяет ссылки и отдает результат каждой сразу после ее проверки.
+
+        Ссылки читаются из links лениво, поэтому вызывающий код может остановить проверку в любой момент
+        или записывать результаты по мере поступления. При workers > 1 результаты отдаются в порядке завершения.
+
+        :param links: Итерируемый набор ссылок для проверки.
+        :type links: Iterable[str]
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :param unique: Ссылки уже нормализованы и не повторяются (например, получены из prepare_links):
+            повторное удаление дубликатов не выполняется, поэтому ложные срабатывания фильтра Блума
+            не теряют ссылки.
+        :type unique: bool
+        :returns: Генератор кортежей (URL, код ответа) по всем проверенным ссылкам.
+        :rtype: Iterator[tuple]
+        """
+        urls = iter(links) if unique else self.iter_new_links(links, base_url)
+        if self.politeness is not None:
+            # Хосты чередуются в окне из нескольких пачек потоков, чтобы не загружать все ссылки в память
+            urls = self.politeness.interleave_by_host(urls, window=max(self.workers, 1) * 4)
+
+        if self.workers <= 1:
+            for url in urls:
+                status_code = self.get_cached_status(url)
+                if status_code is not None:
+                    yield url, status_code
+                else:
+                    self.metrics.started()
+                    yield self.store_result(self._check_link(url), base_url)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = set()
+            try:
+                for url in urls:
+                    status_code = self.get_cached_status(url)
+                    if status_code is not None:
+                        yield url, status_code
+                        continue
+                    self.metrics.started()
+                    futures.add(executor.submit(self._check_link, url))
+                    if len(futures) >= self.workers * 2:
+                        done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield self.store_result(future.result(), base_url)
+                for future in as_completed(futures):
+                    futures.discard(future)
+                    yield self.store_result(future.result(), base_url)
+            finally:
+                self.metrics.cancelled(len(futures))
+                for future in futures:
+                    future.cancel()
+
+    def _check_link(self, full_url):
+        """
+        Проверяет одну ссылку.
+
+        Ответ 429/503 с допустимым Retry-After повторяется один раз после паузы для всего хоста.
+
+        :param full_url: Полный URL для проверки.
+        :type full_url: str
+        :returns: Запись о проверке (см. LinkProcessor.make_record).
+        :rtype: dict
+        """
+        started = time.perf_counter()
+        headers = None
+        if self.store is not None:
+            status_code, headers = self.store.lookup(full_url)
+            if status_code is not None:
+                return self.make_record(full_url, status_code, started)
+
+        if self.politeness is not None and not self.politeness.allowed_sync(self.client.session, full_url):
+            return self.make_record(full_url, self.ROBOTS_DISALLOWED, started)
+
+        for attempt in range(2):
+            if self.politeness is not None:
+                self.politeness.wait_sync(full_url)
+            try:
+                if self.probe:
+                    response = self.client.probe(full_url, headers=headers, raise_errors=True)
+                else:
+                    response = self._get_link(full_url, headers)
+            except requests.exceptions.RequestException as e:
+                return self.make_record(full_url, 'No Response', started, error=type(e).__name__)
+            if self.politeness is None or attempt or response is None:
+                break
+            delay = self.politeness.retry_delay(response.status_code, response.headers)
+            if delay is None:
+                break
+            self.politeness.defer(full_url, delay)
+
+        if response is None:
+            return self.make_record(full_url, 'No Response', started)
+
+        status_code = response.status_code
+        if self.store is not None:
+            status_code = self.store.record(full_url, status_code, response.headers)
+        return self.make_record(full_url, status_code, started, response)
+
+    def _get_link(self, full_url, headers=None):
+        """
+        Загружает ссылку GET-запросом целиком (режим probe=False).
+
+        :param full_url: Полный URL для проверки.
+        :type full_url: str
+        :param headers: Заголовки условного запроса из постоянного кэша (None - без них).
+        :type headers: dict
+        :returns: Объект ответа или None в случае ошибки.
+        :rtype: requests.Response
+        """
+        return self.client.get(full_url, headers=headers)
 
     def check_links_on_page_with_selene(self, page_url):
         """
@@ -63,12 +215,127 @@ class LinkCheckerSync(LinkProcessor):
         :rtype: list of tuples
         """
         with step(f'Открытие страницы {page_url} для проверки ссылок с использованием BeautifulSoup'):
-            response = requests.get(page_url)
-        assert response.status_code == 200, f'Не удалось открыть страницу: {page_url}'
-        html_content = response.text
-        links = self.get_all_links_with_bs4(html_content)
+            response = self.client.fetch_page(page_url, stream=self.extractor == 'stream')
+        with response:
+            assert response.status_code == 200, f'Не удалось открыть страницу: {page_url}'
+            links = self.get_links_from_response(response)
         return self.check_all_links(links, page_url)
 
+    @step('Проверка всех ресурсов на странице')
+    def check_all_assets(self, assets, base_url):
+        """
+        Проверяет все ресурсы страницы (ссылки, изображения, скрипты, стили, шрифты, медиа) и логирует битые.
+
+        Ресурсы проверяются тем же конвейером, что и ссылки (HEAD с откатом на GET, кэш, параллельная проверка).
+        Рабочие CSS-файлы загружаются, и найденные в них url(...) и @import проверяются следующим кругом.
+
+        :param assets: Список кортежей (ссылка, тип ресурса), см. get_all_assets.
+        :type assets: list
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :returns: Список битых ресурсов: кортежи (URL, код ответа, тип ресурса).
+        :rtype: list of tuples
+        """
+        steps = self.asset_check_steps(assets, base_url)
+        result = None
+        while True:
+            try:
+                kind, payload = steps.send(result)
+            except StopIteration as stop:
+                return stop.value
+            if kind == self.FETCH_STEP:
+                result = {url: self._fetch_stylesheet(url) for url in payload}
+            else:
+                result = {url: status for page_url, urls in payload.items()
+                          for url, status in self.iter_check_links(urls, page_url, unique=True)}
+
+    def check_assets_on_page(self, page_url):
+        """
+        Проверяет все ресурсы на указанной странице и логирует битые.
+
+        :param page_url: URL страницы для проверки.
+        :type page_url: str
+        :returns: Список битых ресурсов: кортежи (URL, код ответа, тип ресурса).
+        :rtype: list of tuples
+        """
+        with step(f'Открытие страницы {page_url} для проверки ресурсов'):
+            status_code, html_content = self._fetch_page(page_url)
+        assert status_code == 200, f'Не удалось открыть страницу: {page_url}'
+        with step('Получение всех ресурсов на странице'):
+            assets = self.get_all_assets(html_content)
+        return self.check_all_assets(assets, page_url)
+
+    def _fetch_page(self, url):
+        """
+        Загружает страницу или CSS-файл через клиент чекера (таймауты, повторы, circuit breaker)
+        с учетом robots.txt и ограничений частоты запросов к хосту.
+
+        :param url: URL страницы.
+        :type url: str
+        :returns: Код ответа (или ROBOTS_DISALLOWED) и текст ответа.
+        :rtype: tuple
+        """
+        if self.politeness is not None:
+            if not self.politeness.allowed_sync(self.client.session, url):
+                return self.ROBOTS_DISALLOWED, ''
+            self.politeness.wait_sync(url)
+        response = self.client.fetch_page(url)
+        return response.status_code, response.text
+
+    def _fetch_stylesheet(self, url):
+        try:
+            status_code, css_text = self._fetch_page(url)
+        except requests.exceptions.RequestException:
+            return ''
+        return css_text if status_code == 200 else ''
+
+    @step('Проверка всех ссылок из sitemap')
+    def check_sitemap(self, sitemap):
+        """
+        Проверяет все страницы из sitemap (включая вложенные индексы и сжатые sitemap) и логирует битые ссылки.
+
+        URL читаются из sitemap потоково и сразу передаются на проверку, в памяти хранятся только битые ссылки.
+
+        :param sitemap: URL или путь к файлу sitemap.
+        :type sitemap: str
+        :returns: Список битых ссылок с кодами ответа.
+        :rtype: list of tuples
+        """
+        links = self.get_links_from_sitemap(sitemap, session=self.client.session)
+        return [(url, status_code) for url, status_code in self.iter_check_links(links, sitemap)
+                if self.is_broken(status_code)]
+
+    @step('Проверка ссылок из общей очереди')
+    def check_frontier(self, frontier, batch_size=100, poll_interval=1.0):
+        """
+        Арендует ссылки из общей очереди порциями, проверяет их и подтверждает результаты.
+
+        Несколько процессов или CI-агентов могут одновременно обрабатывать одну очередь SqliteFrontier:
+        каждый получает свою порцию ссылок, а ссылки упавшего обработчика после истечения аренды
+        достаются остальным. Метод завершается, когда в очереди не остается необработанных ссылок.
+
+        :param frontier: Очередь ссылок (MemoryFrontier или SqliteFrontier) с нормализованными URL.
+        :type frontier: MemoryFrontier or SqliteFrontier
+        :param batch_size: Количество ссылок, арендуемых за один раз.
+        :type batch_size: int
+        :param poll_interval: Пауза в секундах, если все оставшиеся ссылки арендованы другими обработчиками.
+        :type poll_interval: float
+        :returns: Список битых ссылок, проверенных этим обработчиком (все битые ссылки - frontier.broken_links()).
+        :rtype: list of tuples
+        """
+        broken_links = []
+        while True:
+            items = frontier.lease(batch_size)
+            if not items:
+                if not frontier.remaining():
+                    return broken_links
+                time.sleep(poll_interval)
+                continue
+            for base_url, urls in self.group_by_base_url(items).items():
+                results = list(self.iter_check_links(urls, base_url))
+                frontier.ack(results)
+                broken_links.extend((url, status) for url, status in results if self.is_broken(status))
+
     @step('Проверка отсутствия битых ссылок')
     def assert_no_broken_links(self, broken_links):
         """
@@ -77,4 +344,5 @@ class LinkCheckerSync(LinkProcessor):
         :param broken_links: Список битых ссылок с кодами ответа.
         :type broken_links: list of tuples
         """
+        self.metrics.attach()
         assert not broken_links, f'Найдены битые ссылки: {broken_links}'
@@ -0,0 +1,169 @@
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+import aiohttp
+import allure
+from allure import step
+
+from tools.link_checker.frontier import MemoryFrontier
+from tools.link_checker.link_checker_async import LinkCheckerAsync
+from tools.link_checker.link_processor import LinkProcessor
+
+
+class LinkCrawler(LinkProcessor):
+    """
+    Класс для обхода страниц одного сайта в ширину и проверки всех найденных на них ссылок.
+
+    Загрузка страниц и проверка ссылок выполняются в одном event loop и перекрываются: пока ссылки
+    одной страницы проверяются, следующие страницы уже загружаются. Одновременно проверяются ссылки
+    не больше check_concurrency страниц, а ограничения max_concurrency и max_per_host чекера общие для всех
+    страниц. Очередь страниц хранится во frontier: с общей очередью SqliteFrontier один сайт могут обходить
+    несколько процессов или CI-агентов.
+    """
+
+    def __init__(self, checker=None, max_depth=2, max_pages=100, page_concurrency=5, frontier=None,
+                 poll_interval=0.1, check_concurrency=5):
+        """
+        :param checker: Асинхронный чекер для проверки ссылок (по умолчанию создается новый).
+        :type checker: LinkCheckerAsync
+        :param max_depth: Максимальная глубина обхода от стартовой страницы.
+        :type max_depth: int
+        :param max_pages: Максимальное количество загружаемых страниц.
+        :type max_pages: int
+        :param page_concurrency: Количество одновременно загружаемых страниц.
+        :type page_concurrency: int
+        :param frontier: Очередь страниц для обхода (по умолчанию новая MemoryFrontier на каждый обход).
+        :type frontier: MemoryFrontier or SqliteFrontier
+        :param poll_interval: Пауза в секундах, если все оставшиеся страницы уже обрабатываются.
+        :type poll_interval: float
+        :param check_concurrency: Количество страниц, ссылки которых проверяются одновременно. Загрузка следующих
+            страниц приостанавливается, пока не завершится одна из проверок.
+        :type check_concurrency: int
+        """
+        self.checker = checker or LinkCheckerAsync()
+        self.client = self.checker.client
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.page_concurrency = page_concurrency
+        self.frontier = frontier
+        self.poll_interval = poll_interval
+        self.check_concurrency = check_concurrency
+        self.crawled_pages = []
+        self.summary = {}
+
+    @step('Обход сайта и проверка всех ссылок')
+    async def crawl(self, seed_url):
+        """
+        Обходит страницы сайта, начиная с seed_url, и проверяет все ссылки на них.
+
+        В обход попадают только страницы того же хоста, что и seed_url, не глубже max_depth
+        и не больше max_pages. Ссылки на другие хосты проверяются, но не обходятся.
+
+        :param seed_url: URL стартовой страницы.
+        :type seed_url: str
+        :returns: Список битых ссылок с кодами ответа.
+        :rtype: list of tuples
+        """
+        seed_url = self.normalize_url(seed_url)
+        site = urlsplit(seed_url).netloc
+        frontier = self.frontier or MemoryFrontier()
+        frontier.put([seed_url], seed_url)
+        seen = self.checker.new_seen_set(capacity=self.max_pages)
+        seen.add(seed_url)
+        broken_pages = []
+        check_tasks = []
+        check_slots = asyncio.Semaphore(self.check_concurrency)
+        self.crawled_pages = []
+
+        async def worker():
+            while True:
+                items = await asyncio.to_thread(frontier.lease, 1)
+                if not items:
+                    if not await asyncio.to_thread(frontier.remaining):
+                        return
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                page_url, depth = items[0].url, items[0].depth
+                try:
+                    status, links = await self._fetch_links(page_url)
+                except BaseException:
+                    await asyncio.to_thread(frontier.nack, [page_url])
+                    raise
+                if status == 200:
+                    self.crawled_pages.append(page_url)
+                    await check_slots.acquire()
+                    task = asyncio.create_task(self.checker.check_all_links(links, page_url))
+                    task.add_done_callback(lambda _: check_slots.release())
+                    check_tasks.append(task)
+                    if depth < self.max_depth:
+                        await asyncio.to_thread(frontier.put, self._next_pages(links, page_url, site, seen),
+                                                page_url, depth + 1)
+                elif self.is_broken(status):
+                    broken_pages.append((page_url, status))
+                await asyncio.to_thread(frontier.ack, [(page_url, status)])
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.page_concurrency)]
+        try:
+            await asyncio.gather(*workers)
+            results = await asyncio.gather(*check_tasks)
+        finally:
+            # После ошибки одного из обработчиков остальные обработчики и начатые проверки отменяются
+            # и дожидаются, чтобы не продолжать запросы после завершения обхода
+            tasks = workers + check_tasks
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        broken_links = dict(broken_pages)
+        for page_broken_links in results:
+            for url, status in page_broken_links:
+                broken_links.setdefault(url, status)
+
+        self.summary = {
+            'seed_url': seed_url,
+            'crawled_pages': len(self.crawled_pages),
+            'seen_urls': len(seen),
+            'seen_set': self.checker.seen_set,
+            'seen_set_memory_bytes': seen.memory_bytes,
+            'broken_links': len(broken_links),
+            'metrics': self.checker.metrics.summary(),
+        }
+        allure.attach(json.dumps(self.summary, ensure_ascii=False, indent=2), name="Итоги обхода сайта",
+                      attachment_type=allure.attachment_type.JSON)
+        return list(broken_links.items())
+
+    def _next_pages(self, links, page_url, site, seen):
+        """
+        Отбирает со страницы еще не просмотренные страницы того же сайта в пределах max_pages.
+
+        :returns: Список URL страниц для обхода.
+        :rtype: list
+        """
+        pages = []
+        for url in self.prepare_links(links, page_url):
+            if len(seen) >= self.max_pages:
+                break
+            if urlsplit(url).netloc == site and seen.add(url):
+                pages.append(url)
+        return pages
+
+    async def _fetch_links(self, page_url):
+        """
+        Загружает страницу и извлекает из нее ссылки.
+
+        :param page_url: URL страницы.
+        :type page_url: str
+        :returns: Кортеж (код ответа, 'No Response' или ROBOTS_DISALLOWED, список ссылок).
+        :rtype: tuple
+        """
+        politeness = self.checker.politeness
+        if politeness is not None:
+            if not await politeness.allowed(self.client, page_url):
+                return self.ROBOTS_DISALLOWED, []
+            await politeness.wait(page_url)
+
+        try:
+            response, links = await self.client.fetch_page(page_url, read=self.checker.read_links)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return 'No Response', []
+        return response.status, links
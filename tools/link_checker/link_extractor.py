@@ -0,0 +1,194 @@
+import codecs
+import re
+from html.parser import HTMLParser
+
+
+class StreamingLinkExtractor(HTMLParser):
+    """
+    Потоковый извлекатель ссылок на событиях html.parser без построения DOM-дерева.
+
+    HTML подается кусками по мере получения из HTTP-ответа, найденные ссылки отдаются сразу,
+    поэтому память не растет вместе с размером страницы.
+    """
+
+    def __init__(self, encoding='utf-8'):
+        """
+        :param encoding: Кодировка для кусков, переданных в виде bytes.
+        :type encoding: str
+        """
+        super().__init__(convert_charrefs=True)
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self._links = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'a':
+            return
+        for name, value in attrs:
+            if name == 'href' and value is not None:
+                self._links.append(value)
+                return
+
+    def feed_chunk(self, chunk):
+        """
+        Разбирает очередной кусок HTML и возвращает найденные в нем ссылки.
+
+        :param chunk: Кусок HTML.
+        :type chunk: str or bytes
+        :returns: Список ссылок, найденных после предыдущего вызова.
+        :rtype: list
+        """
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        self.feed(chunk)
+        links, self._links = self._links, []
+        return links
+
+    def finish(self):
+        """
+        Завершает разбор и возвращает ссылки, оставшиеся в буфере парсера.
+
+        :returns: Список оставшихся ссылок.
+        :rtype: list
+        """
+        self.feed(self._decoder.decode(b'', final=True))
+        self.close()
+        links, self._links = self._links, []
+        return links
+
+    @classmethod
+    def iter_links(cls, chunks, encoding='utf-8'):
+        """
+        Последовательно отдает ссылки из потока кусков HTML.
+
+        :param chunks: Итерируемый поток кусков HTML (например, response.iter_content()).
+        :type chunks: Iterable[str or bytes]
+        :param encoding: Кодировка для кусков, переданных в виде bytes.
+        :type encoding: str
+        :returns: Генератор ссылок.
+        :rtype: Iterator[str]
+        """
+        parser = cls(encoding)
+        for chunk in chunks:
+            yield from parser.feed_chunk(chunk)
+        yield from parser.finish()
+
+
+class StreamingAssetExtractor(StreamingLinkExtractor):
+    """
+    Потоковый извлекатель ссылок на все ресурсы страницы: ссылки, изображения (включая кандидатов srcset),
+    скрипты, стили, медиа и url(...) во встроенном CSS.
+
+    Отдает кортежи (URL, тип ресурса), где тип - одно из значений RESOURCE_TYPES.
+    """
+
+    RESOURCE_TYPES = ('link', 'image', 'script', 'stylesheet', 'font', 'media', 'frame', 'resource')
+
+    # Атрибуты элементов, содержащие URL ресурса, и тип ресурса
+    ASSET_ATTRIBUTES = {
+        ('a', 'href'): 'link',
+        ('area', 'href'): 'link',
+        ('img', 'src'): 'image',
+        ('img', 'srcset'): 'image',
+        ('input', 'src'): 'image',
+        ('source', 'srcset'): 'image',
+        ('source', 'src'): 'media',
+        ('video', 'src'): 'media',
+        ('video', 'poster'): 'image',
+        ('audio', 'src'): 'media',
+        ('track', 'src'): 'media',
+        ('embed', 'src'): 'media',
+        ('script', 'src'): 'script',
+        ('iframe', 'src'): 'frame',
+    }
+    # Типы ресурсов для <link href> по значению rel
+    LINK_REL_TYPES = {'stylesheet': 'stylesheet', 'icon': 'image', 'apple-touch-icon': 'image',
+                      'preload': 'resource', 'modulepreload': 'script', 'manifest': 'resource'}
+    FONT_EXTENSIONS = ('.woff', '.woff2', '.ttf', '.otf', '.eot')
+
+    CSS_URL_PATTERN = re.compile(r'''url\(\s*(['"]?)([^'")]*?)\1\s*\)''', re.IGNORECASE)
+    CSS_IMPORT_PATTERN = re.compile(r'''@import\s+(?:url\(\s*)?(['"]?)([^'")\s;]+)\1''', re.IGNORECASE)
+
+    def __init__(self, encoding='utf-8'):
+        super().__init__(encoding)
+        self._style = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'link':
+            self._add_link_tag(attrs)
+        for name, value in attrs.items():
+            if not value:
+                continue
+            if name == 'style':
+                self._links.extend(self.get_css_assets(value))
+                continue
+            resource_type = self.ASSET_ATTRIBUTES.get((tag, name))
+            if resource_type is None:
+                continue
+            if name == 'srcset':
+                self._links.extend((url, resource_type) for url in self.parse_srcset(value))
+            else:
+                self._links.append((value, resource_type))
+        if tag == 'style':
+            self._style = []
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag == 'style':
+            self._style = None
+
+    def handle_data(self, data):
+        if self._style is not None:
+            self._style.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == 'style' and self._style is not None:
+            self._links.extend(self.get_css_assets(''.join(self._style)))
+            self._style = None
+
+    def _add_link_tag(self, attrs):
+        href = attrs.pop('href', None)
+        if not href:
+            return
+        rels = (attrs.get('rel') or '').lower().split()
+        resource_type = next((self.LINK_REL_TYPES[rel] for rel in rels if rel in self.LINK_REL_TYPES), 'resource')
+        if resource_type == 'resource' and attrs.get('as') == 'font':
+            resource_type = 'font'
+        self._links.append((href, resource_type))
+
+    @staticmethod
+    def parse_srcset(srcset):
+        """
+        Получает URL всех кандидатов из значения srcset.
+
+        :param srcset: Значение атрибута srcset, например 'a.png 1x, b.png 2x'.
+        :type srcset: str
+        :returns: Список URL кандидатов.
+        :rtype: list
+        """
+        return [candidate.split()[0] for candidate in srcset.split(',') if candidate.strip()]
+
+    @classmethod
+    def get_css_assets(cls, css_text):
+        """
+        Получает ссылки на ресурсы из CSS: url(...) и @import.
+
+        :param css_text: Текст CSS.
+        :type css_text: str
+        :returns: Список кортежей (URL, тип ресурса).
+        :rtype: list
+        """
+        assets = [(url, 'stylesheet') for _, url in cls.CSS_IMPORT_PATTERN.findall(css_text)]
+        imports = {url for url, _ in assets}
+        for _, url in cls.CSS_URL_PATTERN.findall(css_text):
+            url = url.strip()
+            if not url or url in imports:
+                continue
+            path = url.split('?', 1)[0].split('#', 1)[0].lower()
+            if path.endswith(cls.FONT_EXTENSIONS):
+                assets.append((url, 'font'))
+            elif path.endswith('.css'):
+                assets.append((url, 'stylesheet'))
+            else:
+                assets.append((url, 'image'))
+        return assets
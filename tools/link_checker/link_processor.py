@@ -1,7 +1,47 @@
+import json
+import time
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+import allure
+import requests
 from allure import step
 from bs4 import BeautifulSoup
 from selene.api import browser
-from selenium.webdriver.common.by import By
+
+from tools.link_checker.link_extractor import StreamingAssetExtractor, StreamingLinkExtractor
+from tools.link_checker.link_sink import broken_links_sink
+from tools.link_checker.seen_set import create_seen_set
+from tools.link_checker.sitemap import SitemapReader
+
+# Скрипт для сбора всех ссылок страницы за один вызов WebDriver.
+# arguments[0] - список дополнительных атрибутов, из которых нужно собрать URL.
+COLLECT_LINKS_SCRIPT = """
+const toAbsolute = (value) => {
+    try {
+        return new URL(value, document.baseURI).href;
+    } catch (e) {
+        return value;
+    }
+};
+// У <a> внутри SVG свойство href - SVGAnimatedString, а не строка, поэтому берется значение атрибута
+const links = Array.from(document.querySelectorAll('a[href]'), (a) => toAbsolute(a.getAttribute('href')));
+for (const attribute of arguments[0]) {
+    for (const element of document.querySelectorAll('[' + attribute + ']')) {
+        const value = element.getAttribute(attribute).trim();
+        if (attribute === 'srcset') {
+            for (const candidate of value.split(',')) {
+                const url = candidate.trim().split(/\\s+/)[0];
+                if (url) {
+                    links.push(toAbsolute(url));
+                }
+            }
+        } else if (value) {
+            links.push(toAbsolute(value));
+        }
+    }
+}
+return links;
+"""
 
 
 class LinkProcessor:
@@ -9,18 +49,242 @@ class LinkProcessor:
     Класс для обработки списков ссылок.
     """
 
+    # Схемы, ссылки с которыми проверяются по HTTP
+    HTTP_SCHEMES = ('http', 'https')
+    # Порты по умолчанию, которые не нужно указывать в URL
+    DEFAULT_PORTS = {'http': 80, 'https': 443}
+    # Размер куска, которым страница читается при потоковом извлечении ссылок
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    # Статус ссылки, проверка которой запрещена в robots.txt (не считается битой)
+    ROBOTS_DISALLOWED = 'Disallowed by robots.txt'
+    # Статус ссылки, которую невозможно разобрать как URL (считается битой)
+    MALFORMED_URL = 'Malformed URL'
+    # Шаги проверки ресурсов страницы (см. asset_check_steps)
+    CHECK_STEP = 'check'
+    FETCH_STEP = 'fetch'
+
+    # Способ извлечения ссылок из HTML: 'bs4' (BeautifulSoup) или 'stream' (потоковый html.parser)
+    extractor = 'bs4'
+    # Множество просмотренных URL: 'set', 'fingerprint' (64-битные отпечатки) или 'bloom' (фильтр Блума)
+    seen_set = 'set'
+
+    @classmethod
+    def normalize_url(cls, link, base_url=''):
+        """
+        Приводит ссылку к каноническому абсолютному виду.
+
+        Относительная ссылка достраивается от base_url, схема и хост приводятся к нижнему регистру,
+        порт по умолчанию и фрагмент (#...) отбрасываются, параметры запроса сортируются по имени.
+        Якорные ссылки на ту же страницу (#...), ссылки с не-HTTP схемами (mailto:, tel:, javascript: и т.п.)
+        и ссылки, которые невозможно разобрать как URL (см. report_malformed_links), отфильтровываются.
+
+        :param link: Ссылка со страницы.
+        :type link: str
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :returns: Нормализованный URL или None, если ссылку не нужно проверять.
+        :rtype: str or None
+        """
+        if not link or not link.strip() or link.strip().startswith('#'):
+            return None
+        try:
+            parts = urlsplit(urljoin(base_url, link.strip()))
+            port = parts.port
+        except ValueError:
+            return None
+        scheme = parts.scheme.lower()
+        if scheme not in cls.HTTP_SCHEMES or not parts.hostname:
+            return None
+
+        host = parts.hostname
+        if ':' in host:
+            host = f'[{host}]'
+        if port is not None and port != cls.DEFAULT_PORTS[scheme]:
+            host = f'{host}:{port}'
+        userinfo = parts.netloc.rpartition('@')[0]
+        netloc = f'{userinfo}@{host}' if userinfo else host
+
+        # Стабильная сортировка по имени параметра сохраняет порядок повторяющихся параметров
+        params = sorted((param for param in parts.query.split('&') if param), key=lambda p: p.split('=', 1)[0])
+        return urlunsplit((scheme, netloc, parts.path or '/', '&'.join(params), ''))
+
+    @staticmethod
+    def is_malformed_url(link, base_url=''):
+        """
+        Проверяет, что ссылку невозможно разобрать как URL (например, http://[oops/x или нечисловой порт).
+
+        :param link: Ссылка со страницы.
+        :type link: str
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :rtype: bool
+        """
+        if not link or not link.strip():
+            return False
+        try:
+            urlsplit(urljoin(base_url, link.strip())).port
+        except ValueError:
+            return True
+        return False
+
+    def report_malformed_links(self, links, base_url):
+        """
+        Логирует как битые ссылки, которые невозможно разобрать как URL: normalize_url их отбрасывает,
+        и проверить их запросом нельзя.
+
+        :param links: Список ссылок со страницы.
+        :type links: list
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :returns: Список кортежей (ссылка, MALFORMED_URL) без дубликатов в порядке страницы.
+        :rtype: list of tuples
+        """
+        malformed = {}
+        for link in links:
+            if self.is_malformed_url(link, base_url) and link.strip() not in malformed:
+                malformed[link.strip()] = self.MALFORMED_URL
+                self.log_broken_link(url=link.strip(), status_code=self.MALFORMED_URL, page_url=base_url)
+        return list(malformed.items())
+
+    @classmethod
+    def is_broken(cls, status_code):
+        """
+        Определяет, считается ли ссылка с таким результатом проверки битой.
+
+        :param status_code: Код ответа HTTP, 'No Response' или ROBOTS_DISALLOWED.
+        :type status_code: int or str
+        :rtype: bool
+        """
+        return status_code != 200 and status_code != cls.ROBOTS_DISALLOWED
+
+    @classmethod
+    def iter_unique_links(cls, links, base_url, seen=None):
+        """
+        Лениво нормализует ссылки и отбрасывает дубликаты с сохранением порядка.
+
+        :param links: Итерируемый набор ссылок.
+        :type links: Iterable[str]
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :param seen: Множество уже просмотренных URL (по умолчанию новое множество строк).
+        :type seen: set or FingerprintSet or BloomFilter
+        :returns: Генератор уникальных нормализованных URL.
+        :rtype: Iterator[str]
+        """
+        seen = set() if seen is None else seen
+        for link in links:
+            url = cls.normalize_url(link, base_url)
+            if url and url not in seen:
+                seen.add(url)
+                yield url
+
+    @classmethod
+    def prepare_links(cls, links, base_url):
+        """
+        Нормализует ссылки и удаляет дубликаты с сохранением порядка.
+
+        :param links: Список ссылок со страницы.
+        :type links: list
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :returns: Список уникальных нормализованных URL.
+        :rtype: list
+        """
+        return list(cls.iter_unique_links(links, base_url))
+
+    @staticmethod
+    def group_by_base_url(items):
+        """
+        Группирует арендованные из очереди ссылки по странице, на которой они найдены.
+
+        :param items: Элементы очереди.
+        :type items: list of FrontierItem
+        :returns: Словарь {URL страницы: список URL}.
+        :rtype: dict
+        """
+        groups = {}
+        for item in items:
+            groups.setdefault(item.base_url, []).append(item.url)
+        return groups
+
+    def new_seen_set(self, capacity=None):
+        """
+        Создает множество просмотренных URL выбранного в чекере типа (см. seen_set).
+
+        :param capacity: Ожидаемое количество URL.
+        :type capacity: int
+        :rtype: PlainSeenSet or FingerprintSet or BloomFilter
+        """
+        if capacity is None:
+            return create_seen_set(self.seen_set)
+        return create_seen_set(self.seen_set, capacity=capacity)
+
+    def iter_new_links(self, links, base_url):
+        """
+        Лениво отбрасывает повторяющиеся ссылки с помощью нового множества просмотренных URL (см. new_seen_set)
+        и после обхода учитывает занятую множеством память в показателях прогона.
+
+        :param links: Итерируемый набор ссылок.
+        :type links: Iterable[str]
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :returns: Генератор уникальных нормализованных URL.
+        :rtype: Iterator[str]
+        """
+        seen = self.new_seen_set()
+        try:
+            yield from self.iter_unique_links(links, base_url, seen)
+        finally:
+            self.metrics.record_seen_set(seen)
+
+    def get_cached_status(self, url):
+        """
+        Возвращает результат проверки ссылки из кэша сессии чекера.
+
+        :param url: Нормализованный URL.
+        :type url: str
+        :returns: Код ответа или None, если ссылка еще не проверялась.
+        :rtype: int or str or None
+        """
+        return self.cache.get(url) if self.cache is not None else None
+
+    def store_result(self, record, page_url):
+        """
+        Сохраняет результат проверки в кэш сессии, учитывает его в показателях прогона и логирует битую ссылку.
+
+        :param record: Запись о проверке (см. make_record).
+        :type record: dict
+        :param page_url: URL страницы, на которой найдена ссылка.
+        :type page_url: str
+        :returns: Кортеж (URL, код ответа).
+        :rtype: tuple
+        """
+        url, status_code = record['url'], record['status_code']
+        if self.cache is not None:
+            self.cache.set(url, status_code)
+        broken = self.is_broken(status_code)
+        self.metrics.record(record, broken)
+        if broken:
+            self.log_broken_link(page_url=page_url, **record)
+        return url, status_code
+
     @staticmethod
     @step('Получение всех ссылок на странице с использованием selene')
-    def get_all_links_with_selene():
+    def get_all_links_with_selene(extra_attributes=()):
         """
         Получает все ссылки на текущей веб-странице с использованием selene.
 
+        Все ссылки собираются одним вызовом execute_script, а не отдельным запросом к WebDriver
+        на каждый элемент. Браузер возвращает уже разрешенные абсолютные URL.
+
+        :param extra_attributes: Дополнительные атрибуты любых элементов, из которых нужно собрать URL
+            (например, ('src', 'srcset')). Для srcset собирается каждый кандидат.
+        :type extra_attributes: tuple
         :returns: Список всех найденных ссылок на странице.
         :rtype: list
         """
-        elements = browser.driver.find_elements(By.TAG_NAME, 'a')
-        links = [element.get_attribute('href') for element in elements]
-        return links
+        return browser.driver.execute_script(COLLECT_LINKS_SCRIPT, list(extra_attributes))
 
     @staticmethod
     @step('Получение всех ссылок на странице с использованием BeautifulSoup')
@@ -28,6 +292,20 @@ class LinkProcessor:
         """
         Получает все ссылки из HTML-контента с использованием BeautifulSoup.
 
+        :param html_content: HTML-контент страницы.
+        :type html_content: str
+        :returns: Список всех найденных ссылок в HTML.
+        :rtype: list
+        """
+        return LinkProcessor.parse_links_with_bs4(html_content)
+
+    @staticmethod
+    def parse_links_with_bs4(html_content):
+        """
+        Извлекает все ссылки из HTML-контента с использованием BeautifulSoup без шага отчета.
+
+        Используется там, где разбор выполняется в рабочем потоке, а шаг отчета открывается в основном.
+
         :param html_content: HTML-контент страницы.
         :type html_content: str
         :returns: Список всех найденных ссылок в HTML.
@@ -38,15 +316,235 @@ class LinkProcessor:
         return links
 
     @staticmethod
-    @step('Логирование битых ссылок')
-    def log_broken_link(url, status_code):
+    @step('Потоковое получение всех ссылок на странице')
+    def get_all_links_streaming(chunks, encoding='utf-8'):
+        """
+        Получает все ссылки из потока кусков HTML без построения DOM-дерева.
+
+        :param chunks: Итерируемый поток кусков HTML.
+        :type chunks: Iterable[str or bytes]
+        :param encoding: Кодировка для кусков, переданных в виде bytes.
+        :type encoding: str
+        :returns: Список всех найденных ссылок в HTML.
+        :rtype: list
+        """
+        return list(StreamingLinkExtractor.iter_links(chunks, encoding))
+
+    @staticmethod
+    def get_all_assets(html_content):
+        """
+        Получает ссылки на все ресурсы страницы: <a href>, изображения и srcset, скрипты, стили, медиа
+        и url(...) во встроенном CSS.
+
+        :param html_content: HTML-контент страницы.
+        :type html_content: str
+        :returns: Список кортежей (ссылка, тип ресурса).
+        :rtype: list
+        """
+        return list(StreamingAssetExtractor.iter_links([html_content]))
+
+    @staticmethod
+    def get_css_assets(css_text):
+        """
+        Получает ссылки на ресурсы из текста CSS-файла: url(...) и @import.
+
+        :param css_text: Текст CSS.
+        :type css_text: str
+        :returns: Список кортежей (ссылка, тип ресурса).
+        :rtype: list
+        """
+        return StreamingAssetExtractor.get_css_assets(css_text)
+
+    @classmethod
+    def prepare_assets(cls, assets, base_url):
+        """
+        Нормализует ссылки на ресурсы и удаляет дубликаты с сохранением порядка.
+
+        Если один URL встречается как ресурс разных типов, сохраняется тип первого вхождения.
+
+        :param assets: Список кортежей (ссылка, тип ресурса).
+        :type assets: list
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :returns: Словарь {нормализованный URL: тип ресурса}.
+        :rtype: dict
+        """
+        resources = {}
+        for link, resource_type in assets:
+            url = cls.normalize_url(link, base_url)
+            if url:
+                resources.setdefault(url, resource_type)
+        return resources
+
+    @classmethod
+    def summarize_assets(cls, resources, statuses):
+        """
+        Считает проверенные и битые ресурсы по типам.
+
+        :param resources: Словарь {URL: тип ресурса}.
+        :type resources: dict
+        :param statuses: Словарь {URL: код ответа}.
+        :type statuses: dict
+        :returns: Словарь {тип ресурса: {'checked': количество, 'broken': количество битых}}.
+        :rtype: dict
+        """
+        breakdown = {}
+        for url, resource_type in resources.items():
+            counts = breakdown.setdefault(resource_type, {'checked': 0, 'broken': 0})
+            counts['checked'] += 1
+            counts['broken'] += cls.is_broken(statuses[url])
+        return breakdown
+
+    def add_stylesheet_assets(self, resources, stylesheets):
+        """
+        Добавляет в resources ресурсы из загруженных CSS-файлов, которых там еще нет.
+
+        :param resources: Словарь {URL: тип ресурса}, дополняется новыми ресурсами.
+        :type resources: dict
+        :param stylesheets: Словарь {URL CSS-файла: текст CSS}.
+        :type stylesheets: dict
+        :returns: Словарь {URL CSS-файла: список новых URL из него}.
+        :rtype: dict
+        """
+        found = {}
+        for stylesheet, css_text in stylesheets.items():
+            for url, resource_type in self.prepare_assets(self.get_css_assets(css_text), stylesheet).items():
+                if url not in resources:
+                    resources[url] = resource_type
+                    found.setdefault(stylesheet, []).append(url)
+        return found
+
+    def asset_check_steps(self, assets, base_url):
+        """
+        Порядок проверки ресурсов страницы, общий для синхронных и асинхронных чекеров.
+
+        Генератор не выполняет запросов сам: он отдает шаги (вид шага, данные), а чекер выполняет их
+        своим способом и передает результат через send:
+        (CHECK_STEP, {базовый URL: список URL}) - проверить ресурсы, результат - словарь {URL: код ответа};
+        (FETCH_STEP, список URL) - загрузить рабочие CSS-файлы, результат - словарь {URL: текст CSS}.
+        Найденные в CSS url(...) и @import проверяются следующим кругом, пока не кончатся новые CSS-файлы.
+
+        :param assets: Список кортежей (ссылка, тип ресурса), см. get_all_assets.
+        :type assets: list
+        :param base_url: Базовый URL для построения полных ссылок.
+        :type base_url: str
+        :returns: Генератор шагов; по завершении возвращает список битых ресурсов (см. collect_broken_assets).
+        :rtype: Generator[tuple, dict, list]
+        """
+        resources = self.prepare_assets(assets, base_url)
+        statuses = dict((yield self.CHECK_STEP, {base_url: list(resources)}))
+        stylesheets = [url for url, resource_type in resources.items() if resource_type == 'stylesheet']
+        while stylesheets:
+            css = yield self.FETCH_STEP, [url for url in stylesheets if statuses[url] == 200]
+            found = self.add_stylesheet_assets(resources, css)
+            if found:
+                statuses.update((yield self.CHECK_STEP, found))
+            stylesheets = [url for urls in found.values() for url in urls if resources[url] == 'stylesheet']
+        return self.collect_broken_assets(resources, statuses)
+
+    def collect_broken_assets(self, resources, statuses):
+        """
+        Прикладывает к отчету разбивку ресурсов по типам и возвращает битые ресурсы.
+
+        :param resources: Словарь {URL: тип ресурса}.
+        :type resources: dict
+        :param statuses: Словарь {URL: код ответа}.
+        :type statuses: dict
+        :returns: Список битых ресурсов: кортежи (URL, код ответа, тип ресурса).
+        :rtype: list of tuples
+        """
+        breakdown = self.summarize_assets(resources, statuses)
+        allure.attach(json.dumps(breakdown, ensure_ascii=False, indent=2), name="Ресурсы по типам",
+                      attachment_type=allure.attachment_type.JSON)
+        return [(url, statuses[url], resource_type) for url, resource_type in resources.items()
+                if self.is_broken(statuses[url])]
+
+    @staticmethod
+    def get_links_from_sitemap(source, session=None):
+        """
+        Лениво получает адреса страниц из sitemap.xml, индекса sitemap или сжатого sitemap.
+
+        :param source: URL или путь к файлу sitemap.
+        :type source: str
+        :param session: Сессия requests для загрузки sitemap по URL.
+        :type session: requests.Session
+        :returns: Генератор URL страниц.
+        :rtype: Iterator[str]
+        """
+        return SitemapReader(session=session).iter_urls(source)
+
+    def get_links_from_response(self, response):
+        """
+        Получает все ссылки из ответа requests выбранным способом (см. extractor).
+
+        Для потокового способа ответ должен быть получен с stream=True.
+
+        :param response: Ответ с HTML-страницей.
+        :type response: requests.Response
+        :returns: Список всех найденных ссылок в HTML.
+        :rtype: list
+        """
+        if self.extractor == 'stream':
+            chunks = response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE)
+            return self.get_all_links_streaming(chunks, response.encoding or 'utf-8')
+        return self.get_all_links_with_bs4(response.text)
+
+    @staticmethod
+    def make_record(url, status_code, started, response=None, error=None):
+        """
+        Формирует запись о проверке ссылки для приемника результатов.
+
+        :param url: Проверенная ссылка.
+        :type url: str
+        :param status_code: Код ответа HTTP или 'No Response'.
+        :type status_code: int or str
+        :param started: Момент начала проверки по time.perf_counter().
+        :type started: float
+        :param response: Ответ сервера (requests или aiohttp), если он получен.
+        :param error: Имя класса исключения, если запрос завершился ошибкой.
+        :type error: str
+        :returns: Запись с полями url, status_code, elapsed, redirects, error, bytes.
+        :rtype: dict
+        """
+        redirects = [str(item.url) for item in response.history] if response is not None else []
+        return {
+            'url': url,
+            'status_code': status_code,
+            'elapsed': round(time.perf_counter() - started, 3),
+            'redirects': redirects,
+            'error': error,
+            'bytes': LinkProcessor.get_body_size(response),
+        }
+
+    @staticmethod
+    def get_body_size(response):
+        """
+        Определяет, сколько байт тела ответа фактически получено.
+
+        Content-Length не используется: тело ответа на HEAD и на проверочный GET, закрытый сразу после
+        заголовков, не скачивается и не учитывается.
+
+        :param response: Ответ сервера (requests или aiohttp) или None.
+        :returns: Размер полученной части тела в байтах.
+        :rtype: int
+        """
+        if response is None:
+            return 0
+        if isinstance(response, requests.Response):
+            # Байты, прочитанные urllib3 из соединения (для потокового ответа - только прочитанная часть)
+            tell = getattr(response.raw, 'tell', None)
+            return tell() if tell is not None else len(response.content)
+        return response.content.total_bytes
+
+    @staticmethod
+    def log_broken_link(url, status_code, **details):
         """
-        Записывает битую ссылку в файл broken_links.txt.
+        Записывает битую ссылку в буферизованный приемник результатов (broken_links.jsonl).
 
         :param url: Битая ссылка.
         :type url: str
         :param status_code: Код ответа HTTP.
         :type status_code: int
+        :param details: Дополнительные поля записи: page_url, elapsed, redirects, error.
         """
-        with open('broken_links.txt', 'a') as f:
-            f.write(f'{url} - {status_code}\n')
+        broken_links_sink.write(url, status_code, **details)
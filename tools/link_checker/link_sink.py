@@ -0,0 +1,113 @@
+import atexit
+import csv
+import glob
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class LinkResultSink:
+    """
+    Буферизованный приемник результатов проверки ссылок в формате JSONL или CSV.
+
+    Записи копятся в памяти и сбрасываются в файл пачками (и при завершении процесса).
+    При запуске через pytest-xdist каждый воркер пишет в свой файл-шард (broken_links.gw0.jsonl и т.д.),
+    чтобы записи разных процессов не перемешивались; в конце сессии шарды объединяются в основной файл.
+    """
+
+    FORMATS = ('jsonl', 'csv')
+    FIELDS = ('url', 'status_code', 'page_url', 'elapsed', 'redirects', 'error', 'bytes', 'checked_at')
+
+    def __init__(self, path='broken_links.jsonl', fmt=None, buffer_size=100):
+        """
+        :param path: Путь к основному файлу результатов.
+        :type path: str
+        :param fmt: Формат файла: 'jsonl' или 'csv' (по умолчанию определяется по расширению).
+        :type fmt: str
+        :param buffer_size: Количество записей в буфере, после которого они сбрасываются в файл.
+        :type buffer_size: int
+        """
+        self.path = path
+        self.fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+        if self.fmt not in self.FORMATS:
+            raise ValueError(f'Неизвестный формат файла результатов: {self.fmt}')
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    @property
+    def shard_path(self):
+        """
+        Путь к файлу текущего процесса: шард для воркера pytest-xdist или основной файл.
+
+        :rtype: str
+        """
+        worker = os.environ.get('PYTEST_XDIST_WORKER')
+        if not worker:
+            return self.path
+        base, ext = os.path.splitext(self.path)
+        return f'{base}.{worker}{ext}'
+
+    def write(self, url, status_code, **details):
+        """
+        Добавляет запись о проверенной ссылке в буфер.
+
+        :param url: Проверенная ссылка.
+        :type url: str
+        :param status_code: Код ответа HTTP или 'No Response'.
+        :type status_code: int or str
+        :param details: Дополнительные поля записи: page_url, elapsed, redirects, error, bytes.
+        """
+        record = dict.fromkeys(self.FIELDS)
+        record.update(details, url=url, status_code=status_code, checked_at=datetime.now().isoformat())
+        with self._lock:
+            self._buffer.append(record)
+            if len(self._buffer) < self.buffer_size:
+                return
+            records, self._buffer = self._buffer, []
+            self._write_records(self.shard_path, records)
+
+    def flush(self):
+        """
+        Сбрасывает накопленные записи в файл.
+        """
+        with self._lock:
+            records, self._buffer = self._buffer, []
+            if records:
+                self._write_records(self.shard_path, records)
+
+    def merge_shards(self):
+        """
+        Объединяет файлы-шарды воркеров pytest-xdist в основной файл и удаляет их.
+        """
+        self.flush()
+        base, ext = os.path.splitext(self.path)
+        for shard in sorted(glob.glob(f'{glob.escape(base)}.gw*{ext}')):
+            with open(shard, newline='', encoding='utf-8') as f:
+                if self.fmt == 'csv':
+                    records = [self._decode_csv_row(row) for row in csv.DictReader(f)]
+                else:
+                    records = [json.loads(line) for line in f if line.strip()]
+            self._write_records(self.path, records)
+            os.remove(shard)
+
+    def _write_records(self, path, records):
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            if self.fmt == 'csv':
+                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+                if is_new:
+                    writer.writeheader()
+                writer.writerows({**record, 'redirects': json.dumps(record['redirects'])} for record in records)
+            else:
+                f.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+
+    @staticmethod
+    def _decode_csv_row(row):
+        row['redirects'] = json.loads(row['redirects']) if row.get('redirects') else None
+        return row
+
+
+broken_links_sink = LinkResultSink()
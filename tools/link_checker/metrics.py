@@ -0,0 +1,290 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import allure
+
+
+class LatencyHistogram:
+    """
+    Компактная гистограмма времени ответа с логарифмическими корзинами.
+
+    Корзины растут в 2^(1/8) раза (шаг около 9%) от 1 мс до нескольких минут, поэтому перцентили
+    считаются с той же относительной точностью при любом количестве измерений, а память постоянна.
+    """
+
+    # Количество корзин на каждое удвоение времени
+    STEPS_PER_OCTAVE = 8
+    # Количество корзин: 18 удвоений от 1 мс (больше 4 минут)
+    SIZE = 18 * STEPS_PER_OCTAVE
+
+    def __init__(self):
+        self.counts = [0] * self.SIZE
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        """
+        Добавляет измерение.
+
+        :param seconds: Время ответа в секундах.
+        :type seconds: float
+        """
+        ms = seconds * 1000
+        index = int(math.log2(ms) * self.STEPS_PER_OCTAVE) if ms > 1 else 0
+        self.counts[min(index, self.SIZE - 1)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, percent):
+        """
+        Оценивает перцентиль времени ответа (верхняя граница корзины, но не больше максимума).
+
+        :param percent: Перцентиль от 0 до 100.
+        :type percent: float
+        :returns: Время ответа в миллисекундах.
+        :rtype: float
+        """
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return round(min(2 ** ((index + 1) / self.STEPS_PER_OCTAVE), self.max), 1)
+        return round(self.max, 1)
+
+    def summary(self):
+        """
+        Основные показатели гистограммы.
+
+        :returns: Словарь с p50, p95, p99, средним и максимальным временем ответа в миллисекундах.
+        :rtype: dict
+        """
+        return {
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'mean': round(self.total / self.count, 1) if self.count else 0.0,
+            'max': round(self.max, 1),
+        }
+
+
+class HostMetrics:
+    """
+    Показатели проверки ссылок одного хоста.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.broken = 0
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+
+    def summary(self):
+        """
+        Итоги по хосту.
+
+        :rtype: dict
+        """
+        return {'count': self.count, 'broken': self.broken, 'bytes': self.bytes, 'latency_ms': self.latency.summary()}
+
+
+class LinkCheckMetrics:
+    """
+    Показатели прогона проверки ссылок: скорость, количество проверок в работе, время ответа,
+    объем полученных данных и ошибки, в целом и по хостам, а также память множества просмотренных URL.
+
+    Во время прогона раз в progress_interval секунд печатается строка прогресса. Итоги можно получить
+    словарем (summary), записать в JSON (write_summary) и приложить к отчету Allure (attach).
+    """
+
+    def __init__(self, progress_interval=10, summary_path='link_metrics.json'):
+        """
+        :param progress_interval: Интервал печати строки прогресса в секундах (None - не печатать).
+        :type progress_interval: float
+        :param summary_path: Путь к JSON-файлу с итогами прогона.
+        :type summary_path: str
+        """
+        self.progress_interval = progress_interval
+        self.summary_path = summary_path
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Сбрасывает все накопленные показатели.
+        """
+        with self._lock:
+            self.started_at = None
+            self.in_flight = 0
+            self.checked = 0
+            self.broken = 0
+            self.bytes = 0
+            self.latency = LatencyHistogram()
+            self.statuses = Counter()
+            self.errors = Counter()
+            self.hosts = {}
+            self.seen_urls = 0
+            self.seen_set_memory_bytes = 0
+            self._last_progress = time.monotonic()
+
+    def started(self, count=1):
+        """
+        Отмечает начало проверки ссылок.
+
+        :param count: Количество начатых проверок.
+        :type count: int
+        """
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = time.monotonic()
+            self.in_flight += count
+
+    def cancelled(self, count=1):
+        """
+        Отмечает отмену начатых проверок.
+
+        :param count: Количество отмененных проверок.
+        :type count: int
+        """
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - count)
+
+    def record(self, record, broken=False):
+        """
+        Учитывает завершенную проверку ссылки.
+
+        :param record: Запись о проверке (см. LinkProcessor.make_record).
+        :type record: dict
+        :param broken: Считается ли ссылка битой.
+        :type broken: bool
+        """
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = time.monotonic()
+            self.in_flight = max(0, self.in_flight - 1)
+            self.checked += 1
+            self.broken += broken
+            self.bytes += record.get('bytes') or 0
+            self.latency.add(record['elapsed'])
+            self.statuses[str(record['status_code'])] += 1
+            if record.get('error'):
+                self.errors[record['error']] += 1
+
+            netloc = urlsplit(record['url']).netloc
+            host = self.hosts.get(netloc)
+            if host is None:
+                host = self.hosts[netloc] = HostMetrics()
+            host.count += 1
+            host.broken += broken
+            host.bytes += record.get('bytes') or 0
+            host.latency.add(record['elapsed'])
+
+            now = time.monotonic()
+            if self.progress_interval is None or now - self._last_progress < self.progress_interval:
+                return
+            self._last_progress = now
+        print(self.progress_line(), flush=True)
+
+    def record_seen_set(self, seen):
+        """
+        Учитывает множество просмотренных URL завершенной проверки ссылок. В итогах остается самое большое
+        по памяти множество прогона, так как множества разных проверок не существуют одновременно.
+
+        :param seen: Множество просмотренных URL.
+        :type seen: PlainSeenSet or FingerprintSet or BloomFilter
+        """
+        memory_bytes = seen.memory_bytes
+        with self._lock:
+            if memory_bytes >= self.seen_set_memory_bytes:
+                self.seen_urls = len(seen)
+                self.seen_set_memory_bytes = memory_bytes
+
+    @property
+    def duration(self):
+        """
+        Время с начала первой проверки в секундах.
+
+        :rtype: float
+        """
+        return time.monotonic() - self.started_at if self.started_at is not None else 0.0
+
+    def progress_line(self):
+        """
+        Строка прогресса прогона.
+
+        :rtype: str
+        """
+        latency = self.latency.summary()
+        duration = self.duration
+        rps = self.checked / duration if duration else 0.0
+        return (
+            f'[links] проверено {self.checked}, битых {self.broken}, {rps:.1f} запр/с, в работе {self.in_flight}, '
+            f'p50 {latency["p50"]} мс, p95 {latency["p95"]} мс, p99 {latency["p99"]} мс, '
+            f'ошибок {sum(self.errors.values())}, получено {self.bytes / 1024 / 1024:.1f} МБ'
+        )
+
+    def summary(self, top_hosts=20):
+        """
+        Итоги прогона.
+
+        :param top_hosts: Количество самых медленных хостов (по p95) в итогах (None - все хосты).
+        :type top_hosts: int
+        :rtype: dict
+        """
+        with self._lock:
+            duration = self.duration
+            hosts = sorted(self.hosts.items(), key=lambda item: item[1].latency.percentile(95), reverse=True)
+            return {
+                'checked': self.checked,
+                'broken': self.broken,
+                'duration': round(duration, 3),
+                'rps': round(self.checked / duration, 1) if duration else 0.0,
+                'in_flight': self.in_flight,
+                'bytes': self.bytes,
+                'latency_ms': self.latency.summary(),
+                'statuses': dict(self.statuses),
+                'errors': dict(self.errors),
+                'seen_urls': self.seen_urls,
+                'seen_set_memory_bytes': self.seen_set_memory_bytes,
+                'hosts': {host: metrics.summary() for host, metrics in hosts[:top_hosts]},
+            }
+
+    def write_summary(self, path=None):
+        """
+        Записывает итоги прогона в JSON-файл (для воркера pytest-xdist - в свой файл).
+
+        :param path: Путь к файлу (по умолчанию summary_path).
+        :type path: str
+        :returns: Путь к записанному файлу.
+        :rtype: str
+        """
+        path = path or self.summary_path
+        worker = os.environ.get('PYTEST_XDIST_WORKER')
+        if worker:
+            base, ext = os.path.splitext(path)
+            path = f'{base}.{worker}{ext}'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(top_hosts=None), f, ensure_ascii=False, indent=2)
+        return path
+
+    def attach(self, name='Показатели проверки ссылок'):
+        """
+        Прикладывает итоги прогона к отчету Allure.
+
+        :param name: Название вложения.
+        :type name: str
+        """
+        allure.attach(json.dumps(self.summary(), ensure_ascii=False, indent=2), name=name,
+                      attachment_type=allure.attachment_type.JSON)
+
+
+link_check_metrics = LinkCheckMetrics()
@@ -0,0 +1,307 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+import requests
+
+from tools.api.resilience import parse_retry_after
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов по алгоритму token bucket.
+
+    Подходит и для asyncio, и для потоков: вычисление задержки выполняется под блокировкой,
+    а само ожидание - вне ее.
+    """
+
+    def __init__(self, rate, burst=1):
+        """
+        :param rate: Количество запросов в секунду.
+        :type rate: float
+        :param burst: Максимальное количество запросов, которые можно выполнить подряд без ожидания.
+        :type burst: int
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """
+        Резервирует токен и возвращает время, которое нужно подождать перед запросом.
+
+        :returns: Задержка в секундах.
+        :rtype: float
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def pause(self, seconds):
+        """
+        Откладывает следующие запросы на указанное время (например, по заголовку Retry-After).
+
+        :param seconds: Пауза в секундах.
+        :type seconds: float
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+    def set_rate(self, rate, burst=None):
+        """
+        Меняет частоту запросов (например, по Crawl-delay из robots.txt).
+
+        :param rate: Количество запросов в секунду.
+        :type rate: float
+        :param burst: Максимальное количество запросов подряд без ожидания.
+        :type burst: int
+        """
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            if burst is not None:
+                self.burst = burst
+                self._tokens = min(self._tokens, burst)
+
+
+class HostPoliteness:
+    """
+    Правила вежливого обращения к хостам при проверке ссылок.
+
+    Для каждого хоста ведется свой token bucket, учитывается заголовок Retry-After ответов 429/503,
+    а robots.txt загружается один раз за прогон на хост (с учетом Crawl-delay).
+    """
+
+    RETRY_STATUSES = (429, 503)
+
+    def __init__(self, rate=5.0, burst=5, respect_robots=True, user_agent='*', max_retry_after=60):
+        """
+        :param rate: Количество запросов в секунду к одному хосту.
+        :type rate: float
+        :param burst: Максимальное количество запросов к хосту подряд без ожидания.
+        :type burst: int
+        :param respect_robots: Не проверять ссылки, запрещенные в robots.txt.
+        :type respect_robots: bool
+        :param user_agent: User-agent, для которого читаются правила robots.txt.
+        :type user_agent: str
+        :param max_retry_after: Максимальная пауза по Retry-After в секундах, при которой запрос повторяется.
+        :type max_retry_after: float
+        """
+        self.rate = rate
+        self.burst = burst
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+        self.max_retry_after = max_retry_after
+        self._buckets = {}
+        self._robots = {}
+        self._robots_tasks = {}
+        self._robots_locks = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # В дочерний процесс передаются только настройки: состояние хостов у каждого процесса свое
+        return {'rate': self.rate, 'burst': self.burst, 'respect_robots': self.respect_robots,
+                'user_agent': self.user_agent, 'max_retry_after': self.max_retry_after}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def bucket(self, url):
+        """
+        Возвращает token bucket хоста ссылки.
+
+        :param url: Ссылка.
+        :type url: str
+        :rtype: TokenBucket
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    async def wait(self, url):
+        """
+        Ожидает разрешения на запрос к хосту ссылки.
+
+        :param url: Ссылка.
+        :type url: str
+        """
+        delay = self.bucket(url).reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def wait_sync(self, url):
+        """
+        Ожидает разрешения на запрос к хосту ссылки в синхронном коде.
+
+        :param url: Ссылка.
+        :type url: str
+        """
+        delay = self.bucket(url).reserve()
+        if delay:
+            time.sleep(delay)
+
+    def retry_delay(self, status_code, headers):
+        """
+        Определяет, нужно ли повторить запрос после ответа 429/503, и через сколько.
+
+        :param status_code: Код ответа HTTP.
+        :type status_code: int
+        :param headers: Заголовки ответа.
+        :type headers: Mapping
+        :returns: Пауза в секундах или None, если повторять запрос не нужно.
+        :rtype: float or None
+        """
+        if status_code not in self.RETRY_STATUSES:
+            return None
+        delay = self.parse_retry_after(headers.get('Retry-After'))
+        if delay is None or delay > self.max_retry_after:
+            return None
+        return delay
+
+    def defer(self, url, seconds):
+        """
+        Откладывает все запросы к хосту ссылки на указанное время.
+
+        :param url: Ссылка.
+        :type url: str
+        :param seconds: Пауза в секундах.
+        :type seconds: float
+        """
+        self.bucket(url).pause(seconds)
+
+    async def allowed(self, client, url):
+        """
+        Проверяет, разрешена ли ссылка в robots.txt ее хоста. robots.txt загружается один раз на хост.
+
+        :param client: Асинхронный клиент для загрузки robots.txt.
+        :type client: APIClientAsync
+        :param url: Ссылка.
+        :type url: str
+        :rtype: bool
+        """
+        if not self.respect_robots:
+            return True
+        host = urlsplit(url).netloc
+        if host not in self._robots:
+            task = self._robots_tasks.get(host)
+            if task is None or task.get_loop() is not asyncio.get_running_loop():
+                task = asyncio.ensure_future(self._fetch_robots(client, url))
+                self._robots_tasks[host] = task
+            self._set_robots(host, await task)
+        return self._can_fetch(host, url)
+
+    def allowed_sync(self, session, url):
+        """
+        Проверяет, разрешена ли ссылка в robots.txt ее хоста, в синхронном коде.
+
+        :param session: Сессия requests для загрузки robots.txt.
+        :type session: requests.Session
+        :param url: Ссылка.
+        :type url: str
+        :rtype: bool
+        """
+        if not self.respect_robots:
+            return True
+        host = urlsplit(url).netloc
+        if host not in self._robots:
+            # robots.txt хоста загружается один раз, не задерживая проверки ссылок других хостов
+            with self._robots_lock(host):
+                if host not in self._robots:
+                    self._set_robots(host, self._fetch_robots_sync(session, url))
+        return self._can_fetch(host, url)
+
+    @staticmethod
+    def interleave_by_host(urls, window=1000):
+        """
+        Лениво переупорядочивает ссылки по кругу между хостами, чтобы один медленный хост не занимал всю очередь.
+
+        Ссылки читаются из urls по мере выдачи, и в памяти хранится не больше window ссылок: порядок
+        round-robin соблюдается внутри этого окна, поэтому длинный поток ссылок (например, из sitemap)
+        не загружается целиком.
+
+        :param urls: Итерируемый набор ссылок.
+        :type urls: Iterable[str]
+        :param window: Максимальное количество ссылок, которые одновременно ожидают выдачи.
+        :type window: int
+        :returns: Генератор тех же ссылок в порядке round-robin по хостам.
+        :rtype: Iterator[str]
+        """
+        urls = iter(urls)
+        by_host = {}
+        buffered = 0
+        exhausted = False
+        while True:
+            while not exhausted and buffered < window:
+                url = next(urls, None)
+                if url is None:
+                    exhausted = True
+                else:
+                    by_host.setdefault(urlsplit(url).netloc, deque()).append(url)
+                    buffered += 1
+            if not by_host:
+                return
+            # Один круг: по одной ссылке каждого хоста из окна
+            for host in list(by_host):
+                queue = by_host[host]
+                yield queue.popleft()
+                buffered -= 1
+                if not queue:
+                    del by_host[host]
+
+    # Разбор Retry-After общий с политикой повторов API-клиентов
+    parse_retry_after = staticmethod(parse_retry_after)
+
+    @staticmethod
+    def _robots_url(url):
+        parts = urlsplit(url)
+        return f'{parts.scheme}://{parts.netloc}/robots.txt'
+
+    async def _fetch_robots(self, client, url):
+        try:
+            response, text = await client.fetch_page(self._robots_url(url))
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+        return text if response.status == 200 else None
+
+    def _fetch_robots_sync(self, session, url):
+        try:
+            response = session.get(self._robots_url(url), timeout=10)
+        except requests.exceptions.RequestException:
+            return None
+        return response.text if response.status_code == 200 else None
+
+    def _robots_lock(self, host):
+        with self._lock:
+            return self._robots_locks.setdefault(host, threading.Lock())
+
+    def _set_robots(self, host, text):
+        if host in self._robots:
+            return
+        parser = None
+        if text is not None:
+            parser = RobotFileParser()
+            parser.parse(text.splitlines())
+            delay = parser.crawl_delay(self.user_agent)
+            if delay:
+                bucket = self.bucket(f'//{host}')
+                bucket.set_rate(min(bucket.rate, 1 / float(delay)), burst=1)
+        self._robots[host] = parser
+
+    def _can_fetch(self, host, url):
+        parser = self._robots.get(host)
+        return parser is None or parser.can_fetch(self.user_agent, url)
@@ -0,0 +1,218 @@
+import math
+import sys
+from array import array
+from hashlib import blake2b
+
+
+def url_fingerprint(url):
+    """
+    Вычисляет 64-битный отпечаток URL.
+
+    :param url: URL.
+    :type url: str
+    :rtype: int
+    """
+    return int.from_bytes(blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class FingerprintSet:
+    """
+    Компактное множество просмотренных URL.
+
+    Вместо самих строк хранятся 64-битные отпечатки в массиве с открытой адресацией, поэтому на один URL
+    уходит около 16-32 байт вместо сотни с лишним у обычного set. Вероятность ложного совпадения двух
+    разных URL при миллионах записей пренебрежимо мала (порядка n^2 / 2^65).
+    """
+
+    # Значение пустой ячейки таблицы (отпечаток 0 заменяется на 1)
+    EMPTY = 0
+    # Максимальная доля занятых ячеек, после которой таблица увеличивается вдвое
+    MAX_LOAD = 0.5
+
+    def __init__(self, capacity=1024):
+        """
+        :param capacity: Ожидаемое количество URL (таблица растет автоматически).
+        :type capacity: int
+        """
+        size = 1 << max(4, math.ceil(math.log2(capacity / self.MAX_LOAD)))
+        self._table = array('Q', bytes(8 * size))
+        self._count = 0
+
+    def add(self, url):
+        """
+        Добавляет URL в множество.
+
+        :param url: URL.
+        :type url: str
+        :returns: True, если URL раньше не встречался.
+        :rtype: bool
+        """
+        if (self._count + 1) > len(self._table) * self.MAX_LOAD:
+            self._resize(len(self._table) * 2)
+        if self._insert(self._table, url_fingerprint(url) or 1):
+            self._count += 1
+            return True
+        return False
+
+    def __contains__(self, url):
+        fingerprint = url_fingerprint(url) or 1
+        table = self._table
+        mask = len(table) - 1
+        index = fingerprint & mask
+        while table[index] != self.EMPTY:
+            if table[index] == fingerprint:
+                return True
+            index = (index + 1) & mask
+        return False
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def memory_bytes(self):
+        """
+        Объем памяти, занимаемый таблицей отпечатков, в байтах.
+
+        :rtype: int
+        """
+        return self._table.itemsize * len(self._table)
+
+    def _insert(self, table, fingerprint):
+        mask = len(table) - 1
+        index = fingerprint & mask
+        while table[index] != self.EMPTY:
+            if table[index] == fingerprint:
+                return False
+            index = (index + 1) & mask
+        table[index] = fingerprint
+        return True
+
+    def _resize(self, size):
+        table = array('Q', bytes(8 * size))
+        for fingerprint in self._table:
+            if fingerprint != self.EMPTY:
+                self._insert(table, fingerprint)
+        self._table = table
+
+
+class BloomFilter:
+    """
+    Фильтр Блума для просмотренных URL.
+
+    Занимает фиксированный объем памяти (около 1.2 байта на URL при доле ложных срабатываний 0.1%),
+    но с вероятностью fp_rate считает новый URL уже просмотренным, и такая ссылка не будет проверена.
+    Подходит для обходов, где память важнее полноты.
+    """
+
+    def __init__(self, capacity=100_000, fp_rate=0.001):
+        """
+        :param capacity: Ожидаемое количество URL.
+        :type capacity: int
+        :param fp_rate: Допустимая доля ложных срабатываний при заполнении до capacity.
+        :type fp_rate: float
+        """
+        self.size = max(64, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def add(self, url):
+        """
+        Добавляет URL в фильтр.
+
+        :param url: URL.
+        :type url: str
+        :returns: True, если URL раньше не встречался (с точностью до ложных срабатываний).
+        :rtype: bool
+        """
+        bits = self._bits
+        added = False
+        for position in self._positions(url):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        if added:
+            self._count += 1
+        return added
+
+    def __contains__(self, url):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(url))
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def memory_bytes(self):
+        """
+        Объем памяти, занимаемый битовым массивом, в байтах.
+
+        :rtype: int
+        """
+        return len(self._bits)
+
+    def _positions(self, url):
+        # Двойное хеширование: k позиций из двух независимых 64-битных хешей
+        digest = blake2b(url.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        size = self.size
+        return [(first + i * second) % size for i in range(self.hash_count)]
+
+
+class PlainSeenSet(set):
+    """
+    Обычное множество строк с тем же интерфейсом, что у компактных вариантов.
+    """
+
+    def __init__(self, capacity=None):
+        """
+        :param capacity: Не используется, принимается для совместимости с компактными вариантами.
+        :type capacity: int
+        """
+        super().__init__()
+
+    def add(self, url):
+        """
+        Добавляет URL в множество.
+
+        :param url: URL.
+        :type url: str
+        :returns: True, если URL раньше не встречался.
+        :rtype: bool
+        """
+        if url in self:
+            return False
+        super().add(url)
+        return True
+
+    @property
+    def memory_bytes(self):
+        """
+        Объем памяти, занимаемый множеством вместе со строками, в байтах.
+
+        :rtype: int
+        """
+        return sys.getsizeof(self) + sum(sys.getsizeof(url) for url in self)
+
+
+SEEN_SET_TYPES = {
+    'set': PlainSeenSet,
+    'fingerprint': FingerprintSet,
+    'bloom': BloomFilter,
+}
+
+
+def create_seen_set(kind='set', **options):
+    """
+    Создает множество просмотренных URL нужного типа.
+
+    :param kind: 'set' (обычное множество строк), 'fingerprint' (64-битные отпечатки) или 'bloom' (фильтр Блума).
+    :type kind: str
+    :param options: Параметры конструктора (capacity, fp_rate для 'bloom').
+    :returns: Множество просмотренных URL.
+    :rtype: PlainSeenSet or FingerprintSet or BloomFilter
+    """
+    if kind not in SEEN_SET_TYPES:
+        raise ValueError(f'Неизвестный тип множества просмотренных URL: {kind}')
+    return SEEN_SET_TYPES[kind](**options)
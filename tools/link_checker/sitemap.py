@@ -0,0 +1,90 @@
+import gzip
+import io
+from urllib.parse import urljoin, urlsplit
+from xml.etree.ElementTree import iterparse
+
+import requests
+
+
+class SitemapReader:
+    """
+    Потоковое чтение sitemap.xml и индексов sitemap.
+
+    Источником может быть URL или локальный файл, в том числе сжатый gzip. XML разбирается
+    через iterparse, а обработанные элементы сразу удаляются из дерева, поэтому память не растет
+    с количеством URL. Вложенные индексы обходятся рекурсивно и лениво.
+    """
+
+    GZIP_MAGIC = b'\x1f\x8b'
+    READ_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, session=None, max_depth=5, timeout=30):
+        """
+        :param session: Сессия requests для загрузки sitemap по URL.
+        :type session: requests.Session
+        :param max_depth: Максимальная глубина вложенности индексов sitemap.
+        :type max_depth: int
+        :param timeout: Таймаут загрузки одного sitemap в секундах.
+        :type timeout: float
+        """
+        self.session = session or requests.Session()
+        self.max_depth = max_depth
+        self.timeout = timeout
+
+    def iter_urls(self, source, depth=0, seen=None):
+        """
+        Отдает адреса страниц из sitemap или индекса sitemap.
+
+        :param source: URL или путь к файлу sitemap (.xml или .xml.gz).
+        :type source: str
+        :param depth: Текущая глубина вложенности индексов.
+        :type depth: int
+        :param seen: Уже прочитанные sitemap (защита от циклов в индексах).
+        :type seen: set
+        :returns: Генератор URL страниц.
+        :rtype: Iterator[str]
+        """
+        seen = set() if seen is None else seen
+        if source in seen or depth > self.max_depth:
+            return
+        seen.add(source)
+
+        for kind, loc in self._iter_locs(source):
+            if kind == 'sitemapindex':
+                yield from self.iter_urls(self._resolve(source, loc), depth + 1, seen)
+            else:
+                yield loc
+
+    def _iter_locs(self, source):
+        with self._open(source) as raw:
+            stream = gzip.GzipFile(fileobj=raw) if raw.peek(2)[:2] == self.GZIP_MAGIC else raw
+            kind = None
+            root = None
+            for event, element in iterparse(stream, events=('start', 'end')):
+                tag = element.tag.rpartition('}')[2]
+                if event == 'start':
+                    if root is None:
+                        root, kind = element, tag
+                    continue
+                if tag == 'loc' and element.text and element.text.strip():
+                    yield kind, element.text.strip()
+                elif tag in ('url', 'sitemap'):
+                    # Освобождаем уже обработанные записи, чтобы дерево не росло
+                    root.clear()
+
+    def _open(self, source):
+        if urlsplit(source).scheme in ('http', 'https'):
+            response = self.session.get(source, stream=True, timeout=self.timeout)
+            response.raise_for_status()
+            # Content-Encoding: gzip распаковывается urllib3, а файлы .xml.gz распознаются ниже по сигнатуре
+            response.raw.decode_content = True
+            # Иначе urllib3 закроет поток при достижении конца тела, не дав дочитать буфер
+            response.raw.auto_close = False
+            return io.BufferedReader(response.raw, buffer_size=self.READ_CHUNK_SIZE)
+        return open(source, 'rb')
+
+    @staticmethod
+    def _resolve(source, loc):
+        if urlsplit(source).scheme in ('http', 'https'):
+            return urljoin(source, loc)
+        return loc